@@ -0,0 +1,123 @@
+import json
+import os
+from typing import Callable, Dict, List, Optional, Sequence
+
+from app.blockstore import block_hash_at
+from app.models import Block
+
+
+class ChainAggregates:
+    """Statistik chain yang diperbarui setiap kali blok ditambahkan.
+
+    Disimpan di file JSON kecil beserta tinggi dan hash ujung chain, sehingga
+    `get_blockchain_info` tidak perlu menelusuri seluruh chain.
+    """
+
+    FIELDS = ("total_transactions", "by_type", "by_issuer", "by_major")
+
+    def __init__(self, path: str):
+        self.path = path
+        self._reset()
+
+    def _reset(self):
+        self.height = 0
+        self.tip_hash = None
+        self.total_transactions = 0
+        self.by_type: Dict[str, int] = {}
+        self.by_issuer: Dict[str, int] = {}
+        self.by_major: Dict[str, int] = {}
+
+    def apply_block(self, block: Block):
+        """Menambahkan statistik satu blok"""
+        for tx in block.transactions:
+            self.total_transactions += 1
+            self.by_type[tx.transaction_type] = self.by_type.get(tx.transaction_type, 0) + 1
+            if tx.transaction_type == "degree_issuance":
+                self.by_issuer[tx.issuer] = self.by_issuer.get(tx.issuer, 0) + 1
+                self.by_major[tx.major] = self.by_major.get(tx.major, 0) + 1
+        self.height += 1
+        self.tip_hash = block.hash
+
+    def recompute(self, chain: Sequence[Block]):
+        """Menghitung ulang semua statistik dari seluruh chain"""
+        self._reset()
+        for block in chain:
+            self.apply_block(block)
+
+    def sync(self, chain: Sequence[Block], recovery: Optional[Callable] = None):
+        """Menyamakan statistik dengan chain: lanjutkan jika cocok, hitung ulang jika basi.
+
+        Statistik yang hilang atau basi dimulai dari snapshot yang dikembalikan
+        `recovery` (jika ada) sehingga hanya blok setelahnya yang dihitung ulang.
+        """
+        missing = self.height == 0 and not self.load()
+        if missing and recovery:
+            self._restore(recovery())
+        if not self.matches(chain):
+            self._reset()
+            if recovery:
+                self._restore(recovery())
+            for i in range(self.height, len(chain)):
+                self.apply_block(chain[i])
+        elif self.height < len(chain):
+            for i in range(self.height, len(chain)):
+                self.apply_block(chain[i])
+        elif not missing:
+            return
+        self.save()
+
+    def matches(self, chain: Sequence[Block]) -> bool:
+        """Cek apakah statistik mencakup prefix dari chain ini"""
+        if self.height > len(chain):
+            return False
+        return self.height == 0 or block_hash_at(chain, self.height - 1) == self.tip_hash
+
+    def compare(self, chain: Sequence[Block]) -> List[str]:
+        """Hitung ulang dari chain dan kembalikan nama field yang berbeda"""
+        fresh = ChainAggregates(self.path)
+        fresh.recompute(chain)
+        return [
+            field for field in self.FIELDS + ("height", "tip_hash")
+            if getattr(self, field) != getattr(fresh, field)
+        ]
+
+    def to_dict(self) -> Dict:
+        return {
+            "height": self.height,
+            "tip_hash": self.tip_hash,
+            "total_transactions": self.total_transactions,
+            "by_type": self.by_type,
+            "by_issuer": self.by_issuer,
+            "by_major": self.by_major,
+        }
+
+    def load(self) -> bool:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return self._from_dict(json.load(f))
+        except (OSError, ValueError):
+            self._reset()
+            return False
+
+    def _restore(self, snapshot):
+        if snapshot is not None:
+            self._from_dict(snapshot.aggregates)
+
+    def _from_dict(self, data: Dict) -> bool:
+        try:
+            self.height = data["height"]
+            self.tip_hash = data["tip_hash"]
+            self.total_transactions = data["total_transactions"]
+            self.by_type = data["by_type"]
+            self.by_issuer = data["by_issuer"]
+            self.by_major = data["by_major"]
+            return True
+        except (KeyError, TypeError):
+            self._reset()
+            return False
+
+    def save(self):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,448 @@
+import json
+import mmap
+import os
+import shutil
+import struct
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional
+
+from app.models import Block, Transaction
+
+
+# Header blok berukuran tetap:
+# magic, version, difficulty (0 = tidak tercatat), 2 byte cadangan, tx_count,
+# index, timestamp (mikrodetik sejak epoch), nonce, hash, previous_hash,
+# merkle_root, panjang body transaksi.
+BLOCK_HEADER = struct.Struct("<4sBBHIQqQ32s32s32sQ")
+BLOCK_MAGIC = b"BLK1"
+# Entri file .idx: offset dan panjang record blok di file .dat
+INDEX_ENTRY = struct.Struct("<QQ")
+# Prefix panjang setiap body transaksi
+TX_LENGTH = struct.Struct("<I")
+
+DEFAULT_SEGMENT_SIZE = 64 * 1024 * 1024
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _to_micros(timestamp: datetime) -> int:
+    return (timestamp - _EPOCH) // timedelta(microseconds=1)
+
+
+def _from_micros(micros: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=micros)
+
+
+@dataclass
+class BlockHeader:
+    """Header blok tanpa transaksi, dibaca tanpa men-decode body"""
+    index: int
+    version: int
+    timestamp: datetime
+    previous_hash: str
+    merkle_root: str
+    nonce: int
+    hash: str
+    tx_count: int
+    difficulty: Optional[int] = None
+
+    def to_dict(self):
+        return {
+            "index": self.index,
+            "version": self.version,
+            "timestamp": self.timestamp.isoformat(),
+            "previous_hash": self.previous_hash,
+            "merkle_root": self.merkle_root,
+            "nonce": self.nonce,
+            "hash": self.hash,
+            "tx_count": self.tx_count,
+            "difficulty": self.difficulty
+        }
+
+
+def _encode_transaction(tx: Transaction) -> bytes:
+    return json.dumps(tx.to_dict(), separators=(",", ":")).encode()
+
+
+def transaction_size(tx: Transaction) -> int:
+    """Ukuran transaksi di body blok (byte), termasuk prefix panjangnya"""
+    return TX_LENGTH.size + len(_encode_transaction(tx))
+
+
+def encode_block(block: Block) -> bytes:
+    """Encode blok ke format biner: header tetap + body transaksi length-prefixed"""
+    body = bytearray()
+    for tx in block.transactions:
+        data = _encode_transaction(tx)
+        body += TX_LENGTH.pack(len(data))
+        body += data
+
+    header = BLOCK_HEADER.pack(
+        BLOCK_MAGIC,
+        block.version,
+        block.difficulty or 0,
+        0,
+        len(block.transactions),
+        block.index,
+        _to_micros(block.timestamp),
+        block.nonce,
+        bytes.fromhex(block.hash),
+        bytes.fromhex(block.previous_hash),
+        bytes.fromhex(block.merkle_root),
+        len(body),
+    )
+    return header + bytes(body)
+
+
+def decode_header(buf, offset: int = 0) -> BlockHeader:
+    (magic, version, difficulty, _, tx_count, index, micros, nonce,
+     block_hash, previous_hash, merkle_root, _) = BLOCK_HEADER.unpack_from(buf, offset)
+    if magic != BLOCK_MAGIC:
+        raise ValueError(f"Record blok rusak pada offset {offset}")
+    return BlockHeader(
+        index=index,
+        version=version,
+        timestamp=_from_micros(micros),
+        previous_hash=previous_hash.hex(),
+        merkle_root=merkle_root.hex(),
+        nonce=nonce,
+        hash=block_hash.hex(),
+        tx_count=tx_count,
+        difficulty=difficulty or None,
+    )
+
+
+def _iter_tx_bodies(buf, offset: int, tx_count: int) -> Iterator[bytes]:
+    pos = offset + BLOCK_HEADER.size
+    for _ in range(tx_count):
+        (length,) = TX_LENGTH.unpack_from(buf, pos)
+        pos += TX_LENGTH.size
+        yield buf[pos:pos + length]
+        pos += length
+
+
+def decode_block(buf, offset: int = 0) -> Block:
+    header = decode_header(buf, offset)
+    transactions = [
+        Transaction.from_dict(json.loads(body))
+        for body in _iter_tx_bodies(buf, offset, header.tx_count)
+    ]
+    return Block(
+        index=header.index,
+        transactions=transactions,
+        timestamp=header.timestamp,
+        previous_hash=header.previous_hash,
+        nonce=header.nonce,
+        hash=header.hash,
+        version=header.version,
+        merkle_root=header.merkle_root,
+        difficulty=header.difficulty,
+    )
+
+
+def decode_blocks(buf) -> List[Block]:
+    """Decode rangkaian record blok yang ditulis berurutan (mis. diterima dari peer)"""
+    blocks = []
+    offset = 0
+    while offset < len(buf):
+        if len(buf) - offset < BLOCK_HEADER.size:
+            raise ValueError("Record blok terpotong")
+        body_length = BLOCK_HEADER.unpack_from(buf, offset)[-1]
+        if offset + BLOCK_HEADER.size + body_length > len(buf):
+            raise ValueError("Record blok terpotong")
+        blocks.append(decode_block(buf, offset))
+        offset += BLOCK_HEADER.size + body_length
+    return blocks
+
+
+class _Segment:
+    def __init__(self, directory: str, number: int, base: int):
+        self.number = number
+        self.base = base
+        self.dat_path = os.path.join(directory, f"blk{number:05d}.dat")
+        self.idx_path = os.path.join(directory, f"blk{number:05d}.idx")
+        self.entries: List[tuple] = []
+        self._map: Optional[mmap.mmap] = None
+
+    def load(self, repair: bool = True):
+        """Baca entri file .idx yang belum dimuat.
+
+        Dengan `repair`, record yang tidak lengkap (crash saat append) dibuang
+        dari file; pembaca lain memakai `repair=False` agar tidak memotong
+        record yang sedang ditulis proses lain.
+        """
+        dat_size = os.path.getsize(self.dat_path) if os.path.exists(self.dat_path) else 0
+        with open(self.idx_path, "rb") as f:
+            f.seek(len(self.entries) * INDEX_ENTRY.size)
+            raw = f.read()
+        usable = len(raw) - len(raw) % INDEX_ENTRY.size
+        known = len(self.entries)
+        for (offset, length) in INDEX_ENTRY.iter_unpack(raw[:usable]):
+            if offset + length > dat_size:
+                break
+            self.entries.append((offset, length))
+        if len(self.entries) != known:
+            # mmap lama tidak mencakup record baru
+            self.close()
+
+        if not repair:
+            return
+        if len(raw) != (len(self.entries) - known) * INDEX_ENTRY.size:
+            with open(self.idx_path, "r+b") as f:
+                f.truncate(len(self.entries) * INDEX_ENTRY.size)
+        if dat_size != self.size:
+            with open(self.dat_path, "r+b") as f:
+                f.truncate(self.size)
+
+    @property
+    def size(self) -> int:
+        if not self.entries:
+            return 0
+        offset, length = self.entries[-1]
+        return offset + length
+
+    def buffer(self):
+        if self._map is None:
+            with open(self.dat_path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+class BlockStore:
+    """Penyimpanan blok biner tersegmentasi yang dibaca lewat mmap.
+
+    Setiap segmen terdiri dari file `.dat` (record blok berurutan) dan file
+    `.idx` (offset dan panjang setiap record). Blok baru selalu ditambahkan
+    di akhir segmen terakhir; segmen baru dibuat jika ukurannya melewati
+    `segment_size`.
+    """
+
+    def __init__(self, directory: str, segment_size: int = DEFAULT_SEGMENT_SIZE, repair: bool = True):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.segments: List[_Segment] = []
+        # Cache offset body transaksi per blok untuk akses transaksi O(1)
+        self._tx_offsets: "OrderedDict[int, List[int]]" = OrderedDict()
+        self._tx_offsets_size = 256
+        self._open(repair)
+
+    def _open(self, repair: bool):
+        # Perbaikan record terpotong hanya aman jika tidak ada penulis lain
+        # (pemanggil memegang lock storage)
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_segments(repair)
+
+    def _load_segments(self, repair: bool):
+        number = self.segments[-1].number + 1 if self.segments else 0
+        while os.path.exists(os.path.join(self.directory, f"blk{number:05d}.idx")):
+            segment = _Segment(self.directory, number, len(self))
+            segment.load(repair)
+            self.segments.append(segment)
+            number += 1
+
+    def refresh(self) -> int:
+        """Memuat blok yang ditambahkan proses lain; mengembalikan jumlah blok baru"""
+        before = len(self)
+        if self.segments:
+            self.segments[-1].load(repair=False)
+        self._load_segments(repair=False)
+        return len(self) - before
+
+    def __len__(self) -> int:
+        if not self.segments:
+            return 0
+        last = self.segments[-1]
+        return last.base + len(last.entries)
+
+    def _entry(self, index: int):
+        if not 0 <= index < len(self):
+            raise IndexError("Index blok di luar jangkauan")
+        lo, hi = 0, len(self.segments) - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self.segments[mid].base <= index:
+                lo = mid
+            else:
+                hi = mid - 1
+        segment = self.segments[lo]
+        offset, length = segment.entries[index - segment.base]
+        return segment, offset, length
+
+    def _locate(self, index: int):
+        segment, offset, _ = self._entry(index)
+        return segment.buffer(), offset
+
+    def read_record(self, index: int, header_only: bool = False) -> bytes:
+        """Record biner blok apa adanya (atau hanya header-nya), mis. untuk dikirim ke peer"""
+        segment, offset, length = self._entry(index)
+        if header_only:
+            length = BLOCK_HEADER.size
+        return segment.buffer()[offset:offset + length]
+
+    def read_block(self, index: int) -> Block:
+        buf, offset = self._locate(index)
+        return decode_block(buf, offset)
+
+    def read_header(self, index: int) -> BlockHeader:
+        buf, offset = self._locate(index)
+        return decode_header(buf, offset)
+
+    def read_transaction(self, index: int, position: int) -> Transaction:
+        """Decode satu transaksi tanpa men-decode transaksi lain di blok"""
+        buf, offset = self._locate(index)
+        offsets = self._tx_offsets.get(index)
+        if offsets is None:
+            header = decode_header(buf, offset)
+            offsets = []
+            pos = offset + BLOCK_HEADER.size
+            for _ in range(header.tx_count):
+                offsets.append(pos)
+                pos += TX_LENGTH.size + TX_LENGTH.unpack_from(buf, pos)[0]
+            self._tx_offsets[index] = offsets
+            if len(self._tx_offsets) > self._tx_offsets_size:
+                self._tx_offsets.popitem(last=False)
+        else:
+            self._tx_offsets.move_to_end(index)
+
+        if not 0 <= position < len(offsets):
+            raise IndexError("Posisi transaksi di luar jangkauan")
+        pos = offsets[position]
+        (length,) = TX_LENGTH.unpack_from(buf, pos)
+        pos += TX_LENGTH.size
+        return Transaction.from_dict(json.loads(buf[pos:pos + length]))
+
+    def append(self, block: Block, fsync: bool = True):
+        """Menambahkan blok di akhir store"""
+        if block.index != len(self):
+            raise ValueError(f"Blok #{block.index} tidak berurutan dengan store (height {len(self)})")
+        record = encode_block(block)
+
+        segment = self.segments[-1] if self.segments else None
+        if segment is None or (segment.entries and segment.size + len(record) > self.segment_size):
+            number = segment.number + 1 if segment else 0
+            segment = _Segment(self.directory, number, len(self))
+            open(segment.idx_path, "wb").close()
+            self.segments.append(segment)
+
+        offset = segment.size
+        with open(segment.dat_path, "ab") as f:
+            f.write(record)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        with open(segment.idx_path, "ab") as f:
+            f.write(INDEX_ENTRY.pack(offset, len(record)))
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        segment.entries.append((offset, len(record)))
+        # mmap lama tidak mencakup record baru
+        segment.close()
+
+    def fsync(self, start: int = 0):
+        """fsync file segmen yang memuat blok `start` dan sesudahnya"""
+        for segment in self.segments:
+            if segment.base + len(segment.entries) > start:
+                for path in (segment.dat_path, segment.idx_path):
+                    with open(path, "rb+") as f:
+                        os.fsync(f.fileno())
+
+    def close(self):
+        for segment in self.segments:
+            segment.close()
+
+    @classmethod
+    def rebuild(cls, directory: str, blocks, segment_size: int = DEFAULT_SEGMENT_SIZE) -> "BlockStore":
+        """Menulis ulang seluruh store dari iterable blok lalu menukarnya secara atomik"""
+        tmp_dir = directory.rstrip(os.sep) + ".tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        store = cls(tmp_dir, segment_size)
+        for block in blocks:
+            store.append(block, fsync=False)
+        store.close()
+        store.fsync()
+
+        old_dir = directory.rstrip(os.sep) + ".old"
+        shutil.rmtree(old_dir, ignore_errors=True)
+        if os.path.exists(directory):
+            os.replace(directory, old_dir)
+        os.replace(tmp_dir, directory)
+        shutil.rmtree(old_dir, ignore_errors=True)
+        return cls(directory, segment_size)
+
+
+class LazyChain(Sequence):
+    """Tampilan chain sebagai sequence yang men-decode blok saat diakses.
+
+    Hanya blok yang benar-benar disentuh yang di-decode; blok yang sudah
+    di-decode disimpan di cache LRU berukuran tetap.
+    """
+
+    def __init__(self, store: BlockStore, cache_size: int = 64):
+        self.store = store
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[int, Block]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(len(self)))]
+        if item < 0:
+            item += len(self)
+        block = self._cache.get(item)
+        if block is None:
+            block = self.store.read_block(item)
+            self._cache[item] = block
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(item)
+        return block
+
+    def __iter__(self) -> Iterator[Block]:
+        for i in range(len(self)):
+            # Iterasi penuh tidak mengisi cache agar memori tetap terbatas
+            yield self._cache.get(i) or self.store.read_block(i)
+
+    def header(self, index: int) -> BlockHeader:
+        if index < 0:
+            index += len(self)
+        return self.store.read_header(index)
+
+    def transaction(self, index: int, position: int) -> Transaction:
+        block = self._cache.get(index)
+        if block is not None:
+            return block.transactions[position]
+        return self.store.read_transaction(index, position)
+
+
+def header_at(chain: Sequence, index: int):
+    """Header blok ke-`index`; untuk LazyChain body transaksi tidak di-decode.
+
+    Untuk chain biasa (list) mengembalikan Block itu sendiri, yang memiliki
+    atribut header yang sama.
+    """
+    if isinstance(chain, LazyChain):
+        return chain.header(index)
+    return chain[index]
+
+
+def block_at(chain: Sequence, index: int) -> Block:
+    """Blok ke-`index`; untuk LazyChain dibaca tanpa mengisi cache"""
+    if isinstance(chain, LazyChain):
+        return chain._cache.get(index) or chain.store.read_block(index)
+    return chain[index]
+
+
+def block_hash_at(chain: Sequence, index: int) -> str:
+    """Hash blok ke-`index` tanpa men-decode transaksinya"""
+    return header_at(chain, index).hash
@@ -0,0 +1,96 @@
+import csv
+import json
+import time
+from typing import Dict, Iterator, Optional
+
+from app.ingest import FORMAT_CSV, FORMAT_NDJSON, ProgressReporter, iter_records
+
+
+RESULT_FIELDS = ["nim", "hash", "verified", "block_index", "block_hash", "revoked",
+                 "revoked_block_index", "revoked_block_hash", "reason"]
+
+
+def iter_pairs(path: str, fmt: Optional[str] = None) -> Iterator[Dict]:
+    """Membaca pasangan (NIM, document hash) dari CSV, NDJSON atau array JSON.
+
+    Kolom yang dikenali: `nim`/`student_nim` dan `hash`/`document_hash`.
+    """
+    for record in iter_records(path, fmt):
+        if not isinstance(record, dict):
+            yield {"nim": "", "hash": "", "reason": str(record)}
+            continue
+        yield {
+            "nim": str(record.get("nim") or record.get("student_nim") or "").strip(),
+            "hash": str(record.get("hash") or record.get("document_hash") or "").strip(),
+        }
+
+
+def verify_pair(blockchain, pair: Dict) -> Dict:
+    """Verifikasi satu pasangan dan ratakan hasilnya menjadi satu baris.
+
+    Ijazah yang dicabut tetap membawa blok penerbitannya, ditambah blok
+    pencabutannya.
+    """
+    row = {"nim": pair["nim"], "hash": pair["hash"], "verified": False, "block_index": None, "block_hash": None, "revoked": False,
+           "revoked_block_index": None, "revoked_block_hash": None, "reason": ""}
+    if not pair["nim"] or not pair["hash"]:
+        row["reason"] = pair.get("reason") or "NIM atau hash kosong"
+        return row
+
+    result = blockchain.verify_degree(pair["hash"], pair["nim"])
+    row.update(verified=result["verified"], block_index=result.get("block_index"),
+               block_hash=result.get("block_hash"), reason="" if result["verified"] else result.get("message", ""))
+    revocation = result.get("revocation")
+    if revocation:
+        row.update(revoked=True, revoked_block_index=revocation["block_index"],
+                   revoked_block_hash=revocation["block_hash"])
+    return row
+
+
+class _ResultWriter:
+    def __init__(self, fh, fmt: str):
+        self.fh = fh
+        self.fmt = fmt
+        if fmt == FORMAT_CSV:
+            self.writer = csv.DictWriter(fh, fieldnames=RESULT_FIELDS)
+            self.writer.writeheader()
+
+    def write(self, row: Dict):
+        if self.fmt == FORMAT_CSV:
+            self.writer.writerow(row)
+        else:
+            self.fh.write(json.dumps(row) + "\n")
+
+
+def verify_file(blockchain, input_path: str, output_path: str, fmt: Optional[str] = None,
+                output_format: Optional[str] = None, progress: Optional[ProgressReporter] = None) -> Dict:
+    """Verifikasi massal: baca pasangan secara streaming dan tulis hasil per baris.
+
+    Chain dimuat sekali; setiap pasangan di-resolve lewat index document hash,
+    sehingga memori tidak bergantung pada ukuran input.
+    """
+    if output_format is None:
+        output_format = FORMAT_CSV if output_path.lower().endswith(".csv") else FORMAT_NDJSON
+
+    processed = verified = 0
+    start = time.perf_counter()
+    with open(output_path, "w", encoding="utf-8", newline="") as fh:
+        writer = _ResultWriter(fh, output_format)
+        for pair in iter_pairs(input_path, fmt):
+            row = verify_pair(blockchain, pair)
+            writer.write(row)
+            processed += 1
+            verified += row["verified"]
+            if progress and processed % 1000 == 0:
+                progress(processed, verified)
+    elapsed = time.perf_counter() - start
+
+    if progress:
+        progress(processed, verified, final=True)
+    return {
+        "processed": processed,
+        "verified": verified,
+        "not_verified": processed - verified,
+        "elapsed": elapsed,
+        "rows_per_sec": processed / elapsed if elapsed > 0 else 0.0,
+    }
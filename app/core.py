@@ -1,31 +1,289 @@
 import hashlib
 import json
+import threading
 import time
 from datetime import datetime
-from typing import List, Dict, Optional
-import pickle
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Dict, Optional, Sequence, Tuple
 import os
 
-from app.models import Block, Transaction, StudentDegree
+from app.aggregates import ChainAggregates
+from app.blockstore import block_at, block_hash_at, transaction_size
+from app.difficulty import MIN_DIFFICULTY, DifficultyController, infer_difficulty, recorded_difficulty
+from app.index import ChainIndex, RevocationIndex
+from app.merkle import merkle_proof, root_from_proof
+from app.metrics import METRICS, timed
+from app.models import Block, Transaction, StudentDegree, BLOCK_VERSION_LEGACY, BLOCK_VERSION_MERKLE
+from app.search import SearchIndex
+from app.storage import CorruptStateError, JournalStorage, StaleChainError, FSYNC_ALWAYS, migrate_pickle_to_journal
 from app.utils import calculate_hash, validate_nim, validate_gpa
 
+# sqlite3, snapshot, validasi dan mining baru diimpor saat dipakai agar CLI
+# cepat mulai (lihat property `sql`, `snapshots`, `checkpoint`)
+if TYPE_CHECKING:
+    from app.snapshot import Snapshot, SnapshotManager
+    from app.sqlstore import SQLReadModel
+    from app.validation import ValidationCheckpoint
+
+
+REQUIRED_STUDENT_FIELDS = ("nim", "name", "degree", "major", "gpa", "graduation_date")
+
+
+def verify_inclusion_proof(proof: Dict, trusted_block_hash: Optional[str] = None) -> Dict:
+    """Memeriksa Merkle inclusion proof tanpa membutuhkan isi blok lain.
+
+    Hash transaksi dihitung ulang dari datanya, Merkle root dihitung dari
+    proof, lalu hash blok dihitung ulang dari header dan root tersebut dan
+    proof-of-work-nya dicek. Header buatan sendiri tetap bisa lolos pemeriksaan
+    ini, jadi hash blok harus dibandingkan dengan chain yang dipercaya:
+    `trusted_block_hash`, atau `UniversityBlockchain.check_inclusion_proof`.
+    """
+    transaction = Transaction.from_dict(proof["transaction"])
+    leaf = transaction.calculate_hash()
+    if leaf != proof["transaction_hash"]:
+        return {"valid": False, "reason": "Hash transaksi tidak cocok dengan data transaksi"}
+
+    header = proof["block"]
+    root = root_from_proof(leaf, proof["proof"])
+    if root != header["merkle_root"]:
+        return {"valid": False, "reason": "Merkle root tidak cocok"}
+
+    if header["version"] == BLOCK_VERSION_LEGACY:
+        return {"valid": False, "reason": "Blok format lama (v1) tidak meng-commit Merkle root; jalankan migrasi"}
+
+    block = Block(
+        index=header["index"],
+        transactions=[],
+        timestamp=datetime.fromisoformat(header["timestamp"]),
+        previous_hash=header["previous_hash"],
+        nonce=header["nonce"],
+        version=header["version"],
+        merkle_root=header["merkle_root"],
+        difficulty=header.get("difficulty")
+    )
+    if block.hash != header["hash"]:
+        return {"valid": False, "reason": "Hash blok tidak cocok dengan header"}
+
+    from app.mining import meets_difficulty
+
+    difficulty = header.get("difficulty")
+    if difficulty is None or difficulty < MIN_DIFFICULTY:
+        return {"valid": False, "reason": "Header tidak mencatat difficulty; proof-of-work tidak bisa dicek"}
+    if not meets_difficulty(bytes.fromhex(header["hash"]), difficulty):
+        return {"valid": False, "reason": "Proof-of-work blok tidak valid"}
+
+    if trusted_block_hash is not None and header["hash"] != trusted_block_hash:
+        return {"valid": False, "reason": f"Blok #{header['index']} tidak ada di chain"}
+
+    return {"valid": True, "reason": "Proof valid"}
+
 
 class UniversityBlockchain:
-    def __init__(self, difficulty: int = 3):
-        self.chain: List[Block] = []
+    """Blockchain ijazah universitas.
+
+    Aman dipakai beberapa thread sekaligus (mis. server HTTP): perubahan state
+    di memori dilindungi lock, sedangkan penulisan ke disk digabung lewat
+    group commit di `JournalStorage` tanpa memegang lock tersebut.
+    """
+
+    def __init__(self, difficulty: int = 3, data_dir: str = "data", fsync_policy: str = FSYNC_ALWAYS,
+                 snapshot_interval: Optional[int] = None):
+        self._lock = threading.RLock()
+        self.chain: Sequence[Block] = []
         self.difficulty = difficulty
         self.pending_transactions: List[Transaction] = []
-        self.data_file = "data/blockchain_data.pkl"
+        # ID transaksi yang sedang ditulis ke journal tetapi belum masuk pending pool
+        self._persisting: set = set()
+        self.data_dir = data_dir
+        # File pickle lama, hanya dibaca untuk migrasi ke journal
+        self.data_file = os.path.join(data_dir, "blockchain_data.pkl")
+        self.journal_file = os.path.join(data_dir, "blockchain.journal")
+        self.storage = JournalStorage(self.journal_file, os.path.join(data_dir, "blocks"),
+                                      fsync_policy=fsync_policy)
+        # Konfigurasi retarget dan hash rate terukur; `difficulty` hanya
+        # dipakai untuk chain yang belum punya difficulty tercatat
+        self.difficulty_control = DifficultyController(os.path.join(data_dir, "difficulty.json"))
+        # Index dan statistik baru dimuat saat pertama dipakai (lihat property)
+        self._index = ChainIndex(os.path.join(data_dir, "blockchain_index.jsonl"))
+        self._index_synced = False
+        self._aggregates = ChainAggregates(os.path.join(data_dir, "blockchain_aggregates.json"))
+        self._aggregates_synced = False
+        self._search = SearchIndex(os.path.join(data_dir, "blockchain_search.jsonl"))
+        self._search_synced = False
+        self._revocations = RevocationIndex(os.path.join(data_dir, "blockchain_revocations.jsonl"))
+        self._revocations_synced = False
+        # Checkpoint validasi, read model SQL dan snapshot dibuat saat pertama dipakai
+        self._checkpoint: Optional["ValidationCheckpoint"] = None
+        self._sql: Optional["SQLReadModel"] = None
+        self._snapshots: Optional["SnapshotManager"] = None
+        self._snapshot_interval = snapshot_interval
         self._initialize_blockchain()
 
+    @property
+    def checkpoint(self) -> "ValidationCheckpoint":
+        """Checkpoint tinggi chain terakhir yang sudah divalidasi penuh"""
+        if self._checkpoint is None:
+            from app.validation import ValidationCheckpoint
+
+            self._checkpoint = ValidationCheckpoint(os.path.join(self.data_dir, "validation_checkpoint.json"))
+        return self._checkpoint
+
+    @property
+    def sql(self) -> "SQLReadModel":
+        """Read model SQLite opsional, dipelihara jika file-nya sudah dibuat (`sync-sql`)"""
+        if self._sql is None:
+            from app.sqlstore import SQL_FILENAME, SQLReadModel
+
+            self._sql = SQLReadModel(os.path.join(self.data_dir, SQL_FILENAME))
+        return self._sql
+
+    @property
+    def snapshots(self) -> "SnapshotManager":
+        """Snapshot state turunan setiap `snapshot_interval` blok (0 = nonaktif,
+        None = `DEFAULT_SNAPSHOT_INTERVAL`)"""
+        if self._snapshots is None:
+            from app.snapshot import DEFAULT_SNAPSHOT_INTERVAL, SnapshotManager
+
+            interval = DEFAULT_SNAPSHOT_INTERVAL if self._snapshot_interval is None else self._snapshot_interval
+            self._snapshots = SnapshotManager(os.path.join(self.data_dir, "snapshots"), interval=interval)
+        return self._snapshots
+
+    @property
+    def index(self) -> ChainIndex:
+        """Index NIM/document hash, disinkronkan dengan chain saat pertama dipakai"""
+        if not self._index_synced:
+            with self._lock, self.storage.lock, METRICS.time("index_sync_seconds"):
+                self._index.sync(self.chain, recovery=self._recovery_snapshot)
+                self._index_synced = True
+        return self._index
+
+    @property
+    def aggregates(self) -> ChainAggregates:
+        """Statistik chain, disinkronkan dengan chain saat pertama dipakai"""
+        if not self._aggregates_synced:
+            with self._lock, self.storage.lock, METRICS.time("aggregates_sync_seconds"):
+                self._aggregates.sync(self.chain, recovery=self._recovery_snapshot)
+                self._aggregates_synced = True
+        return self._aggregates
+
+    @property
+    def search_index(self) -> SearchIndex:
+        """Inverted index nama/jurusan/gelar, disinkronkan saat pertama dipakai"""
+        if not self._search_synced:
+            with self._lock, self.storage.lock, METRICS.time("search_sync_seconds"):
+                self._search.sync(self.chain)
+                self._search_synced = True
+        return self._search
+
+    @property
+    def revocations(self) -> RevocationIndex:
+        """Himpunan ijazah yang dicabut, disinkronkan saat pertama dipakai"""
+        if not self._revocations_synced:
+            with self._lock, self.storage.lock, METRICS.time("revocations_sync_seconds"):
+                self._revocations.sync(self.chain)
+                self._revocations_synced = True
+        return self._revocations
+
     def _initialize_blockchain(self):
         """Initialize blockchain dengan genesis block atau load dari file"""
-        if os.path.exists(self.data_file):
+        if self.storage.exists():
             self.load_blockchain()
+        elif os.path.exists(self.data_file):
+            self.chain, self.pending_transactions = migrate_pickle_to_journal(self.data_file, self.storage)
+            if not self.chain:
+                self.chain = [self._create_genesis_block()]
+                self.save_blockchain()
+            print(f"✅ Blockchain dimigrasi dari pickle ke journal: {len(self.chain)} blocks")
         else:
             self.chain = [self._create_genesis_block()]
             self.save_blockchain()
 
+    def refresh(self) -> int:
+        """Memuat blok yang ditambang proses lain sejak chain dibuka.
+
+        Mengembalikan jumlah blok baru; index dan statistik yang sudah dimuat
+        ikut disusulkan.
+        """
+        with self._lock:
+            added = self.storage.blocks.refresh()
+            if added:
+                with self.storage.lock:
+                    self._sync_derived()
+            return added
+
+    def reload_pending(self):
+        """Muat ulang pending pool dari journal, termasuk transaksi dari proses lain"""
+        with self._lock:
+            # Transaksi yang sedang ditulis thread lain akan ditambahkan penulisnya sendiri
+            self.pending_transactions = [tx for tx in self.storage.read_pending()
+                                         if tx.transaction_id not in self._persisting]
+
+    def _sync_derived(self):
+        """Susulkan index dan statistik yang sudah dimuat ke ujung chain.
+
+        Yang belum dimuat akan menyusul saat pertama dipakai.
+        """
+        if self._index_synced:
+            self._index.sync(self.chain, recovery=self._recovery_snapshot)
+        if self._aggregates_synced:
+            self._aggregates.sync(self.chain, recovery=self._recovery_snapshot)
+        if self._search_synced:
+            self._search.sync(self.chain)
+        if self._revocations_synced:
+            self._revocations.sync(self.chain)
+        if self.sql.enabled:
+            import sqlite3
+
+            try:
+                self.sql.sync(self.chain)
+            except (sqlite3.Error, ValueError) as e:
+                # Read model tidak boleh menggagalkan penambangan; bisa disusulkan dengan `sync-sql`
+                print(f"⚠️  Read model SQL tidak tersinkron: {e}")
+
+    @staticmethod
+    def recover(data_dir: str = "data") -> Dict:
+        """Pulihkan journal yang rusak tanpa membuka chain (yang akan gagal dimuat).
+
+        Record yang masih terbaca digabung dengan pending pool snapshot
+        terbaru; index dan statistik yang rusak pulih sendiri saat dipakai.
+        """
+        from app.snapshot import SnapshotManager, recover_journal
+
+        storage = JournalStorage(os.path.join(data_dir, "blockchain.journal"), os.path.join(data_dir, "blocks"))
+        return recover_journal(storage, SnapshotManager(os.path.join(data_dir, "snapshots")))
+
+    def _recovery_snapshot(self) -> Optional["Snapshot"]:
+        snapshot = self.snapshots.latest(self.chain)
+        if snapshot is not None:
+            print(f"♻️  Memulihkan state turunan dari snapshot blok #{snapshot.height - 1}")
+        return snapshot
+
+    def _after_block(self):
+        """Dipanggil di bawah lock storage setelah blok disimpan"""
+        self._sync_derived()
+        self.take_snapshot_if_due()
+
+    def take_snapshot_if_due(self) -> Optional["Snapshot"]:
+        if self.snapshots.due(len(self.chain)):
+            return self.take_snapshot()
+        return None
+
+    def take_snapshot(self) -> "Snapshot":
+        """Simpan snapshot statistik, index dan pending pool pada ujung chain saat ini"""
+        with self._lock, self.storage.lock, METRICS.time("snapshot_seconds"):
+            self.refresh()
+            index = self.index
+            aggregates = self.aggregates
+            pending = [tx.to_dict() for tx in self.storage.read_pending()]
+            return self.snapshots.write(self.chain, aggregates.to_dict(), index.records(), pending)
+
+    def sync_sql(self, rebuild: bool = False, progress=None) -> Dict:
+        """Buat atau susulkan read model SQLite ke ujung chain"""
+        with self._lock, self.storage.lock:
+            self.refresh()
+            if rebuild:
+                return self.sql.rebuild(self.chain, progress)
+            return self.sql.sync(self.chain, progress)
+
     def _create_genesis_block(self) -> Block:
         """Membuat genesis block"""
         genesis_transaction = Transaction(
@@ -45,50 +303,71 @@ class UniversityBlockchain:
             index=0,
             transactions=[genesis_transaction],
             timestamp=datetime.now(),
-            previous_hash="0" * 64
+            previous_hash="0" * 64,
+            difficulty=self.difficulty
+        )
+
+    def _build_degree_transaction(self, student_data: Dict) -> Transaction:
+        """Validasi data mahasiswa dan buat transaksi ijazah (tanpa menyimpan)"""
+        missing = [key for key in REQUIRED_STUDENT_FIELDS if not student_data.get(key)]
+        if missing:
+            raise ValueError(f"Kolom wajib tidak ada: {', '.join(missing)}")
+
+        # Validasi data
+        if not validate_nim(student_data["nim"]):
+            raise ValueError("NIM tidak valid")
+
+        if not validate_gpa(student_data["gpa"]):
+            raise ValueError("GPA tidak valid")
+
+        # Hitung hash dokumen
+        document_hash = calculate_hash(
+            f"{student_data['nim']}"
+            f"{student_data['name']}"
+            f"{student_data['degree']}"
+            f"{student_data['major']}"
+            f"{student_data['gpa']}"
+            f"{student_data['graduation_date']}"
+        )
+
+        return Transaction(
+            transaction_type="degree_issuance",
+            student_nim=student_data["nim"],
+            student_name=student_data["name"],
+            degree=student_data["degree"],
+            major=student_data["major"],
+            gpa=student_data["gpa"],
+            graduation_date=student_data["graduation_date"],
+            document_hash=document_hash,
+            issuer=student_data.get("issuer") or "University Registrar",
+            timestamp=datetime.now()
         )
 
+    def _add_pending(self, transactions: List[Transaction]):
+        """Tulis transaksi ke journal (group commit, di bawah file lock), baru
+        masukkan ke pending pool di memori.
+
+        Jika penulisan gagal, exception diteruskan dan pending pool tidak
+        berubah, sehingga tidak ada transaksi yang hanya ada di memori.
+        """
+        ids = {tx.transaction_id for tx in transactions}
+        with self._lock:
+            self._persisting |= ids
+        try:
+            self.storage.append_transactions(transactions)
+        except BaseException:
+            with self._lock:
+                self._persisting -= ids
+            raise
+        with self._lock:
+            self._persisting -= ids
+            self.pending_transactions.extend(transactions)
+
     def add_degree_transaction(self, student_data: Dict) -> str:
         """Menambahkan transaksi ijazah baru"""
         try:
-            # Validasi data
-            if not validate_nim(student_data["nim"]):
-                raise ValueError("NIM tidak valid")
-            
-            if not validate_gpa(student_data["gpa"]):
-                raise ValueError("GPA tidak valid")
-
-            # Hitung hash dokumen
-            document_hash = calculate_hash(
-                f"{student_data['nim']}"
-                f"{student_data['name']}"
-                f"{student_data['degree']}"
-                f"{student_data['major']}"
-                f"{student_data['gpa']}"
-                f"{student_data['graduation_date']}"
-            )
-
-            # Buat transaksi
-            transaction = Transaction(
-                transaction_type="degree_issuance",
-                student_nim=student_data["nim"],
-                student_name=student_data["name"],
-                degree=student_data["degree"],
-                major=student_data["major"],
-                gpa=student_data["gpa"],
-                graduation_date=student_data["graduation_date"],
-                document_hash=document_hash,
-                issuer=student_data.get("issuer", "University Registrar"),
-                timestamp=datetime.now()
-            )
-
-            self.pending_transactions.append(transaction)
-            # Persist pending transactions so they survive separate CLI runs
-            try:
-                self.save_blockchain()
-            except Exception:
-                # Non-fatal: transaction was added in-memory
-                pass
+            transaction = self._build_degree_transaction(student_data)
+            self._add_pending([transaction])
 
             print(f"✅ Transaksi ijazah untuk {student_data['name']} berhasil ditambahkan ke pending transactions")
             return transaction.transaction_id
@@ -96,217 +375,596 @@ class UniversityBlockchain:
             print(f"❌ Error menambahkan transaksi: {e}")
             return ""
 
-    def add_bulk_transactions(self, students: List[Dict]) -> List[str]:
-        """Tambahkan banyak transaksi sekaligus dari list of student data dicts.
+    @timed("ingest_seconds")
+    def add_bulk_transactions(self, students: Iterable[Dict], chunk_size: int = 0,
+                              errors: Optional[List[Dict]] = None,
+                              on_chunk: Optional[Callable[[int, int], None]] = None) -> List[str]:
+        """Tambahkan banyak transaksi sekaligus dari iterable of student data dicts.
+
+        Records are validated and committed to storage in one write per chunk
+        (`chunk_size` records, or the whole input when 0). Invalid records are
+        skipped and described in `errors` when a list is given. `on_chunk` is
+        called with (rows processed, rows added) after every commit.
 
         Returns list of transaction IDs for added transactions.
         """
         tx_ids: List[str] = []
-        for student in students:
-            try:
-                tx_id = self.add_degree_transaction(student)
-                if tx_id:
-                    tx_ids.append(tx_id)
-            except Exception as e:
-                # Continue on error for other records, but report
-                print(f"❌ Error adding student {student.get('nim') or student.get('name')}: {e}")
-        # save_blockchain is already called by add_degree_transaction
+        batch: List[Transaction] = []
+        processed = 0
+
+        def commit():
+            self._add_pending(batch)
+            tx_ids.extend(tx.transaction_id for tx in batch)
+            batch.clear()
+            if on_chunk:
+                on_chunk(processed, len(tx_ids))
+
+        try:
+            for row, student in enumerate(students, 1):
+                processed = row
+                try:
+                    if not isinstance(student, dict):
+                        # Iterator ingest meng-yield exception untuk baris yang tidak bisa dibaca
+                        raise student if isinstance(student, Exception) else ValueError("Record bukan objek")
+                    batch.append(self._build_degree_transaction(student))
+                except Exception as e:
+                    nim = student.get("nim", "") if isinstance(student, dict) else ""
+                    if errors is None:
+                        label = nim or (student.get("name") if isinstance(student, dict) else f"baris {row}")
+                        print(f"❌ Error adding student {label}: {e}")
+                    else:
+                        errors.append({"row": row, "nim": nim, "error": str(e)})
+                if chunk_size and len(batch) >= chunk_size:
+                    commit()
+        finally:
+            # Record valid yang sudah terkumpul tetap disimpan walaupun input terputus
+            commit()
+        METRICS.inc("ingest_records_total", len(tx_ids), result="added")
+        METRICS.inc("ingest_records_total", processed - len(tx_ids), result="rejected")
         return tx_ids
 
-    def mine_pending_transactions(self) -> bool:
-        """Menambang blok baru dengan transaksi pending"""
-        if not self.pending_transactions:
-            print("❌ Tidak ada transaksi pending untuk ditambang")
-            return False
+    def select_block_transactions(self, max_transactions: Optional[int] = None,
+                                  max_bytes: Optional[int] = None) -> List[Transaction]:
+        """Prefix pending pool yang muat dalam batas jumlah transaksi dan byte.
 
-        print(f"⛏️  Menambang blok baru dengan {len(self.pending_transactions)} transaksi...")
-        
-        new_block = Block(
-            index=len(self.chain),
-            transactions=self.pending_transactions.copy(),
-            timestamp=datetime.now(),
-            previous_hash=self.get_latest_block().hash
-        )
+        Transaksi pertama selalu diambil walaupun sendirian melebihi `max_bytes`.
+        """
+        if max_transactions is None and max_bytes is None:
+            return self.pending_transactions.copy()
+
+        selected: List[Transaction] = []
+        size = 0
+        for tx in self.pending_transactions:
+            if max_transactions is not None and len(selected) >= max_transactions:
+                break
+            tx_size = transaction_size(tx)
+            if max_bytes is not None and selected and size + tx_size > max_bytes:
+                break
+            selected.append(tx)
+            size += tx_size
+        return selected
+
+    def mine_pending_transactions(self, workers: int = 1, max_transactions: Optional[int] = None,
+                                  max_bytes: Optional[int] = None, quiet: bool = False) -> bool:
+        """Menambang blok baru dengan transaksi pending.
+
+        `workers` > 1 membagi ruang nonce ke beberapa proses (0 = jumlah CPU).
+        Dengan `max_transactions`/`max_bytes` hanya prefix pending pool yang
+        muat yang ditambang; sisanya tetap pending untuk blok berikutnya.
+
+        Lock hanya dipegang saat memilih transaksi dan menyimpan blok, tidak
+        selama proof-of-work. Jika proses atau thread lain menyimpan blok lebih
+        dulu, blok ini ditolak dan False dikembalikan. `quiet` menyembunyikan
+        output progres (dipakai scheduler yang mencatat blok sendiri).
+        """
+        from app.mining import mine_block, mine_block_parallel
+
+        say = (lambda *args, **kwargs: None) if quiet else print
+        dot = None if quiet else (lambda *_: print(".", end="", flush=True))
+        with self._lock:
+            if not self.pending_transactions:
+                say("❌ Tidak ada transaksi pending untuk ditambang")
+                return False
+
+            transactions = self.select_block_transactions(max_transactions, max_bytes)
+            difficulty = self.next_difficulty()
+            new_block = Block(
+                index=len(self.chain),
+                transactions=transactions,
+                timestamp=datetime.now(),
+                previous_hash=self.get_latest_block().hash,
+                difficulty=difficulty
+            )
+        say(f"⛏️  Menambang blok baru dengan {len(transactions)} transaksi (difficulty {difficulty})...")
 
         # Mining process dengan progress indicator
-        print("Mining in progress", end="")
+        say("Mining in progress", end="")
         start_time = time.time()
-        
-        while new_block.hash[:self.difficulty] != "0" * self.difficulty:
-            new_block.nonce += 1
-            new_block.hash = new_block.calculate_hash()
-            if new_block.nonce % 1000 == 0:
-                print(".", end="", flush=True)
+
+        if workers == 1:
+            result = mine_block(new_block, difficulty, progress=dot)
+        else:
+            result = mine_block_parallel(new_block, difficulty, workers, progress=dot)
+        new_block.nonce = result.nonce
+        new_block.hash = result.hash
 
         mining_time = time.time() - start_time
-        print(f"\n✅ Blok #{new_block.index} berhasil ditambang!")
-        print(f"⏱️  Waktu mining: {mining_time:.2f} detik")
-        print(f"🔗 Hash: {new_block.hash}")
-        print(f"🔢 Nonce: {new_block.nonce}")
+        self.difficulty_control.record(result.attempts, result.elapsed)
+        METRICS.inc("mining_attempts_total", result.attempts)
+        METRICS.observe("mining_seconds", mining_time)
 
-        self.chain.append(new_block)
-        self.pending_transactions = []
-        self.save_blockchain()
-        
+        with self._lock:
+            try:
+                self.storage.append_block(new_block, on_commit=self._after_block)
+            except StaleChainError as e:
+                METRICS.inc("blocks_stale_total")
+                say(f"\n❌ {e}; transaksi tetap pending, tambang ulang")
+                return False
+            mined = {tx.transaction_id for tx in transactions}
+            self.pending_transactions = [tx for tx in self.pending_transactions
+                                         if tx.transaction_id not in mined]
+
+        METRICS.inc("blocks_mined_total")
+        say(f"\n✅ Blok #{new_block.index} berhasil ditambang!")
+        say(f"⏱️  Waktu mining: {mining_time:.2f} detik")
+        say(f"⚡ Hash rate: {result.hash_rate:,.0f} hashes/sec")
+        say(f"🔗 Hash: {new_block.hash}")
+        say(f"🔢 Nonce: {new_block.nonce}")
         return True
 
+    def append_blocks(self, blocks: List[Block], replace: bool = False):
+        """Tambahkan blok yang sudah divalidasi dari luar (mis. sinkronisasi peer).
+
+        Dengan `replace`, chain lokal dikosongkan lebih dulu; dipakai node baru
+        yang baru berisi genesis miliknya sendiri. Transaksi pending yang ikut
+        masuk blok dibuang dari pending pool. Snapshot tidak dibuat di sini;
+        panggil `take_snapshot_if_due` setelah sinkronisasi selesai.
+        """
+        with self._lock:
+            if replace:
+                self.chain = self.storage.rewrite([], self.pending_transactions)
+                self._index_synced = False
+                self._aggregates_synced = False
+                self._search_synced = False
+                self._revocations_synced = False
+            self.storage.append_blocks(blocks, on_commit=self._sync_derived)
+            included = {tx.transaction_id for block in blocks for tx in block.transactions}
+            self.pending_transactions = [tx for tx in self.pending_transactions
+                                         if tx.transaction_id not in included]
+
+    def _find_degree(self, document_hash: str, student_nim: str) -> Optional[Tuple[int, int, Transaction]]:
+        """Mencari transaksi ijazah lewat index document_hash"""
+        for block_index, position in self.index.lookup_document(document_hash):
+            transaction = self.chain.transaction(block_index, position)
+            if (transaction.transaction_type == "degree_issuance" and
+                transaction.student_nim == student_nim and
+                transaction.document_hash == document_hash):
+                return block_index, position, transaction
+        return None
+
+    @timed("lookup_seconds", op="verify_degree")
     def verify_degree(self, document_hash: str, student_nim: str) -> Dict:
         """Memverifikasi keaslian ijazah"""
-        for block in self.chain:
-            for transaction in block.transactions:
-                if (transaction.transaction_type == "degree_issuance" and
-                    transaction.student_nim == student_nim and
-                    transaction.document_hash == document_hash):
-                    
-                    return {
-                        "verified": True,
-                        "block_index": block.index,
-                        "transaction_data": transaction.to_dict(),
-                        "block_hash": block.hash,
-                        "timestamp": block.timestamp.isoformat()
-                    }
+        found = self._find_degree(document_hash, student_nim)
+        if found:
+            block_index, _, transaction = found
+            header = self.chain.header(block_index)
+            result = {
+                "verified": True,
+                "revoked": False,
+                "block_index": header.index,
+                "transaction_data": transaction.to_dict(),
+                "block_hash": header.hash,
+                "timestamp": header.timestamp.isoformat()
+            }
+            revocation = self._revocation_info(document_hash, student_nim)
+            if revocation:
+                result.update({
+                    "verified": False,
+                    "revoked": True,
+                    "revocation": revocation,
+                    "message": f"Ijazah telah dicabut di blok #{revocation['block_index']}: {revocation['reason']}"
+                })
+            return result
         
         return {"verified": False, "message": "Ijazah tidak ditemukan dalam blockchain"}
 
+    def _revocation_info(self, document_hash: str, student_nim: str) -> Optional[Dict]:
+        """Data pencabutan ijazah dari himpunan revocation (lookup O(1))"""
+        location = self.revocations.lookup(document_hash, student_nim)
+        if location is None:
+            return None
+        block_index, position = location
+        transaction = self.chain.transaction(block_index, position)
+        header = self.chain.header(block_index)
+        return {
+            "block_index": block_index,
+            "block_hash": header.hash,
+            "transaction_id": transaction.transaction_id,
+            "reason": transaction.reason,
+            "issuer": transaction.issuer,
+            "timestamp": header.timestamp.isoformat()
+        }
+
+    def revoke_degree(self, document_hash: str, student_nim: str, reason: str,
+                      issuer: Optional[str] = None) -> str:
+        """Menambahkan transaksi pencabutan ijazah ke pending transactions.
+
+        Ijazah dianggap dicabut setelah transaksinya ditambang; data ijazah
+        asli disalin ke transaksi pencabutan.
+        """
+        if not reason or not reason.strip():
+            raise ValueError("Alasan pencabutan wajib diisi")
+        found = self._find_degree(document_hash, student_nim)
+        if not found:
+            raise ValueError("Ijazah tidak ditemukan dalam blockchain")
+        revocation = self._revocation_info(document_hash, student_nim)
+        if revocation:
+            raise ValueError(f"Ijazah sudah dicabut di blok #{revocation['block_index']}")
+
+        _, _, degree = found
+        transaction = Transaction(
+            transaction_type="degree_revocation",
+            student_nim=degree.student_nim,
+            student_name=degree.student_name,
+            degree=degree.degree,
+            major=degree.major,
+            gpa=degree.gpa,
+            graduation_date=degree.graduation_date,
+            document_hash=degree.document_hash,
+            issuer=issuer or degree.issuer,
+            timestamp=datetime.now(),
+            reason=reason.strip()
+        )
+        with self._lock:
+            if any(tx.transaction_type == "degree_revocation" and tx.document_hash == document_hash
+                   and tx.student_nim == student_nim for tx in self.pending_transactions):
+                raise ValueError("Pencabutan ijazah ini sudah menunggu ditambang")
+            self.pending_transactions.append(transaction)
+        self.storage.append_transaction(transaction)
+        return transaction.transaction_id
+
+    @timed("lookup_seconds", op="student_degrees")
     def get_student_degrees(self, student_nim: str) -> List[Dict]:
         """Mendapatkan semua ijazah seorang mahasiswa"""
         degrees = []
-        for block in self.chain:
-            for transaction in block.transactions:
-                if (transaction.transaction_type == "degree_issuance" and 
-                    transaction.student_nim == student_nim):
-                    degrees.append({
-                        "block_index": block.index,
-                        "degree_data": transaction.to_dict(),
-                        "block_timestamp": block.timestamp.isoformat()
-                    })
+        for block_index, position in self.index.lookup_nim(student_nim):
+            transaction = self.chain.transaction(block_index, position)
+            degrees.append({
+                "block_index": block_index,
+                "degree_data": transaction.to_dict(),
+                "block_timestamp": self.chain.header(block_index).timestamp.isoformat(),
+                "revoked": self.revocations.lookup(transaction.document_hash, student_nim) is not None
+            })
         return degrees
 
+    @timed("lookup_seconds", op="search")
+    def search_degrees(self, name: Optional[str] = None, major: Optional[str] = None,
+                       degree: Optional[str] = None, graduated_from: Optional[str] = None,
+                       graduated_to: Optional[str] = None, offset: int = 0, limit: int = 20) -> Dict:
+        """Mencari ijazah berdasarkan nama, jurusan, gelar dan rentang tanggal lulus"""
+        total, locations = self.search_index.search(name=name, major=major, degree=degree,
+                                                    date_from=graduated_from, date_to=graduated_to,
+                                                    offset=offset, limit=limit)
+        results = []
+        for block_index, position in locations:
+            transaction = self.chain.transaction(block_index, position)
+            results.append({
+                "block_index": block_index,
+                "degree_data": transaction.to_dict(),
+                "block_timestamp": self.chain.header(block_index).timestamp.isoformat(),
+                "revoked": self.revocations.lookup(transaction.document_hash, transaction.student_nim) is not None
+            })
+        return {"total": total, "offset": offset, "limit": limit, "results": results}
+
+    def get_inclusion_proof(self, document_hash: str, student_nim: str) -> Optional[Dict]:
+        """Membuat Merkle inclusion proof untuk sebuah ijazah.
+
+        Proof berisi data transaksi, header blok dan sibling hash sepanjang
+        jalur ke Merkle root, sehingga bisa diperiksa tanpa seluruh blok.
+        """
+        found = self._find_degree(document_hash, student_nim)
+        if found:
+            block_index, position, _ = found
+            block = self.chain[block_index]
+            leaves = block.transaction_hashes()
+            return {
+                "transaction": block.transactions[position].to_dict(),
+                "transaction_hash": leaves[position],
+                "position": position,
+                "proof": merkle_proof(leaves, position),
+                "block": {
+                    "index": block.index,
+                    "version": block.version,
+                    "timestamp": block.timestamp.isoformat(),
+                    "previous_hash": block.previous_hash,
+                    "nonce": block.nonce,
+                    "merkle_root": block.merkle_root,
+                    "difficulty": block.difficulty,
+                    "hash": block.hash
+                }
+            }
+        return None
+
+    def check_inclusion_proof(self, proof: Dict) -> Dict:
+        """Memeriksa inclusion proof terhadap chain lokal.
+
+        Selain pemeriksaan `verify_inclusion_proof`, hash blok di proof harus
+        sama dengan hash blok pada indeks yang sama di chain ini.
+        """
+        index = proof["block"]["index"]
+        if not isinstance(index, int) or not 0 <= index < len(self.chain):
+            return {"valid": False, "reason": f"Blok #{index} tidak ada di chain"}
+        return verify_inclusion_proof(proof, block_hash_at(self.chain, index))
+
+    def upgrade_chain_format(self) -> int:
+        """Migrasi blok format lama (v1) ke format Merkle (v2).
+
+        Hash blok v2 berbeda dari v1, sehingga setiap blok setelah blok pertama
+        yang dimigrasi harus ditambang ulang agar rantai previous_hash tetap
+        tersambung. Blok yang belum mencatat difficulty diberi satu difficulty
+        yang ditebak dari hash-nya (difficulty hanya boleh berubah pada tinggi
+        retarget); blok yang ditambang ulang ditambang dengan difficulty
+        tercatatnya. Mengembalikan jumlah blok yang ditulis ulang.
+        """
+        from app.mining import mine_block
+
+        chain = list(self.chain)
+        first_legacy = next(
+            (i for i, block in enumerate(chain) if block.version == BLOCK_VERSION_LEGACY), len(chain)
+        )
+        # Blok sebelum blok lama pertama tidak ditambang ulang; hash v2 tidak
+        # memuat difficulty sehingga cukup dicatat
+        unrecorded = [i for i in range(first_legacy) if chain[i].difficulty is None]
+        if first_legacy == len(chain) and not unrecorded:
+            return 0
+
+        inferred = infer_difficulty([block for block in chain if block.difficulty is None])
+        if inferred is None:
+            inferred = self.difficulty
+        for i in unrecorded:
+            chain[i].difficulty = inferred
+            print(f"🔄 Difficulty blok #{i} dicatat: {inferred}")
+
+        for i in range(first_legacy, len(chain)):
+            old = chain[i]
+            # Blok yang sudah lebih baru hanya ditambang ulang, format dan
+            # difficulty tercatatnya dipertahankan
+            block = Block(
+                index=old.index,
+                transactions=old.transactions,
+                timestamp=old.timestamp,
+                previous_hash=chain[i - 1].hash if i > 0 else old.previous_hash,
+                version=max(old.version, BLOCK_VERSION_MERKLE),
+                difficulty=old.difficulty if old.difficulty is not None else inferred
+            )
+            if i > 0:
+                result = mine_block(block, block.difficulty)
+                block.nonce = result.nonce
+                block.hash = result.hash
+            chain[i] = block
+            print(f"🔄 Blok #{block.index} dimigrasi ke format v{block.version}")
+
+        self.chain = chain
+        self.save_blockchain()
+        return len(unrecorded) + len(chain) - first_legacy
+
     def get_blockchain_info(self) -> Dict:
         """Mendapatkan informasi blockchain"""
-        total_transactions = sum(len(block.transactions) for block in self.chain)
-        degree_transactions = sum(
-            1 for block in self.chain 
-            for tx in block.transactions 
-            if tx.transaction_type == "degree_issuance"
-        )
-        
+        aggregates = self.aggregates
         return {
             "total_blocks": len(self.chain),
-            "total_transactions": total_transactions,
-            "degree_transactions": degree_transactions,
+            "total_transactions": aggregates.total_transactions,
+            "degree_transactions": aggregates.by_type.get("degree_issuance", 0),
+            "revoked_degrees": len(self.revocations),
+            "transactions_by_type": dict(aggregates.by_type),
+            "degrees_by_issuer": dict(aggregates.by_issuer),
+            "degrees_by_major": dict(aggregates.by_major),
             "pending_transactions": len(self.pending_transactions),
-            "difficulty": self.difficulty,
-            "chain_hash": self.get_latest_block().hash
+            "difficulty": self.current_difficulty,
+            "next_difficulty": self.next_difficulty(),
+            "chain_hash": block_hash_at(self.chain, -1)
         }
 
+    @property
+    def current_difficulty(self) -> int:
+        """Difficulty tercatat di ujung chain, atau difficulty instance untuk chain lama"""
+        return recorded_difficulty(self.chain, -1) or self.difficulty
+
+    def next_difficulty(self) -> int:
+        """Difficulty untuk blok berikutnya setelah retarget"""
+        return self.difficulty_control.next_difficulty(self.chain, self.difficulty)
+
     def get_latest_block(self) -> Block:
         """Mendapatkan blok terakhir"""
         return self.chain[-1]
 
-    def is_chain_valid(self) -> bool:
-        """Memvalidasi integritas seluruh blockchain"""
-        for i in range(1, len(self.chain)):
-            current_block = self.chain[i]
-            previous_block = self.chain[i-1]
+    @timed("validate_seconds")
+    def validate(self, full: bool = False, workers: int = 1) -> Dict:
+        """Memvalidasi blockchain dan mengembalikan laporan machine-readable.
 
-            # Cek hash blok saat ini
-            if current_block.hash != current_block.calculate_hash():
-                print(f"❌ Hash blok {current_block.index} tidak valid!")
-                return False
+        Tanpa `full`, hanya blok setelah checkpoint validasi terakhir yang
+        dicek. Checkpoint dimajukan ke ujung chain jika validasi berhasil.
+        Statistik chain yang tersimpan dibandingkan dan diperbaiki jika berbeda.
+        """
+        from app.validation import validate_chain
 
-            # Cek koneksi dengan blok sebelumnya
-            if current_block.previous_hash != previous_block.hash:
-                print(f"❌ Hash sebelumnya pada blok {current_block.index} tidak valid!")
-                return False
+        start = 1 if full else self.checkpoint.load(self.chain)
+        report = validate_chain(self.chain, self.difficulty, start=start, workers=workers)
+        METRICS.inc("blocks_validated_total", max(len(self.chain) - start, 0))
+        if report["valid"]:
+            self.checkpoint.save(self.chain)
 
-            # Cek proof-of-work
-            if current_block.hash[:self.difficulty] != "0" * self.difficulty:
-                print(f"❌ Proof-of-work blok {current_block.index} tidak valid!")
-                return False
+        # Statistik: hitung ulang penuh pada --full, cek ujung chain pada mode inkremental
+        if full:
+            mismatched = self.aggregates.compare(self.chain)
+        else:
+            mismatched = [] if self.aggregates.height == len(self.chain) and self.aggregates.matches(self.chain) \
+                else ["height", "tip_hash"]
+        report["aggregates"] = {"consistent": not mismatched, "mismatched_fields": mismatched}
+        if mismatched:
+            self.aggregates.recompute(self.chain)
+            self.aggregates.save()
+        return report
+
+    def is_chain_valid(self) -> bool:
+        """Memvalidasi integritas seluruh blockchain"""
+        report = self.validate(full=True)
+        if not report["valid"]:
+            print(f"❌ {report['message']}")
+            return False
 
         print("✅ Blockchain valid dan aman!")
         return True
 
     def save_blockchain(self):
-        """Menyimpan blockchain ke file"""
-        os.makedirs("data", exist_ok=True)
-        # Store both chain and pending transactions for full persistence
-        payload = {
-            "chain": self.chain,
-            "pending_transactions": self.pending_transactions,
-        }
-        with open(self.data_file, "wb") as f:
-            pickle.dump(payload, f)
+        """Menulis ulang seluruh block store dan journal dari state saat ini"""
+        os.makedirs(self.data_dir, exist_ok=True)
+        with self._lock:
+            self.chain = self.storage.rewrite(self.chain, self.pending_transactions)
+            self._index_synced = False
+            self._aggregates_synced = False
+            self._search_synced = False
+            self._revocations_synced = False
 
+    @timed("load_seconds")
     def load_blockchain(self):
-        """Load blockchain dari file"""
-        try:
-            with open(self.data_file, "rb") as f:
-                data = pickle.load(f)
-
-            # Backwards compatibility: older files may contain only the chain list
-            if isinstance(data, dict) and "chain" in data:
-                self.chain = data.get("chain", [self._create_genesis_block()])
-                self.pending_transactions = data.get("pending_transactions", [])
-            elif isinstance(data, list):
-                self.chain = data
-                self.pending_transactions = []
-            else:
-                # Unknown format: recreate genesis
-                self.chain = [self._create_genesis_block()]
-                self.pending_transactions = []
+        """Load blockchain dari block store dan me-replay journal pending.
 
-            print(f"✅ Blockchain loaded: {len(self.chain)} blocks")
-        except Exception as e:
-            print(f"❌ Error loading blockchain: {e}")
+        Data yang rusak menghasilkan `CorruptStateError` dan tidak pernah
+        diganti diam-diam dengan chain baru; pulihkan dengan `./run recover`.
+        """
+        try:
+            self.chain, self.pending_transactions = self.storage.replay()
+        except (OSError, ValueError) as e:
+            raise CorruptStateError(
+                f"Gagal memuat blockchain dari {self.data_dir}: {e}. "
+                f"Data tidak diubah; jalankan `./run recover` untuk memulihkan pending pool dari snapshot"
+            ) from e
+        if not self.chain:
             self.chain = [self._create_genesis_block()]
-            self.pending_transactions = []
+            self.save_blockchain()
+
+        print(f"✅ Blockchain loaded: {len(self.chain)} blocks")
+
+    def iter_blocks(self, start: int = 0, stop: Optional[int] = None, nim: Optional[str] = None,
+                    major: Optional[str] = None, issuer: Optional[str] = None
+                    ) -> Iterator[Tuple[Block, List[Tuple[int, Transaction]]]]:
+        """Generator (blok, [(posisi, transaksi)]) untuk blok start..stop-1.
 
-    def display_chain(self, detailed: bool = False):
-        """Menampilkan isi blockchain"""
+        Tanpa filter setiap blok dihasilkan dengan semua transaksinya. Dengan
+        filter NIM, jurusan atau penerbit hanya transaksi ijazah dan
+        pencabutannya yang cocok yang disertakan, dan blok tanpa transaksi
+        cocok dilewati. Filter NIM memakai index ijazah dan index pencabutan
+        sehingga hanya blok yang memuat NIM tersebut dibaca.
+        """
+        height = len(self.chain)
+        start = max(start, 0)
+        stop = height if stop is None else min(stop, height)
+        filtered = nim is not None or major is not None or issuer is not None
+
+        if nim is not None:
+            locations = self.index.lookup_nim(nim) + self.revocations.lookup_nim(nim)
+            block_indexes = sorted({i for i, _ in locations if start <= i < stop})
+        else:
+            block_indexes = range(start, stop)
+
+        for i in block_indexes:
+            block = block_at(self.chain, i)
+            txs = list(enumerate(block.transactions))
+            if filtered:
+                txs = [
+                    (pos, tx) for pos, tx in txs
+                    if tx.transaction_type in ("degree_issuance", "degree_revocation")
+                    and (nim is None or tx.student_nim == nim)
+                    and (major is None or tx.major == major)
+                    and (issuer is None or tx.issuer == issuer)
+                ]
+                if not txs:
+                    continue
+            yield block, txs
+
+    def display_chain(self, detailed: bool = False, start: int = 0, stop: Optional[int] = None,
+                      limit: Optional[int] = None, page_size: int = 50, **filters):
+        """Menampilkan isi blockchain secara bertahap.
+
+        Baris dicetak per halaman berisi `page_size` blok sehingga output
+        pertama langsung muncul dan memori tidak bergantung pada panjang chain.
+        """
         from tabulate import tabulate
-        
-        if not detailed:
-            # Tampilan ringkas
-            table_data = []
-            for block in self.chain:
+
+        filtered = any(value is not None for value in filters.values())
+        headers = ["Block", "Timestamp", "Total TX", "Degree TX", "Hash", "Previous Hash"]
+        if filtered:
+            headers.append("Cocok")
+
+        shown = 0
+        last_index = None
+        page = []
+
+        def flush():
+            if page:
+                print(tabulate(page, headers=headers, tablefmt="grid"))
+                page.clear()
+
+        for block, txs in self.iter_blocks(start, stop, **filters):
+            if limit is not None and shown >= limit:
+                flush()
+                print(f"➡️  Halaman berikutnya: --from {last_index + 1}")
+                return
+            shown += 1
+            last_index = block.index
+
+            if not detailed:
+                # Tampilan ringkas
                 degree_txs = sum(1 for tx in block.transactions if tx.transaction_type == "degree_issuance")
-                table_data.append([
+                row = [
                     block.index,
                     block.timestamp.strftime("%Y-%m-%d %H:%M"),
                     len(block.transactions),
                     degree_txs,
                     block.hash[:16] + "...",
                     block.previous_hash[:16] + "..."
-                ])
-            
-            headers = ["Block", "Timestamp", "Total TX", "Degree TX", "Hash", "Previous Hash"]
-            print(tabulate(table_data, headers=headers, tablefmt="grid"))
-        
-        else:
+                ]
+                if filtered:
+                    row.append(len(txs))
+                page.append(row)
+                if len(page) >= page_size:
+                    flush()
+                continue
+
             # Tampilan detail
-            for block in self.chain:
-                print(f"\n{'='*60}")
-                print(f"📦 BLOK #{block.index}")
-                print(f"{'='*60}")
-                print(f"🕐 Timestamp: {block.timestamp}")
-                print(f"🔗 Hash: {block.hash}")
-                print(f"🔗 Previous Hash: {block.previous_hash}")
-                print(f"🔢 Nonce: {block.nonce}")
-                print(f"📋 Jumlah Transaksi: {len(block.transactions)}")
-                
-                for i, tx in enumerate(block.transactions):
-                    if tx.transaction_type == "degree_issuance":
-                        print(f"\n  📝 Transaksi #{i+1} - Ijazah")
-                        print(f"     👨‍🎓 NIM: {tx.student_nim}")
-                        print(f"     🧑 Nama: {tx.student_name}")
-                        print(f"     🎓 Gelar: {tx.degree}")
-                        print(f"     📚 Jurusan: {tx.major}")
-                        print(f"     📊 GPA: {tx.gpa}")
-                        print(f"     🏅 Penerbit: {tx.issuer}")
-                        print(f"     🔐 Document Hash: {tx.document_hash[:16]}...")
-                    else:
-                        print(f"\n  ⚙️  Transaksi #{i+1} - System")
-                
-                print(f"{'='*60}")
\ No newline at end of file
+            print(f"\n{'='*60}")
+            print(f"📦 BLOK #{block.index}")
+            print(f"{'='*60}")
+            print(f"🕐 Timestamp: {block.timestamp}")
+            print(f"🔗 Hash: {block.hash}")
+            print(f"🔗 Previous Hash: {block.previous_hash}")
+            print(f"🔢 Nonce: {block.nonce}")
+            print(f"📋 Jumlah Transaksi: {len(block.transactions)}")
+
+            for i, tx in txs:
+                if tx.transaction_type == "degree_issuance":
+                    print(f"\n  📝 Transaksi #{i+1} - Ijazah")
+                    print(f"     👨‍🎓 NIM: {tx.student_nim}")
+                    print(f"     🧑 Nama: {tx.student_name}")
+                    print(f"     🎓 Gelar: {tx.degree}")
+                    print(f"     📚 Jurusan: {tx.major}")
+                    print(f"     📊 GPA: {tx.gpa}")
+                    print(f"     🏅 Penerbit: {tx.issuer}")
+                    print(f"     🔐 Document Hash: {tx.document_hash[:16]}...")
+                elif tx.transaction_type == "degree_revocation":
+                    print(f"\n  🚫 Transaksi #{i+1} - Pencabutan Ijazah")
+                    print(f"     👨‍🎓 NIM: {tx.student_nim}")
+                    print(f"     🧑 Nama: {tx.student_name}")
+                    print(f"     📝 Alasan: {tx.reason}")
+                    print(f"     🏅 Penerbit: {tx.issuer}")
+                    print(f"     🔐 Document Hash: {tx.document_hash[:16]}...")
+                else:
+                    print(f"\n  ⚙️  Transaksi #{i+1} - System")
+
+            print(f"{'='*60}")
+
+        flush()
+        if shown == 0:
+            print("📭 Tidak ada blok yang cocok")
@@ -0,0 +1,159 @@
+import json
+import math
+import os
+from collections import deque
+from typing import Dict, Optional, Sequence
+
+from app.blockstore import header_at
+
+
+# Aturan chain (dicek saat validasi, tidak bergantung konfigurasi):
+# difficulty tercatat minimal MIN_DIFFICULTY, hanya boleh berubah pada blok
+# yang indeksnya kelipatan RETARGET_INTERVAL, dan paling banyak
+# MAX_DIFFICULTY_STEP per retarget.
+MIN_DIFFICULTY = 1
+MAX_DIFFICULTY_STEP = 1
+RETARGET_INTERVAL = 10
+# Difficulty = jumlah digit hex nol; setiap langkah = 16x lebih banyak hash
+HASHES_PER_STEP = 16
+
+HASH_RATE_WINDOW = 50
+
+
+def recorded_difficulty(chain: Sequence, index: int) -> Optional[int]:
+    """Difficulty yang tercatat di header blok `index` (None untuk blok lama)"""
+    return header_at(chain, index).difficulty
+
+
+def infer_difficulty(blocks: Sequence) -> Optional[int]:
+    """Tebak difficulty blok lama dari digit hex nol di awal hash-nya.
+
+    Blok lama ditambang dengan difficulty yang sama, jadi diambil jumlah nol
+    terkecil di antara blok yang ditambang (genesis tidak ikut). Hasilnya
+    selalu dipenuhi setiap blok tersebut. None jika tidak ada blok tertambang.
+    """
+    zeros = [len(block.hash) - len(block.hash.lstrip("0")) for block in blocks if block.index > 0]
+    if not zeros:
+        return None
+    return max(min(zeros), MIN_DIFFICULTY)
+
+
+def check_difficulty_step(previous: Optional[int], difficulty: Optional[int], index: int,
+                          start: Optional[int] = None) -> bool:
+    """Cek aturan perubahan difficulty dari blok sebelumnya ke blok `index`.
+
+    Di luar tinggi retarget difficulty harus sama dengan blok sebelumnya.
+    `start` adalah difficulty awal terkonfigurasi, dipakai untuk blok #1 jika
+    genesis tidak mencatat difficulty.
+    """
+    if difficulty is None:
+        return True
+    if difficulty < MIN_DIFFICULTY:
+        return False
+    if previous is None and index == 1:
+        previous = start
+    if previous is None:
+        return True
+    if index % RETARGET_INTERVAL != 0:
+        return difficulty == previous
+    return abs(difficulty - previous) <= MAX_DIFFICULTY_STEP
+
+
+class DifficultyController:
+    """Konfigurasi retarget dan hash rate terukur, disimpan di file JSON kecil.
+
+    Setiap `RETARGET_INTERVAL` blok, difficulty blok berikutnya diarahkan ke nilai yang
+    membuat waktu mining rata-rata mendekati `target_block_time`, berdasarkan
+    hash rate dari blok-blok terakhir yang ditambang di mesin ini. Perubahan
+    dibatasi satu langkah per retarget. Tanpa `target_block_time` retarget
+    nonaktif dan difficulty ujung chain dipakai terus.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.target_block_time: Optional[float] = None
+        self.min_difficulty = MIN_DIFFICULTY
+        self.max_difficulty = 8
+        # (attempts, elapsed) dari blok terakhir yang ditambang
+        self.samples = deque(maxlen=HASH_RATE_WINDOW)
+        self.load()
+
+    def configure(self, target_block_time: Optional[float] = None,
+                  min_difficulty: Optional[int] = None, max_difficulty: Optional[int] = None,
+                  disable: bool = False):
+        if disable:
+            self.target_block_time = None
+        elif target_block_time is not None:
+            if target_block_time <= 0:
+                raise ValueError("Target waktu blok harus lebih dari 0")
+            self.target_block_time = target_block_time
+        if min_difficulty is not None:
+            self.min_difficulty = max(min_difficulty, MIN_DIFFICULTY)
+        if max_difficulty is not None:
+            self.max_difficulty = max_difficulty
+        if self.min_difficulty > self.max_difficulty:
+            raise ValueError("Difficulty minimum lebih besar dari maksimum")
+        self.save()
+
+    def record(self, attempts: int, elapsed: float):
+        """Catat hasil mining satu blok untuk estimasi hash rate"""
+        if attempts > 0 and elapsed > 0:
+            self.samples.append((attempts, elapsed))
+            self.save()
+
+    def hash_rate(self) -> Optional[float]:
+        """Hash rate rata-rata (hash/detik) dari sampel terakhir"""
+        elapsed = sum(e for _, e in self.samples)
+        if not self.samples or elapsed <= 0:
+            return None
+        return sum(a for a, _ in self.samples) / elapsed
+
+    def target_difficulty(self) -> Optional[int]:
+        """Difficulty yang waktu mining rata-ratanya paling dekat ke target"""
+        rate = self.hash_rate()
+        if self.target_block_time is None or rate is None:
+            return None
+        ideal = math.log(rate * self.target_block_time, HASHES_PER_STEP)
+        return min(max(round(ideal), self.min_difficulty), self.max_difficulty)
+
+    def next_difficulty(self, chain: Sequence, fallback: int) -> int:
+        """Difficulty untuk blok berikutnya (indeks `len(chain)`)"""
+        tip = recorded_difficulty(chain, -1) if len(chain) else None
+        if tip is None:
+            return max(fallback, MIN_DIFFICULTY)
+        if len(chain) % RETARGET_INTERVAL != 0:
+            return tip
+        target = self.target_difficulty()
+        if target is None:
+            return tip
+        return min(max(target, tip - MAX_DIFFICULTY_STEP), tip + MAX_DIFFICULTY_STEP)
+
+    def expected_block_time(self, difficulty: int) -> Optional[float]:
+        rate = self.hash_rate()
+        return HASHES_PER_STEP ** difficulty / rate if rate else None
+
+    def to_dict(self) -> Dict:
+        return {
+            "target_block_time": self.target_block_time,
+            "min_difficulty": self.min_difficulty,
+            "max_difficulty": self.max_difficulty,
+            "samples": [list(sample) for sample in self.samples],
+        }
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.target_block_time = data.get("target_block_time")
+            self.min_difficulty = data.get("min_difficulty", MIN_DIFFICULTY)
+            self.max_difficulty = data.get("max_difficulty", self.max_difficulty)
+            self.samples.extend(tuple(sample) for sample in data.get("samples", []))
+        except (OSError, ValueError):
+            pass
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,84 @@
+import csv
+import json
+import os
+import time
+from typing import Dict, Optional
+
+
+EXPORT_JSONL = "jsonl"
+EXPORT_CSV = "csv"
+EXPORT_FORMATS = (EXPORT_JSONL, EXPORT_CSV)
+
+CSV_FIELDS = [
+    "block_index", "block_hash", "block_timestamp", "position",
+    "transaction_id", "transaction_type", "student_nim", "student_name", "degree",
+    "major", "gpa", "graduation_date", "document_hash", "issuer", "timestamp", "reason",
+]
+
+
+def detect_export_format(path: str) -> str:
+    """Format export dari ekstensi file (default JSON Lines)"""
+    return EXPORT_CSV if os.path.splitext(path)[1].lower() == ".csv" else EXPORT_JSONL
+
+
+def export_chain(blockchain, path: str, fmt: Optional[str] = None, start: int = 0,
+                 stop: Optional[int] = None, progress=None, **filters) -> Dict:
+    """Menulis blok dan transaksi ke JSON Lines atau CSV dalam satu pass.
+
+    JSON Lines berisi satu record `{"type": "block", ...}` per blok diikuti
+    record `{"type": "transaction", ...}` untuk setiap transaksinya. CSV
+    berisi satu baris per transaksi beserta kolom blok. Blok dibaca satu per
+    satu sehingga memori tetap konstan berapa pun panjang chain.
+    """
+    fmt = fmt or detect_export_format(path)
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Format export tidak dikenal: {fmt}")
+
+    blocks = transactions = 0
+    started = time.perf_counter()
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=CSV_FIELDS) if fmt == EXPORT_CSV else None
+        if writer:
+            writer.writeheader()
+
+        for block, txs in blockchain.iter_blocks(start, stop, **filters):
+            block_timestamp = block.timestamp.isoformat()
+            if writer is None:
+                fh.write(json.dumps({
+                    "type": "block",
+                    "index": block.index,
+                    "timestamp": block_timestamp,
+                    "previous_hash": block.previous_hash,
+                    "nonce": block.nonce,
+                    "hash": block.hash,
+                    "version": block.version,
+                    "merkle_root": block.merkle_root,
+                    "difficulty": block.difficulty,
+                    "tx_count": len(block.transactions),
+                }) + "\n")
+
+            for position, tx in txs:
+                if writer is None:
+                    fh.write(json.dumps({
+                        "type": "transaction",
+                        "block_index": block.index,
+                        "position": position,
+                        **tx.to_dict(),
+                    }) + "\n")
+                else:
+                    writer.writerow({
+                        "block_index": block.index,
+                        "block_hash": block.hash,
+                        "block_timestamp": block_timestamp,
+                        "position": position,
+                        **tx.to_dict(),
+                    })
+            blocks += 1
+            transactions += len(txs)
+            if progress:
+                progress(blocks, transactions)
+
+    elapsed = time.perf_counter() - started
+    if progress:
+        progress(blocks, transactions, final=True)
+    return {"blocks": blocks, "transactions": transactions, "format": fmt, "elapsed": elapsed}
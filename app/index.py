@@ -0,0 +1,207 @@
+import json
+import os
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.blockstore import block_hash_at
+from app.models import Block
+
+
+# (block index, posisi transaksi di dalam blok)
+Location = Tuple[int, int]
+
+
+class BlockRecordLog:
+    """Dasar state turunan yang disimpan sebagai log append-only per blok.
+
+    Setiap blok menjadi satu baris JSON `{"block", "hash", "entries"}`,
+    sehingga menambah blok hanya menulis entri blok tersebut dan file bisa
+    dicocokkan dengan chain lewat hash blok terakhirnya. Subclass menentukan
+    isi `entries` (`_entries`) dan struktur di memori (`_add_entries`).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._reset()
+
+    @property
+    def height(self) -> int:
+        """Jumlah blok yang sudah terindeks"""
+        return len(self.block_hashes)
+
+    def sync(self, chain: Sequence[Block], recovery: Optional[Callable] = None):
+        """Menyamakan index dengan chain: lanjutkan jika cocok, rebuild jika basi.
+
+        Record yang ditambahkan proses lain sejak file terakhir dibaca dimuat
+        lebih dulu, sehingga blok yang sama tidak ditulis dua kali. Jika file
+        rusak atau basi dan `recovery` mengembalikan snapshot yang cocok, index
+        dipulihkan dari record snapshot dan hanya blok setelahnya yang dibaca.
+        """
+        try:
+            self._load()
+            # Index kosong untuk chain yang berisi: file hilang atau belum dibuat
+            usable = self._matches(chain) and (self.height > 0 or not len(chain))
+        except (ValueError, KeyError):
+            usable = False
+        if not usable:
+            snapshot = recovery() if recovery else None
+            if snapshot is None or not self._restore(chain, snapshot.index_records):
+                self.rebuild(chain)
+            return
+
+        for i in range(self.height, len(chain)):
+            self.add_block(chain[i])
+
+    def add_block(self, block: Block):
+        """Menambahkan entri satu blok ke index dan ke file"""
+        if block.index != self.height:
+            raise ValueError(f"Blok #{block.index} tidak berurutan dengan index (height {self.height})")
+        line = (json.dumps(self._apply(block)) + "\n").encode("utf-8")
+        with open(self.path, "ab") as f:
+            f.write(line)
+        self._offset += len(line)
+
+    def rebuild(self, chain: Sequence[Block]):
+        """Membangun ulang index dari seluruh chain"""
+        self._reset()
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            for block in chain:
+                f.write((json.dumps(self._apply(block)) + "\n").encode("utf-8"))
+            self._offset = f.tell()
+        os.replace(tmp_path, self.path)
+
+    def records(self) -> bytes:
+        """Isi file index yang sudah dimuat (untuk snapshot)"""
+        with open(self.path, "rb") as f:
+            return f.read(self._offset)
+
+    def _restore(self, chain: Sequence[Block], records: bytes) -> bool:
+        """Tulis ulang file index dari record snapshot lalu susulkan blok setelahnya"""
+        self._reset()
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(records)
+        os.replace(tmp_path, self.path)
+        try:
+            self._load()
+        except (ValueError, KeyError):
+            return False
+        if not self._matches(chain):
+            return False
+        for i in range(self.height, len(chain)):
+            self.add_block(chain[i])
+        return True
+
+    def _apply(self, block: Block) -> Dict:
+        entries = self._entries(block)
+        self._add_entries(block.index, entries)
+        self.block_hashes.append(block.hash)
+        return {"block": block.index, "hash": block.hash, "entries": entries}
+
+    def _entries(self, block: Block) -> List[list]:
+        raise NotImplementedError
+
+    def _add_entries(self, block_index: int, entries: List[list]):
+        raise NotImplementedError
+
+    def _reset_entries(self):
+        raise NotImplementedError
+
+    def _load(self):
+        """Baca record file index setelah offset yang sudah dimuat"""
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if size < self._offset:
+            # File dibangun ulang proses lain
+            self._reset()
+        if size == self._offset:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    raise ValueError("Record index terpotong")
+                record = json.loads(line)
+                if record["block"] != self.height:
+                    raise ValueError("File index tidak berurutan")
+                self._add_entries(record["block"], record["entries"])
+                self.block_hashes.append(record["hash"])
+                self._offset += len(line)
+
+    def _matches(self, chain: Sequence[Block]) -> bool:
+        if self.height > len(chain):
+            return False
+        return self.height == 0 or block_hash_at(chain, self.height - 1) == self.block_hashes[-1]
+
+    def _reset(self):
+        self.block_hashes: List[str] = []
+        # Byte file index yang sudah dimuat ke memori
+        self._offset = 0
+        self._reset_entries()
+
+
+class ChainIndex(BlockRecordLog):
+    """Index sekunder persisten untuk transaksi ijazah.
+
+    Memetakan `student_nim` dan `document_hash` ke lokasi transaksi
+    (block index, posisi). Disimpan sebagai log append-only dengan satu baris
+    per blok, sehingga menambah blok hanya menulis entri blok tersebut.
+    """
+
+    def lookup_nim(self, student_nim: str) -> List[Location]:
+        return self.by_nim.get(student_nim, [])
+
+    def lookup_document(self, document_hash: str) -> List[Location]:
+        return self.by_document_hash.get(document_hash, [])
+
+    def _entries(self, block: Block) -> List[list]:
+        return [[tx.student_nim, tx.document_hash, position]
+                for position, tx in enumerate(block.transactions)
+                if tx.transaction_type == "degree_issuance"]
+
+    def _add_entries(self, block_index: int, entries: List[list]):
+        for nim, document_hash, position in entries:
+            location = (block_index, position)
+            self.by_nim.setdefault(nim, []).append(location)
+            self.by_document_hash.setdefault(document_hash, []).append(location)
+
+    def _reset_entries(self):
+        self.by_nim: Dict[str, List[Location]] = {}
+        self.by_document_hash: Dict[str, List[Location]] = {}
+
+
+class RevocationIndex(BlockRecordLog):
+    """Himpunan ijazah yang dicabut, dipelihara per blok seperti `ChainIndex`.
+
+    Memetakan `document_hash` ke lokasi transaksi `degree_revocation`
+    pertamanya, sehingga status pencabutan dicek dengan satu lookup dict
+    berapa pun panjang chain.
+    """
+
+    def lookup(self, document_hash: str, student_nim: str) -> Optional[Location]:
+        revocation = self.by_document_hash.get(document_hash)
+        if revocation is None or revocation[0] != student_nim:
+            return None
+        return revocation[1]
+
+    def lookup_nim(self, student_nim: str) -> List[Location]:
+        """Lokasi semua transaksi pencabutan untuk NIM tersebut"""
+        return self.by_nim.get(student_nim, [])
+
+    def __len__(self) -> int:
+        return len(self.by_document_hash)
+
+    def _entries(self, block: Block) -> List[list]:
+        return [[tx.student_nim, tx.document_hash, position]
+                for position, tx in enumerate(block.transactions)
+                if tx.transaction_type == "degree_revocation"]
+
+    def _add_entries(self, block_index: int, entries: List[list]):
+        for nim, document_hash, position in entries:
+            location = (block_index, position)
+            self.by_nim.setdefault(nim, []).append(location)
+            # Pencabutan berikutnya untuk ijazah yang sama tidak mengubah status
+            self.by_document_hash.setdefault(document_hash, (nim, location))
+
+    def _reset_entries(self):
+        self.by_nim: Dict[str, List[Location]] = {}
+        self.by_document_hash: Dict[str, Tuple[str, Location]] = {}
@@ -0,0 +1,165 @@
+import csv
+import json
+import os
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+FORMAT_JSON = "json"
+FORMAT_NDJSON = "ndjson"
+FORMAT_CSV = "csv"
+INGEST_FORMATS = (FORMAT_JSON, FORMAT_NDJSON, FORMAT_CSV)
+
+_EXTENSIONS = {
+    ".json": FORMAT_JSON,
+    ".ndjson": FORMAT_NDJSON,
+    ".jsonl": FORMAT_NDJSON,
+    ".csv": FORMAT_CSV,
+}
+
+
+class InvalidRecord(ValueError):
+    """Penanda baris input yang tidak bisa dibaca sebagai objek mahasiswa.
+
+    Iterator record meng-yield penanda ini alih-alih melempar exception,
+    sehingga baris lain tetap diproses dan baris ini masuk laporan error.
+    """
+
+
+def detect_format(path: str) -> str:
+    """Menentukan format file dari ekstensi, atau dari karakter pertamanya"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in _EXTENSIONS:
+        return _EXTENSIONS[ext]
+
+    with open(path, "r", encoding="utf-8") as fh:
+        head = fh.read(1024).lstrip()
+    if head.startswith("["):
+        return FORMAT_JSON
+    if head.startswith("{"):
+        return FORMAT_NDJSON
+    return FORMAT_CSV
+
+
+def iter_json_array(path: str, chunk_size: int = 1 << 16) -> Iterator[Dict]:
+    """Membaca array JSON secara bertahap tanpa memuat seluruh file"""
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as fh:
+        buf = fh.read(chunk_size).lstrip()
+        if not buf.startswith("["):
+            raise ValueError("File harus berisi array JSON dari objek mahasiswa")
+        buf = buf[1:]
+        eof = False
+
+        while True:
+            buf = buf.lstrip().lstrip(",").lstrip()
+            if buf.startswith("]"):
+                return
+            try:
+                obj, end = decoder.raw_decode(buf)
+            except json.JSONDecodeError as e:
+                if eof:
+                    # Array rusak tidak bisa dilanjutkan; record sebelumnya tetap diproses
+                    yield InvalidRecord(f"JSON tidak valid: {e.msg}")
+                    return
+                more = fh.read(chunk_size)
+                eof = not more
+                buf += more
+                continue
+            yield obj if isinstance(obj, dict) else InvalidRecord("Elemen array bukan objek JSON")
+            buf = buf[end:]
+            if len(buf) < chunk_size and not eof:
+                more = fh.read(chunk_size)
+                eof = not more
+                buf += more
+
+
+def iter_ndjson(path: str) -> Iterator[Dict]:
+    """Membaca file NDJSON (satu objek JSON per baris)"""
+    with open(path, "r", encoding="utf-8") as fh:
+        for line_number, line in enumerate(fh, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                obj = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield InvalidRecord(f"JSON tidak valid di baris {line_number}: {e.msg}")
+                continue
+            yield obj if isinstance(obj, dict) else InvalidRecord(f"Baris {line_number} bukan objek JSON")
+
+
+def iter_csv(path: str) -> Iterator[Dict]:
+    """Membaca file CSV dengan baris header"""
+    with open(path, "r", encoding="utf-8", newline="") as fh:
+        for row in csv.DictReader(fh):
+            yield {key.strip(): (value or "").strip() for key, value in row.items() if key}
+
+
+def iter_records(path: str, fmt: Optional[str] = None) -> Iterator[Dict]:
+    """Membaca record mahasiswa dari file JSON array, NDJSON atau CSV"""
+    fmt = fmt or detect_format(path)
+    if fmt == FORMAT_JSON:
+        return iter_json_array(path)
+    if fmt == FORMAT_NDJSON:
+        return iter_ndjson(path)
+    if fmt == FORMAT_CSV:
+        return iter_csv(path)
+    raise ValueError(f"Format tidak dikenal: {fmt}")
+
+
+def write_error_report(path: str, errors: List[Dict]):
+    """Menulis laporan baris yang gagal divalidasi ke file CSV"""
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=["row", "nim", "error"])
+        writer.writeheader()
+        writer.writerows(errors)
+
+
+class ProgressReporter:
+    """Melaporkan progres dalam rows/sec, dibatasi per interval"""
+
+    def __init__(self, interval: float = 1.0, out: Callable[[str], None] = None, label: str = "ditambahkan"):
+        self.interval = interval
+        self.out = out or (lambda line: print(line, end="", flush=True))
+        self.label = label
+        self.start = time.perf_counter()
+        self._last = self.start
+
+    def __call__(self, processed: int, added: int, final: bool = False):
+        now = time.perf_counter()
+        if not final and now - self._last < self.interval:
+            return
+        self._last = now
+        elapsed = max(now - self.start, 1e-9)
+        end = "\n" if final else ""
+        self.out(f"\r📥 {processed} baris diproses, {added} {self.label} ({processed / elapsed:,.0f} rows/sec){end}")
+
+
+def ingest_file(blockchain, path: str, fmt: Optional[str] = None, chunk_size: int = 0,
+                error_report: Optional[str] = None, progress: Optional[ProgressReporter] = None) -> Dict:
+    """Streaming ingest file mahasiswa ke pending transactions.
+
+    Records are validated as they are read and committed to storage once per
+    `chunk_size` valid records (or once for the whole file when 0).
+    """
+    errors: List[Dict] = []
+    start = time.perf_counter()
+    tx_ids = blockchain.add_bulk_transactions(
+        iter_records(path, fmt), chunk_size=chunk_size, errors=errors, on_chunk=progress
+    )
+    elapsed = time.perf_counter() - start
+
+    processed = len(tx_ids) + len(errors)
+    if progress:
+        progress(processed, len(tx_ids), final=True)
+    if error_report and errors:
+        write_error_report(error_report, errors)
+
+    return {
+        "processed": processed,
+        "added": len(tx_ids),
+        "errors": errors,
+        "elapsed": elapsed,
+        "rows_per_sec": processed / elapsed if elapsed > 0 else 0.0,
+    }
@@ -0,0 +1,67 @@
+import hashlib
+from typing import Dict, List
+
+
+EMPTY_MERKLE_ROOT = "0" * 64
+
+
+def _hash_pair(left: str, right: str) -> str:
+    return hashlib.sha256(f"{left}{right}".encode()).hexdigest()
+
+
+def _next_level(level: List[str]) -> List[str]:
+    if len(level) % 2:
+        # Jumlah node ganjil: node terakhir dipasangkan dengan dirinya sendiri
+        level = level + [level[-1]]
+    return [_hash_pair(level[i], level[i + 1]) for i in range(0, len(level), 2)]
+
+
+def merkle_root(leaves: List[str]) -> str:
+    """Menghitung Merkle root dari daftar hash transaksi (hex)"""
+    if not leaves:
+        return EMPTY_MERKLE_ROOT
+    level = list(leaves)
+    while len(level) > 1:
+        level = _next_level(level)
+    return level[0]
+
+
+def merkle_proof(leaves: List[str], position: int) -> List[Dict]:
+    """Membuat inclusion proof untuk leaf pada `position`.
+
+    Proof berisi satu sibling hash per level pohon, masing-masing dengan
+    posisinya ("left" atau "right") relatif terhadap node yang sedang dihitung.
+    """
+    if not 0 <= position < len(leaves):
+        raise IndexError("Posisi leaf di luar jangkauan")
+
+    proof = []
+    level = list(leaves)
+    while len(level) > 1:
+        if len(level) % 2:
+            level = level + [level[-1]]
+        if position % 2:
+            proof.append({"hash": level[position - 1], "position": "left"})
+        else:
+            proof.append({"hash": level[position + 1], "position": "right"})
+        level = _next_level(level)
+        position //= 2
+    return proof
+
+
+def root_from_proof(leaf: str, proof: List[Dict]) -> str:
+    """Menghitung ulang Merkle root dari leaf dan inclusion proof"""
+    node = leaf
+    for step in proof:
+        if step["position"] == "left":
+            node = _hash_pair(step["hash"], node)
+        elif step["position"] == "right":
+            node = _hash_pair(node, step["hash"])
+        else:
+            raise ValueError(f"Posisi proof tidak valid: {step['position']}")
+    return node
+
+
+def verify_merkle_proof(leaf: str, proof: List[Dict], root: str) -> bool:
+    """Memverifikasi bahwa `leaf` termasuk dalam pohon dengan `root`"""
+    return root_from_proof(leaf, proof) == root
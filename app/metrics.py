@@ -0,0 +1,238 @@
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Tuple
+
+
+METRICS_ENV = "BLOCKCERT_METRICS"
+METRICS_PREFIX = "blockcert_"
+METRICS_FILENAME = "metrics.json"
+
+# Batas atas bucket histogram latensi (detik), seperti histogram Prometheus
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0)
+
+_Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict) -> _Key:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                break
+        else:
+            i = len(LATENCY_BUCKETS)
+        self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Perkiraan kuantil: batas atas bucket yang memuatnya"""
+        target = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and count:
+                return LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else float("inf")
+        return 0.0
+
+
+class MetricsRegistry:
+    """Counter, gauge dan histogram latensi untuk instrumentasi opsional.
+
+    Nonaktif secara default; saat nonaktif setiap titik instrumentasi hanya
+    memeriksa `enabled`. Aktifkan dengan `BLOCKCERT_METRICS=1`, opsi
+    `--metrics` di CLI, atau `enable()`.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self):
+        self.counters: Dict[_Key, float] = {}
+        self.gauges: Dict[_Key, float] = {}
+        self.histograms: Dict[_Key, _Histogram] = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def inc(self, name: str, value: float = 1, **labels):
+        if self.enabled:
+            key = _key(name, labels)
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        if self.enabled:
+            self.gauges[_key(name, labels)] = value
+
+    def observe(self, name: str, seconds: float, **labels):
+        if self.enabled:
+            key = _key(name, labels)
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = _Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def _timer(self, name: str, labels: Dict):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def time(self, name: str, **labels):
+        """Context manager yang mencatat durasi blok ke histogram `name`"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return self._timer(name, labels)
+
+    # ---- Persistensi & export ----
+
+    def to_dict(self) -> Dict:
+        def encode(key: _Key) -> Dict:
+            return {"name": key[0], "labels": dict(key[1])}
+
+        return {
+            "counters": [{**encode(k), "value": v} for k, v in self.counters.items()],
+            "gauges": [{**encode(k), "value": v} for k, v in self.gauges.items()],
+            "histograms": [
+                {**encode(k), "counts": h.counts, "sum": h.sum, "count": h.count}
+                for k, h in self.histograms.items()
+            ],
+        }
+
+    def merge_dict(self, data: Dict):
+        """Menambahkan data hasil `to_dict` (mis. dari run sebelumnya)"""
+        for item in data.get("counters", []):
+            key = _key(item["name"], item["labels"])
+            self.counters[key] = self.counters.get(key, 0) + item["value"]
+        for item in data.get("gauges", []):
+            self.gauges.setdefault(_key(item["name"], item["labels"]), item["value"])
+        for item in data.get("histograms", []):
+            if len(item["counts"]) != len(LATENCY_BUCKETS) + 1:
+                continue
+            key = _key(item["name"], item["labels"])
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = _Histogram()
+            histogram.counts = [a + b for a, b in zip(histogram.counts, item["counts"])]
+            histogram.sum += item["sum"]
+            histogram.count += item["count"]
+
+    def dump(self, path: str):
+        """Gabungkan metrik run ini ke file JSON kumulatif"""
+        merged = MetricsRegistry()
+        merged.merge_dict(load_metrics_file(path))
+        merged.merge_dict(self.to_dict())
+        # Gauge run ini menggantikan nilai lama
+        merged.gauges.update(self.gauges)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(merged.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    def to_prometheus(self) -> str:
+        """Export dalam format teks Prometheus (exposition format 0.0.4)"""
+        lines = []
+
+        def labels_text(labels, extra=()):
+            items = list(labels) + list(extra)
+            if not items:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+        def group(metrics):
+            by_name: Dict[str, list] = {}
+            for key, value in sorted(metrics.items(), key=lambda item: item[0]):
+                by_name.setdefault(key[0], []).append((key[1], value))
+            return by_name.items()
+
+        for name, series in group(self.counters):
+            lines.append(f"# TYPE {METRICS_PREFIX}{name} counter")
+            lines.extend(f"{METRICS_PREFIX}{name}{labels_text(labels)} {value}" for labels, value in series)
+        for name, series in group(self.gauges):
+            lines.append(f"# TYPE {METRICS_PREFIX}{name} gauge")
+            lines.extend(f"{METRICS_PREFIX}{name}{labels_text(labels)} {value}" for labels, value in series)
+        for name, series in group(self.histograms):
+            full_name = f"{METRICS_PREFIX}{name}"
+            lines.append(f"# TYPE {full_name} histogram")
+            for labels, histogram in series:
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), histogram.counts):
+                    cumulative += count
+                    lines.append(f"{full_name}_bucket{labels_text(labels, [('le', bound)])} {cumulative}")
+                lines.append(f"{full_name}_sum{labels_text(labels)} {histogram.sum}")
+                lines.append(f"{full_name}_count{labels_text(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+class LatencyTracker:
+    """Menyimpan sampel latensi terakhir (request, waktu inklusi) untuk laporan persentil"""
+
+    def __init__(self, window: int = 100000):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def percentiles(self) -> Dict:
+        if not self.samples:
+            return {"p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+        ordered = sorted(self.samples)
+
+        def pick(q):
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+
+        return {"p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99),
+                "max_ms": round(ordered[-1] * 1000, 3)}
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+METRICS = MetricsRegistry(enabled=os.environ.get(METRICS_ENV) == "1")
+
+
+def timed(name: str, **labels):
+    """Decorator: catat durasi fungsi ke histogram `name` jika metrik aktif"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not METRICS.enabled:
+                return fn(*args, **kwargs)
+            with METRICS._timer(name, labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def load_metrics_file(path: str) -> Dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
@@ -0,0 +1,142 @@
+import hashlib
+import os
+import queue
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from app.models import Block
+
+
+@dataclass
+class MiningResult:
+    nonce: int
+    hash: str
+    attempts: int
+    elapsed: float
+
+    @property
+    def hash_rate(self) -> float:
+        """Jumlah hash per detik"""
+        return self.attempts / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def meets_difficulty(digest: bytes, difficulty: int) -> bool:
+    """Cek apakah digest biner diawali `difficulty` digit hex nol"""
+    full, half = divmod(difficulty, 2)
+    if digest[:full] != bytes(full):
+        return False
+    return not half or digest[full] < 0x10
+
+
+def _search(prefix: bytes, difficulty: int, start_nonce: int, step: int,
+            progress: Optional[Callable[[int], None]], progress_every: int,
+            should_stop: Optional[Callable[[], bool]]):
+    """Loop proof-of-work atas midstate sha256; mengembalikan (nonce, hash, attempts)"""
+    base = hashlib.sha256(prefix)
+    nonce = start_nonce
+    attempts = 0
+
+    while True:
+        h = base.copy()
+        h.update(str(nonce).encode())
+        attempts += 1
+        if meets_difficulty(h.digest(), difficulty):
+            return nonce, h.hexdigest(), attempts
+        nonce += step
+        if attempts % progress_every == 0:
+            if progress:
+                progress(attempts)
+            if should_stop and should_stop():
+                return None, None, attempts
+
+
+def mine_block(block: Block, difficulty: int, start_nonce: int = 0, step: int = 1,
+               progress: Optional[Callable[[int], None]] = None, progress_every: int = 100000,
+               should_stop: Optional[Callable[[], bool]] = None) -> Optional[MiningResult]:
+    """Mencari nonce yang memenuhi proof-of-work untuk `block`.
+
+    Hash transaksi dan prefix konstan blok hanya dihitung sekali; setiap
+    percobaan nonce cukup menyalin state sha256 yang sudah diisi prefix lalu
+    meng-hash sufiks nonce, sehingga hash rate tidak bergantung pada jumlah
+    transaksi. Hasil identik dengan `Block.calculate_hash()`.
+
+    Nonce dicoba mulai `start_nonce` dengan langkah `step`. Mengembalikan None
+    jika `should_stop()` bernilai True sebelum nonce ditemukan.
+    """
+    start_time = time.perf_counter()
+    nonce, digest, attempts = _search(
+        block.hash_prefix().encode(), difficulty, start_nonce, step, progress, progress_every, should_stop
+    )
+    if nonce is None:
+        return None
+    return MiningResult(nonce, digest, attempts, time.perf_counter() - start_time)
+
+
+def _mine_worker(prefix: bytes, difficulty: int, worker_id: int, workers: int,
+                 found, results, check_every: int):
+    """Worker proses: mencoba nonce worker_id, worker_id + workers, ..."""
+    nonce, digest, attempts = _search(
+        prefix, difficulty, worker_id, workers, None, check_every, found.is_set
+    )
+    if nonce is not None:
+        found.set()
+    results.put((nonce, digest, attempts))
+
+
+def mine_block_parallel(block: Block, difficulty: int, workers: int = 0,
+                        progress: Optional[Callable[[], None]] = None,
+                        check_every: int = 20000) -> MiningResult:
+    """Mining proof-of-work paralel di beberapa proses.
+
+    Ruang nonce dibagi rata antar worker (worker ke-i mencoba nonce
+    i, i + N, i + 2N, ...). Worker pertama yang menemukan nonce valid
+    menyalakan event bersama sehingga worker lain berhenti. `workers` 0
+    berarti jumlah CPU. `progress` dipanggil kira-kira setiap setengah detik.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return mine_block(block, difficulty, progress=progress and (lambda _: progress()))
+
+    import multiprocessing
+
+    prefix = block.hash_prefix().encode()
+    ctx = multiprocessing.get_context()
+    found = ctx.Event()
+    results = ctx.Queue()
+    start_time = time.perf_counter()
+
+    processes = [
+        ctx.Process(target=_mine_worker, args=(prefix, difficulty, i, workers, found, results, check_every),
+                    daemon=True)
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    best = None
+    total_attempts = 0
+    received = 0
+    try:
+        while received < len(processes):
+            # Dicatat sebelum menunggu: hasil worker yang sudah keluar pasti sudah ada di queue
+            exited = [process for process in processes if process.exitcode is not None]
+            try:
+                nonce, digest, attempts = results.get(timeout=0.5)
+            except queue.Empty:
+                if len(exited) > received:
+                    codes = ", ".join(str(process.exitcode) for process in exited)
+                    raise RuntimeError(f"Worker mining berhenti tanpa hasil (exit code: {codes})")
+                if progress:
+                    progress()
+                continue
+            received += 1
+            total_attempts += attempts
+            if nonce is not None and best is None:
+                best = (nonce, digest)
+    finally:
+        found.set()
+        for process in processes:
+            process.join()
+
+    return MiningResult(best[0], best[1], total_attempts, time.perf_counter() - start_time)
@@ -1,13 +1,23 @@
 from dataclasses import dataclass, asdict
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 import hashlib
 import uuid
 
+from app.merkle import merkle_root
+from app.metrics import METRICS, timed
+
+
+# Versi format blok: v1 meng-hash semua hash transaksi secara langsung,
+# v2 meng-hash Merkle root dari transaksi, v3 juga meng-hash difficulty blok.
+BLOCK_VERSION_LEGACY = 1
+BLOCK_VERSION_MERKLE = 2
+BLOCK_VERSION_DIFFICULTY = 3
+
 
 @dataclass
 class Transaction:
-    transaction_type: str  # "degree_issuance" atau "system"
+    transaction_type: str  # "degree_issuance", "degree_revocation" atau "system"
     student_nim: str
     student_name: str
     degree: str
@@ -18,6 +28,8 @@ class Transaction:
     issuer: str
     timestamp: datetime
     transaction_id: str = None
+    # Alasan pencabutan, hanya untuk degree_revocation
+    reason: str = None
     
     def __post_init__(self):
         if self.transaction_id is None:
@@ -29,13 +41,26 @@ class Transaction:
             f"{self.degree}{self.major}{self.gpa}{self.graduation_date}"
             f"{self.document_hash}{self.issuer}{self.timestamp.isoformat()}"
         )
+        if self.reason is not None:
+            # Hanya ikut di-hash jika ada, agar hash transaksi lama tidak berubah
+            transaction_string += self.reason
         return hashlib.sha256(transaction_string.encode()).hexdigest()
     
     def to_dict(self):
-        return {
+        data = {
             **asdict(self),
             "timestamp": self.timestamp.isoformat()
         }
+        if self.reason is None:
+            del data["reason"]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Transaction":
+        return cls(**{
+            **data,
+            "timestamp": datetime.fromisoformat(data["timestamp"])
+        })
 
 
 @dataclass
@@ -46,21 +71,76 @@ class Block:
     previous_hash: str
     nonce: int = 0
     hash: str = None
+    version: int = BLOCK_VERSION_DIFFICULTY
+    merkle_root: str = None
+    # Difficulty yang tercatat di blok (v3); None untuk blok lama
+    difficulty: int = None
     
     def __post_init__(self):
+        if self.merkle_root is None:
+            self.merkle_root = self.calculate_merkle_root()
         if self.hash is None:
             self.hash = self.calculate_hash()
+
+    def transaction_hashes(self) -> List[str]:
+        return [tx.calculate_hash() for tx in self.transactions]
+
+    @timed("hash_seconds", op="merkle_root")
+    def calculate_merkle_root(self, leaves: Optional[List[str]] = None) -> str:
+        """Merkle root transaksi; `leaves` boleh diisi hash transaksi yang sudah dihitung"""
+        if METRICS.enabled:
+            METRICS.inc("transactions_hashed_total", len(self.transactions))
+        return merkle_root(self.transaction_hashes() if leaves is None else leaves)
     
-    def calculate_hash(self):
-        block_string = (
+    def hash_prefix(self) -> str:
+        """Bagian konstan dari string hash blok (semua kecuali nonce)"""
+        if self.version == BLOCK_VERSION_LEGACY:
+            tx_part = ''.join(tx.calculate_hash() for tx in self.transactions)
+        else:
+            tx_part = self.merkle_root
+        prefix = (
             f"{self.index}"
-            f"{''.join(tx.calculate_hash() for tx in self.transactions)}"
+            f"{tx_part}"
             f"{self.timestamp.isoformat()}"
             f"{self.previous_hash}"
-            f"{self.nonce}"
         )
+        if self.version >= BLOCK_VERSION_DIFFICULTY:
+            # Pemisah agar difficulty dan nonce tidak ambigu
+            prefix += f"|{self.difficulty}|"
+        return prefix
+
+    def calculate_hash(self):
+        block_string = f"{self.hash_prefix()}{self.nonce}"
         return hashlib.sha256(block_string.encode()).hexdigest()
 
+    def to_dict(self):
+        return {
+            "index": self.index,
+            "transactions": [tx.to_dict() for tx in self.transactions],
+            "timestamp": self.timestamp.isoformat(),
+            "previous_hash": self.previous_hash,
+            "nonce": self.nonce,
+            "hash": self.hash,
+            "version": self.version,
+            "merkle_root": self.merkle_root,
+            "difficulty": self.difficulty
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Block":
+        return cls(
+            index=data["index"],
+            transactions=[Transaction.from_dict(tx) for tx in data["transactions"]],
+            timestamp=datetime.fromisoformat(data["timestamp"]),
+            previous_hash=data["previous_hash"],
+            nonce=data["nonce"],
+            hash=data["hash"],
+            # Record tanpa versi berasal dari chain sebelum Merkle root
+            version=data.get("version", BLOCK_VERSION_LEGACY),
+            merkle_root=data.get("merkle_root"),
+            difficulty=data.get("difficulty")
+        )
+
 
 @dataclass
 class StudentDegree:
@@ -0,0 +1,140 @@
+import io
+import json
+import os
+import tarfile
+import time
+import zipfile
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from app.utils import DEFAULT_VERIFICATION_URL, build_qr_payload, render_qr_png
+
+
+# Mask tetap untuk batch: melewati evaluasi 8 mask per gambar (~5x lebih cepat)
+BATCH_MASK_PATTERN = 0
+
+
+def select_degrees(blockchain, from_block: Optional[int] = None, to_block: Optional[int] = None,
+                   major: Optional[str] = None, nims: Optional[Iterable[str]] = None) -> List[Dict]:
+    """Pilih ijazah terbaru per NIM berdasarkan rentang blok, jurusan dan/atau daftar NIM.
+
+    Dengan daftar NIM, ijazah dicari lewat index NIM; tanpa daftar NIM, blok
+    dalam rentang dibaca satu per satu. Ijazah yang sudah dicabut dilewati.
+    """
+    chain = blockchain.chain
+    revocations = blockchain.revocations
+    start = max(from_block or 0, 0)
+    stop = min(to_block + 1 if to_block is not None else len(chain), len(chain))
+    latest: Dict[str, Dict] = {}
+
+    def consider(tx):
+        if major and tx.major != major:
+            return
+        if revocations.lookup(tx.document_hash, tx.student_nim) is not None:
+            return
+        latest[tx.student_nim] = {
+            "nim": tx.student_nim,
+            "transaction_id": tx.transaction_id,
+            "document_hash": tx.document_hash,
+        }
+
+    if nims is not None:
+        for nim in nims:
+            for block_index, position in blockchain.index.lookup_nim(nim):
+                if start <= block_index < stop:
+                    consider(chain.transaction(block_index, position))
+    else:
+        for i in range(start, stop):
+            for tx in chain[i].transactions:
+                if tx.transaction_type == "degree_issuance":
+                    consider(tx)
+
+    return list(latest.values())
+
+
+def _render(item):
+    name, data = item
+    return name, render_qr_png(data, BATCH_MASK_PATTERN)
+
+
+class _ArchiveWriter:
+    """Menulis file dari buffer memori ke arsip zip atau tar(.gz)"""
+
+    def __init__(self, path: str):
+        lower = path.lower()
+        if lower.endswith(".zip"):
+            # PNG sudah terkompresi; cukup disimpan
+            self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED)
+            self._tar = None
+        elif lower.endswith((".tar", ".tar.gz", ".tgz")):
+            mode = "w:gz" if lower.endswith((".gz", ".tgz")) else "w"
+            self._tar = tarfile.open(path, mode)
+            self._zip = None
+        else:
+            raise ValueError("Arsip harus berekstensi .zip, .tar, .tar.gz atau .tgz")
+        self._mtime = time.time()
+
+    def add(self, name: str, data: bytes):
+        if self._zip is not None:
+            self._zip.writestr(name, data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = self._mtime
+            self._tar.addfile(info, io.BytesIO(data))
+
+    def close(self):
+        (self._zip or self._tar).close()
+
+
+def _payloads(degrees: List[Dict], verification_url: str, timestamp: str) -> Iterator[tuple]:
+    # `select_degrees` mengembalikan satu ijazah per NIM dan payload memuat NIM,
+    # jadi setiap payload (dan nama file) sudah unik
+    for degree in degrees:
+        data = json.dumps(build_qr_payload(degree, verification_url, timestamp))
+        yield f"qr_verification_{degree['nim']}.png", data
+
+
+def generate_qr_archive(degrees: List[Dict], archive_path: str, workers: int = 0,
+                        verification_url: str = DEFAULT_VERIFICATION_URL, progress=None) -> Dict:
+    """Render QR untuk setiap ijazah di process pool dan tulis ke satu arsip.
+
+    Gambar dibuat di memori dan langsung ditulis ke arsip tanpa file
+    sementara. Semua QR dalam satu batch memakai timestamp yang sama.
+    """
+    timestamp = datetime.now().isoformat()
+    items = list(_payloads(degrees, verification_url, timestamp))
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+
+    archive = _ArchiveWriter(archive_path)
+    try:
+        if workers == 1 or len(items) < 2:
+            results = map(_render, items)
+            pool = None
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            pool = ProcessPoolExecutor(max_workers=workers)
+            results = pool.map(_render, items, chunksize=max(1, min(256, len(items) // (workers * 4))))
+        try:
+            count = 0
+            for count, (name, png) in enumerate(results, 1):
+                archive.add(name, png)
+                if progress:
+                    progress(count, count)
+            if progress:
+                progress(count, count, final=True)
+        finally:
+            if pool:
+                pool.shutdown()
+    finally:
+        archive.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "selected": len(degrees),
+        "generated": len(items),
+        "elapsed": elapsed,
+        "per_sec": len(items) / elapsed if elapsed > 0 else 0.0,
+    }
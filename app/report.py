@@ -0,0 +1,285 @@
+import csv
+import io
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.blockstore import block_hash_at
+from app.metrics import METRICS
+
+
+REPORT_GROUPS = ("major", "degree", "year", "issuer")
+REPORT_PERIODS = ("year", "month", "day")
+REPORT_FORMATS = ("table", "csv", "json")
+PROJECTION_FILENAME = "report_projection.npz"
+PROJECTION_FORMAT = 1
+
+# Kolom kategori disimpan sebagai kode int32 + daftar label
+CATEGORY_FIELDS = ("major", "degree", "issuer")
+PERCENTILES = (25, 50, 75, 90)
+GPA_BINS = np.linspace(0.0, 4.0, 17)
+_EPOCH = datetime(1970, 1, 1)
+_PERIOD_UNITS = {"year": "Y", "month": "M", "day": "D"}
+
+
+class CohortProjection:
+    """Proyeksi kolom (array NumPy) dari semua transaksi `degree_issuance`.
+
+    Setiap ijazah menjadi satu baris: blok, GPA (float, NaN jika tidak
+    terbaca), tahun lulus, waktu penerbitan, serta jurusan/gelar/penerbit
+    sebagai kode kategori. Proyeksi disimpan di `report_projection.npz`
+    bersama tinggi dan hash ujung chain yang dicakupnya, sehingga blok baru
+    cukup ditambahkan; jika tidak cocok dengan chain, dibangun ulang.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._reset()
+
+    def __len__(self) -> int:
+        return len(self.gpa)
+
+    def sync(self, chain: Sequence) -> int:
+        """Menyamakan proyeksi dengan chain; mengembalikan jumlah blok yang dibaca"""
+        if self.height == 0:
+            self._load()
+        if not self._matches(chain):
+            self._reset()
+        if self.height == len(chain):
+            return 0
+        start = self.height
+        self._extend(chain, start)
+        self.save()
+        return len(chain) - start
+
+    def column(self, field: str) -> np.ndarray:
+        return self.codes[field] if field in CATEGORY_FIELDS else getattr(self, field)
+
+    def label(self, field: str, code) -> str:
+        return self.labels[field][code] if field in CATEGORY_FIELDS else str(code)
+
+    def save(self):
+        meta = {"format": PROJECTION_FORMAT, "height": self.height, "tip_hash": self.tip_hash, "labels": self.labels}
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, meta=np.array(json.dumps(meta)), gpa=self.gpa, year=self.year,
+                     issued=self.issued, block=self.block,
+                     **{f"code_{field}": self.codes[field] for field in CATEGORY_FIELDS})
+        os.replace(tmp_path, self.path)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                meta = json.loads(str(data["meta"]))
+                if meta["format"] != PROJECTION_FORMAT:
+                    return
+                self.gpa, self.year = data["gpa"], data["year"]
+                self.issued, self.block = data["issued"], data["block"]
+                self.codes = {field: data[f"code_{field}"] for field in CATEGORY_FIELDS}
+            self.labels = meta["labels"]
+            self._label_codes = {field: {label: code for code, label in enumerate(labels)}
+                                 for field, labels in self.labels.items()}
+            self.height, self.tip_hash = meta["height"], meta["tip_hash"]
+        except (OSError, ValueError, KeyError):
+            # Cache rusak: dibangun ulang dari chain
+            self._reset()
+
+    def _matches(self, chain: Sequence) -> bool:
+        if self.height > len(chain):
+            return False
+        return self.height == 0 or block_hash_at(chain, self.height - 1) == self.tip_hash
+
+    def _extend(self, chain: Sequence, start: int):
+        gpa: List[float] = []
+        year: List[int] = []
+        issued: List[int] = []
+        block: List[int] = []
+        codes: Dict[str, List[int]] = {field: [] for field in CATEGORY_FIELDS}
+        for i in range(start, len(chain)):
+            for tx in chain[i].transactions:
+                if tx.transaction_type != "degree_issuance":
+                    continue
+                try:
+                    gpa.append(float(tx.gpa))
+                except ValueError:
+                    gpa.append(float("nan"))
+                year.append(int(tx.graduation_date[:4]) if tx.graduation_date[:4].isdigit() else 0)
+                issued.append(int((tx.timestamp - _EPOCH).total_seconds()))
+                block.append(i)
+                for field in CATEGORY_FIELDS:
+                    codes[field].append(self._code(field, getattr(tx, field)))
+
+        self.gpa = np.concatenate([self.gpa, np.array(gpa, dtype=np.float64)])
+        self.year = np.concatenate([self.year, np.array(year, dtype=np.int32)])
+        self.issued = np.concatenate([self.issued, np.array(issued, dtype=np.int64)])
+        self.block = np.concatenate([self.block, np.array(block, dtype=np.int32)])
+        for field in CATEGORY_FIELDS:
+            self.codes[field] = np.concatenate([self.codes[field], np.array(codes[field], dtype=np.int32)])
+        self.height = len(chain)
+        self.tip_hash = block_hash_at(chain, -1)
+
+    def _code(self, field: str, value: str) -> int:
+        codes = self._label_codes[field]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self.labels[field])
+            self.labels[field].append(value)
+        return code
+
+    def _reset(self):
+        self.height = 0
+        self.tip_hash: Optional[str] = None
+        self.gpa = np.empty(0, dtype=np.float64)
+        self.year = np.empty(0, dtype=np.int32)
+        # Waktu penerbitan (detik sejak epoch, waktu lokal seperti timestamp transaksi)
+        self.issued = np.empty(0, dtype=np.int64)
+        self.block = np.empty(0, dtype=np.int32)
+        self.codes: Dict[str, np.ndarray] = {field: np.empty(0, dtype=np.int32) for field in CATEGORY_FIELDS}
+        self.labels: Dict[str, List[str]] = {field: [] for field in CATEGORY_FIELDS}
+        self._label_codes: Dict[str, Dict[str, int]] = {field: {} for field in CATEGORY_FIELDS}
+
+
+def load_projection(blockchain) -> CohortProjection:
+    """Proyeksi kolom yang sudah disusulkan ke ujung chain"""
+    projection = CohortProjection(os.path.join(blockchain.data_dir, PROJECTION_FILENAME))
+    with blockchain.storage.lock, METRICS.time("report_projection_seconds"):
+        blockchain.refresh()
+        projection.sync(blockchain.chain)
+    return projection
+
+
+def _group_percentiles(sorted_values: np.ndarray, starts: np.ndarray, counts: np.ndarray, q: float) -> np.ndarray:
+    """Persentil (interpolasi linear) setiap grup dari nilai yang sudah terurut per grup"""
+    position = starts + (q / 100) * np.maximum(counts - 1, 0)
+    low = np.floor(position).astype(np.int64)
+    high = np.ceil(position).astype(np.int64)
+    last = max(len(sorted_values) - 1, 0)
+    low, high = np.minimum(low, last), np.minimum(high, last)
+    if not len(sorted_values):
+        return np.full(len(counts), np.nan)
+    values = sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+    return np.where(counts > 0, values, np.nan)
+
+
+def cohort_report(projection: CohortProjection, by: str = "major", period: str = "month",
+                  major: Optional[str] = None, year_from: Optional[int] = None,
+                  year_to: Optional[int] = None) -> Dict:
+    """Statistik angkatan per grup, histogram GPA dan jumlah penerbitan per periode.
+
+    Semua perhitungan berjalan pada array tanpa loop per record: jumlah dan
+    rata-rata per grup dengan `np.bincount` atas kode grup, dan persentil per
+    grup dari satu sort atas kunci gabungan (grup, GPA).
+    """
+    if by not in REPORT_GROUPS:
+        raise ValueError(f"Pengelompokan tidak dikenal: {by}")
+    if period not in REPORT_PERIODS:
+        raise ValueError(f"Periode tidak dikenal: {period}")
+
+    mask = np.ones(len(projection), dtype=bool)
+    if major is not None:
+        code = projection._label_codes["major"].get(major, -1)
+        mask &= projection.codes["major"] == code
+    if year_from is not None:
+        mask &= projection.year >= year_from
+    if year_to is not None:
+        mask &= projection.year <= year_to
+
+    # Kode kategori dan tahun sudah berupa bilangan bulat rapat: grup = nilai - minimum
+    values = projection.column(by)[mask]
+    base = int(values.min()) if len(values) else 0
+    inverse = (values - base).astype(np.int64)
+    counts = np.bincount(inverse)
+    keys = np.flatnonzero(counts)
+
+    gpa = projection.gpa[mask]
+    valid = ~np.isnan(gpa)
+    gpa, gpa_groups = gpa[valid], inverse[valid]
+    gpa_counts = np.bincount(gpa_groups, minlength=len(counts))
+    sums = np.bincount(gpa_groups, weights=gpa, minlength=len(counts))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / gpa_counts
+    # Satu sort atas kunci gabungan grup * stride + GPA (stride > rentang GPA)
+    low = float(gpa.min()) if len(gpa) else 0.0
+    stride = (float(gpa.max()) - low + 1.0) if len(gpa) else 1.0
+    offsets = np.arange(len(counts)) * stride
+    sorted_gpa = np.sort(offsets[gpa_groups] + (gpa - low)) - np.repeat(offsets, gpa_counts) + low
+    starts = np.cumsum(gpa_counts) - gpa_counts
+    stats = {"gpa_min": _group_percentiles(sorted_gpa, starts, gpa_counts, 0)}
+    for q in PERCENTILES:
+        stats[f"gpa_p{q}"] = _group_percentiles(sorted_gpa, starts, gpa_counts, q)
+    stats["gpa_max"] = _group_percentiles(sorted_gpa, starts, gpa_counts, 100)
+
+    groups = []
+    for i in keys:
+        row = {by: projection.label(by, i + base), "count": int(counts[i]), "gpa_mean": _round(means[i])}
+        row.update({name: _round(values[i]) for name, values in stats.items()})
+        groups.append(row)
+    groups.sort(key=lambda row: -row["count"])
+
+    histogram, edges = np.histogram(gpa, bins=GPA_BINS)
+    unit = _PERIOD_UNITS[period]
+    issued = projection.issued[mask].astype("datetime64[s]").astype(f"datetime64[{unit}]").astype(np.int64)
+    first = int(issued.min()) if len(issued) else 0
+    period_counts = np.bincount(issued - first)
+    periods = np.flatnonzero(period_counts)
+
+    return {
+        "records": int(mask.sum()),
+        "height": projection.height,
+        "group_by": by,
+        "groups": groups,
+        "gpa_histogram": [
+            {"from": float(edges[i]), "to": float(edges[i + 1]), "count": int(count)}
+            for i, count in enumerate(histogram)
+        ],
+        "issuance": [{"period": str(np.datetime64(int(p) + first, unit)), "count": int(period_counts[p])}
+                     for p in periods],
+    }
+
+
+def _round(value) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 3)
+
+
+def report_to_csv(report: Dict) -> str:
+    """Satu tabel CSV: baris grup, histogram GPA dan penerbitan dibedakan kolom `section`"""
+    stat_fields = ["gpa_mean", "gpa_min"] + [f"gpa_p{q}" for q in PERCENTILES] + ["gpa_max"]
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["section", "key", "count"] + stat_fields)
+    for row in report["groups"]:
+        writer.writerow([report["group_by"], row[report["group_by"]], row["count"]] +
+                        ["" if row[f] is None else row[f] for f in stat_fields])
+    for row in report["gpa_histogram"]:
+        writer.writerow(["gpa_histogram", f"{row['from']:.2f}-{row['to']:.2f}", row["count"]])
+    for row in report["issuance"]:
+        writer.writerow(["issuance", row["period"], row["count"]])
+    return out.getvalue()
+
+
+def format_report(report: Dict) -> str:
+    """Laporan dalam bentuk tabel teks"""
+    from tabulate import tabulate
+
+    by = report["group_by"]
+    headers = [by.capitalize(), "Jumlah", "Rata-rata", "Min"] + [f"P{q}" for q in PERCENTILES] + ["Max"]
+    rows = [[row[by], row["count"], row["gpa_mean"], row["gpa_min"]] +
+            [row[f"gpa_p{q}"] for q in PERCENTILES] + [row["gpa_max"]] for row in report["groups"]]
+    lines = [f"🎓 GPA per {by} ({report['records']} ijazah)", tabulate(rows, headers=headers, tablefmt="grid")]
+
+    peak = max((row["count"] for row in report["gpa_histogram"]), default=0) or 1
+    lines.append("\n📊 Distribusi GPA")
+    for row in report["gpa_histogram"]:
+        if row["count"]:
+            bar = "█" * max(1, round(40 * row["count"] / peak))
+            lines.append(f"  {row['from']:.2f}-{row['to']:.2f} | {bar} {row['count']}")
+
+    lines.append("\n📅 Penerbitan per periode")
+    lines.append(tabulate([[row["period"], row["count"]] for row in report["issuance"]],
+                          headers=["Periode", "Jumlah"], tablefmt="grid"))
+    return "\n".join(lines)
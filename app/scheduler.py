@@ -0,0 +1,118 @@
+import signal
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.blockstore import transaction_size
+from app.metrics import METRICS, LatencyTracker
+
+
+CUT_COUNT = "count"
+CUT_BYTES = "bytes"
+CUT_WAIT = "wait"
+
+
+class MiningScheduler:
+    """Daemon yang menambang pending pool secara otomatis.
+
+    Blok dipotong ketika pending pool mencapai `max_transactions` transaksi,
+    `max_bytes` byte, atau transaksi tertua sudah menunggu `max_wait` detik,
+    mana yang lebih dulu. Pool yang melebihi batas dipecah menjadi beberapa
+    blok berukuran terbatas. Transaksi yang ditambahkan proses lain (mis.
+    `add-degree`) dibaca ulang dari journal setiap `poll_interval` detik.
+    """
+
+    def __init__(self, blockchain, max_transactions: int = 1000, max_bytes: int = 1_000_000,
+                 max_wait: float = 30.0, poll_interval: float = 1.0, workers: int = 1, out=print):
+        self.blockchain = blockchain
+        self.max_transactions = max_transactions
+        self.max_bytes = max_bytes
+        self.max_wait = max_wait
+        self.poll_interval = poll_interval
+        self.workers = workers
+        self.out = out
+        self.inclusion = LatencyTracker()
+        self.blocks_mined = 0
+        self._sizes: Dict[str, int] = {}
+
+    def pool_stats(self):
+        """(jumlah transaksi, total byte, umur transaksi tertua dalam detik)"""
+        pending = self.blockchain.pending_transactions
+        sizes = {}
+        for tx in pending:
+            size = self._sizes.get(tx.transaction_id)
+            sizes[tx.transaction_id] = size if size is not None else transaction_size(tx)
+        self._sizes = sizes
+        oldest = min((tx.timestamp for tx in pending), default=None)
+        age = (datetime.now() - oldest).total_seconds() if oldest else 0.0
+        return len(pending), sum(sizes.values()), age
+
+    def cut_reason(self) -> Optional[str]:
+        """Alasan memotong blok sekarang, atau None jika belum perlu"""
+        count, size, age = self.pool_stats()
+        METRICS.set_gauge("pending_queue_depth", count)
+        METRICS.set_gauge("pending_queue_bytes", size)
+        if count == 0:
+            return None
+        if count >= self.max_transactions:
+            return CUT_COUNT
+        if size >= self.max_bytes:
+            return CUT_BYTES
+        if age >= self.max_wait:
+            return CUT_WAIT
+        return None
+
+    def poll(self) -> int:
+        """Satu putaran: muat ulang pending pool dan tambang selama batas tercapai"""
+        self.blockchain.refresh()
+        self.blockchain.reload_pending()
+
+        mined = 0
+        reason = self.cut_reason()
+        while reason:
+            if not self._mine_one(reason):
+                # Proses lain menyimpan blok lebih dulu: baca ulang di putaran berikutnya
+                break
+            mined += 1
+            reason = self.cut_reason()
+        return mined
+
+    def _mine_one(self, reason: str) -> bool:
+        blockchain = self.blockchain
+        before = len(blockchain.pending_transactions)
+        mined = blockchain.mine_pending_transactions(self.workers, max_transactions=self.max_transactions,
+                                                     max_bytes=self.max_bytes, quiet=True)
+        if not mined:
+            self.out("⚠️  Chain berubah selama mining, blok dibuang dan pool dibaca ulang")
+            return False
+        block = blockchain.get_latest_block()
+
+        for tx in block.transactions:
+            waited = max((block.timestamp - tx.timestamp).total_seconds(), 0.0)
+            self.inclusion.record(waited)
+            METRICS.observe("time_to_inclusion_seconds", waited)
+        METRICS.inc("scheduler_blocks_total", reason=reason)
+        self.blocks_mined += 1
+
+        size = sum(self._sizes.get(tx.transaction_id) or transaction_size(tx) for tx in block.transactions)
+        latency = self.inclusion.percentiles()
+        self.out(f"📦 Blok #{block.index}: {len(block.transactions)} tx, {size / 1024:,.1f} KB "
+                 f"(alasan: {reason}) | antrian {before - len(block.transactions)} | "
+                 f"inklusi p50 {latency['p50_ms'] / 1000:.2f}s p95 {latency['p95_ms'] / 1000:.2f}s")
+        return True
+
+    def run(self, max_blocks: Optional[int] = None):
+        """Jalankan sampai dihentikan (Ctrl+C/SIGTERM) atau `max_blocks` blok ditambang"""
+        def stop(signum, frame):
+            raise KeyboardInterrupt
+
+        signal.signal(signal.SIGTERM, stop)
+        self.out(f"🤖 Scheduler mining aktif: maks {self.max_transactions} tx / "
+                 f"{self.max_bytes:,} byte / {self.max_wait:g} detik per blok")
+        try:
+            while max_blocks is None or self.blocks_mined < max_blocks:
+                self.poll()
+                time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            self.out("\n👋 Scheduler dihentikan")
+        return self.blocks_mined
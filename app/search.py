@@ -0,0 +1,152 @@
+import bisect
+import heapq
+import re
+from itertools import chain as chain_lists
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.index import BlockRecordLog, Location
+from app.models import Block
+
+
+SEARCH_FIELDS = ("name", "major", "degree")
+DATE_PATTERN = re.compile(r"\d{4}(-\d{2}(-\d{2})?)?")
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Pecah teks menjadi token huruf kecil (mis. "Teknik Informatika" -> teknik, informatika)"""
+    return _TOKEN.findall(text.lower())
+
+
+def _contains(postings: List[int], doc: int) -> bool:
+    i = bisect.bisect_left(postings, doc)
+    return i < len(postings) and postings[i] == doc
+
+
+class SearchIndex(BlockRecordLog):
+    """Inverted index persisten untuk pencarian ijazah.
+
+    Nama, jurusan dan gelar dipecah menjadi token; setiap token memetakan ke
+    daftar nomor dokumen (urutan transaksi ijazah di chain), sehingga daftar
+    selalu terurut dan bisa diiris dengan bisect. Tanggal lulus disimpan per
+    dokumen untuk filter rentang. File-nya log append-only per blok seperti
+    `ChainIndex`, jadi blok baru cukup menambah entrinya.
+    """
+
+    def search(self, name: Optional[str] = None, major: Optional[str] = None, degree: Optional[str] = None,
+               date_from: Optional[str] = None, date_to: Optional[str] = None,
+               offset: int = 0, limit: int = 20) -> Tuple[int, List[Location]]:
+        """Cari ijazah; setiap token query harus menjadi awalan salah satu kata field-nya.
+
+        Mengembalikan jumlah total hasil dan lokasi transaksi untuk halaman
+        `offset`..`offset + limit`, urut sesuai chain. Tanggal boleh berupa
+        YYYY, YYYY-MM atau YYYY-MM-DD; batas atas mencakup seluruh periodenya.
+        """
+        for value in (date_from, date_to):
+            if value and not DATE_PATTERN.fullmatch(value):
+                raise ValueError(f"Tanggal '{value}' tidak valid; gunakan YYYY, YYYY-MM atau YYYY-MM-DD")
+
+        terms: List[List[List[int]]] = []
+        for field, text in zip(SEARCH_FIELDS, (name, major, degree)):
+            for token in tokenize(text or ""):
+                postings = self._expand(field, token)
+                if not postings:
+                    return 0, []
+                terms.append(postings)
+
+        if len(terms) == 1 and len(terms[0]) == 1 and not (date_from or date_to):
+            # Satu token tanpa filter lain: daftar dokumennya sudah terurut
+            docs = terms[0][0]
+            return len(docs), [self.locations[doc] for doc in docs[offset:offset + limit]]
+
+        candidates: Optional[Set[int]] = None
+        # Mulai dari term paling jarang agar kandidat sekecil mungkin
+        for postings in sorted(terms, key=lambda lists: sum(map(len, lists))):
+            if candidates is None:
+                candidates = set(chain_lists(*postings))
+            # Term kecil atau awalan dengan banyak kata: iris lewat set;
+            # term besar: cek setiap kandidat dengan bisect
+            elif len(postings) > 8 or sum(map(len, postings)) <= 4 * len(candidates):
+                candidates &= set(chain_lists(*postings))
+            else:
+                candidates = {doc for doc in candidates if any(_contains(p, doc) for p in postings)}
+
+        if date_from or date_to:
+            low = date_from or ""
+            # "2024" sebagai batas atas mencakup "2024-12-31"
+            high = (date_to or "9999") + "\uffff"
+            if candidates is None:
+                by_date = self._sorted_dates()
+                start = bisect.bisect_left(by_date, (low, -1))
+                stop = bisect.bisect_left(by_date, (high, -1))
+                candidates = {doc for _, doc in by_date[start:stop]}
+            else:
+                candidates = {doc for doc in candidates if low <= self.dates[doc] < high}
+
+        if candidates is None:
+            total = len(self.locations)
+            page = range(offset, min(offset + limit, total))
+        else:
+            total = len(candidates)
+            page = heapq.nsmallest(offset + limit, candidates)[offset:]
+        return total, [self.locations[doc] for doc in page]
+
+    def _expand(self, field: str, token: str) -> List[List[int]]:
+        """Daftar dokumen untuk semua token field yang diawali `token`"""
+        vocabulary = self._vocabulary[field]
+        if not self._vocabulary_sorted[field]:
+            vocabulary.sort()
+            self._vocabulary_sorted[field] = True
+        postings = self.postings[field]
+        matches = []
+        for i in range(bisect.bisect_left(vocabulary, token), len(vocabulary)):
+            if not vocabulary[i].startswith(token):
+                break
+            matches.append(postings[vocabulary[i]])
+        return matches
+
+    def _sorted_dates(self) -> List[Tuple[str, int]]:
+        if not self._by_date_sorted:
+            # Sebagian besar sudah terurut; timsort cukup menggabungkan run baru
+            self._by_date.sort()
+            self._by_date_sorted = True
+        return self._by_date
+
+    def _entries(self, block: Block) -> List[list]:
+        return [[position, tx.student_name, tx.major, tx.degree, tx.graduation_date]
+                for position, tx in enumerate(block.transactions)
+                if tx.transaction_type == "degree_issuance"]
+
+    def _add_entries(self, block_index: int, entries: List[list]):
+        locations = self.locations
+        # Nama, jurusan dan gelar banyak yang berulang: token setiap teks cukup dihitung sekali
+        tokens_of: Dict[str, Tuple[str, ...]] = {}
+        for position, *texts, graduation_date in entries:
+            doc = len(locations)
+            locations.append((block_index, position))
+            self.dates.append(graduation_date)
+            self._by_date.append((graduation_date, doc))
+            for field, text in zip(SEARCH_FIELDS, texts):
+                tokens = tokens_of.get(text)
+                if tokens is None:
+                    tokens = tokens_of[text] = tuple(set(tokenize(text)))
+                postings = self.postings[field]
+                for token in tokens:
+                    docs = postings.get(token)
+                    if docs is None:
+                        docs = postings[token] = []
+                        self._vocabulary[field].append(token)
+                        self._vocabulary_sorted[field] = False
+                    docs.append(doc)
+        if entries:
+            self._by_date_sorted = False
+
+    def _reset_entries(self):
+        # Nomor dokumen -> lokasi transaksi dan tanggal lulusnya
+        self.locations: List[Location] = []
+        self.dates: List[str] = []
+        self.postings: Dict[str, Dict[str, List[int]]] = {field: {} for field in SEARCH_FIELDS}
+        self._vocabulary: Dict[str, List[str]] = {field: [] for field in SEARCH_FIELDS}
+        self._vocabulary_sorted: Dict[str, bool] = {field: True for field in SEARCH_FIELDS}
+        self._by_date: List[Tuple[str, int]] = []
+        self._by_date_sorted = True
@@ -0,0 +1,382 @@
+import asyncio
+import gzip
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from app.blockstore import block_hash_at
+from app.metrics import METRICS, LatencyTracker
+
+
+MAX_BATCH_SIZE = 10000
+MAX_BODY_SIZE = 16 * 1024 * 1024
+MAX_SEARCH_LIMIT = 1000
+# Batas satu request sinkronisasi peer
+MAX_SYNC_HEADERS = 10000
+MAX_SYNC_BLOCKS = 1000
+MAX_SYNC_BYTES = 64 * 1024 * 1024
+
+_STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class VerificationCache:
+    """Cache LRU untuk hasil verifikasi, dikosongkan saat ada blok baru"""
+
+    def __init__(self, max_size: int = 100000):
+        self.max_size = max_size
+        self._items: "OrderedDict[Tuple[str, str], Dict]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str]) -> Optional[Dict]:
+        result = self._items.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._items.move_to_end(key)
+        return result
+
+    def put(self, key: Tuple[str, str], result: Dict):
+        self._items[key] = result
+        self._items.move_to_end(key)
+        if len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class VerificationServer:
+    """Server HTTP asyncio untuk verifikasi ijazah.
+
+    Chain tetap dimuat di memori selama server berjalan. Blok yang ditambang
+    proses lain dimuat secara berkala, dan cache hasil verifikasi dikosongkan
+    setiap kali ada blok baru.
+
+    Endpoint:
+      GET  /health
+      GET  /verify?nim=<NIM>&hash=<DOCUMENT_HASH>
+      POST /verify/batch   body: [{"nim": ..., "hash": ...}, ...]
+      POST /verify/qr      body: payload JSON dari QR verifikasi
+      GET  /search?name=&major=&degree=&from=&to=&offset=&limit=
+      GET  /stats
+      GET  /metrics        metrik dalam format teks Prometheus
+
+    Sinkronisasi peer (respons biner, dikompres gzip jika diminta):
+      GET  /sync/tip                        tinggi dan hash ujung chain (JSON)
+      GET  /sync/headers?from=<N>&count=<M> header blok N..N+M-1
+      GET  /sync/blocks?from=<N>&to=<M>     record blok N..M-1
+    """
+
+    def __init__(self, blockchain, host: str = "127.0.0.1", port: int = 8080,
+                 cache_size: int = 100000, refresh_interval: float = 1.0):
+        self.blockchain = blockchain
+        self.host = host
+        self.port = port
+        self.refresh_interval = refresh_interval
+        self.cache = VerificationCache(cache_size)
+        self.latency = LatencyTracker()
+        self.started_at = time.time()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.routes = {
+            ("GET", "/health"): self._health,
+            ("GET", "/verify"): self._verify,
+            ("POST", "/verify/batch"): self._verify_batch,
+            ("POST", "/verify/qr"): self._verify_qr,
+            ("GET", "/search"): self._search,
+            ("GET", "/stats"): self._stats,
+            ("GET", "/metrics"): self._metrics,
+            ("GET", "/sync/tip"): self._sync_tip,
+            ("GET", "/sync/headers"): self._sync_headers,
+            ("GET", "/sync/blocks"): self._sync_blocks,
+        }
+
+    async def start(self):
+        # Pastikan index sudah dimuat sebelum request pertama
+        self.blockchain.index
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._refresh_task:
+            self._refresh_task.cancel()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            self.refresh()
+
+    def refresh(self) -> int:
+        """Muat blok baru dari storage dan kosongkan cache jika ada"""
+        added = self.blockchain.refresh()
+        if added:
+            self.cache.clear()
+        return added
+
+    # ---- Verifikasi ----
+
+    def verify(self, nim: str, document_hash: str) -> Dict:
+        key = (nim, document_hash)
+        result = self.cache.get(key)
+        if result is None:
+            result = self.blockchain.verify_degree(document_hash, nim)
+            self.cache.put(key, result)
+        return result
+
+    def _health(self, query, body) -> Dict:
+        return {"status": "ok", "blocks": len(self.blockchain.chain)}
+
+    def _verify(self, query, body) -> Dict:
+        nim = query.get("nim", [None])[0]
+        document_hash = query.get("hash", [None])[0]
+        if not nim or not document_hash:
+            raise HTTPError(400, "Parameter 'nim' dan 'hash' wajib diisi")
+        return self.verify(nim, document_hash)
+
+    def _verify_batch(self, query, body) -> Dict:
+        items = body.get("items") if isinstance(body, dict) else body
+        if not isinstance(items, list):
+            raise HTTPError(400, "Body harus berupa array atau {\"items\": [...]}")
+        if len(items) > MAX_BATCH_SIZE:
+            raise HTTPError(413, f"Maksimal {MAX_BATCH_SIZE} item per batch")
+
+        results: List[Dict] = []
+        for item in items:
+            nim = item.get("nim") if isinstance(item, dict) else None
+            document_hash = item.get("hash") if isinstance(item, dict) else None
+            if not nim or not document_hash:
+                results.append({"nim": nim, "hash": document_hash, "verified": False,
+                                "message": "Item harus berisi 'nim' dan 'hash'"})
+                continue
+            results.append({"nim": nim, "hash": document_hash, **self.verify(nim, document_hash)})
+        return {"count": len(results), "results": results}
+
+    def _verify_qr(self, query, body) -> Dict:
+        if not isinstance(body, dict):
+            raise HTTPError(400, "Body harus berupa payload JSON dari QR")
+        nim = body.get("student_nim")
+        document_hash = body.get("document_hash")
+        if not nim or not document_hash:
+            raise HTTPError(400, "Payload QR harus berisi 'student_nim' dan 'document_hash'")
+
+        result = self.verify(nim, document_hash)
+        transaction_id = body.get("transaction_id")
+        if (result["verified"] and transaction_id and
+                result["transaction_data"]["transaction_id"] != transaction_id):
+            return {"verified": False, "message": "Transaction ID pada QR tidak cocok dengan blockchain"}
+        return result
+
+    def _search(self, query, body) -> Dict:
+        params = {name: query.get(name, [None])[0] for name in ("name", "major", "degree", "from", "to")}
+        return self.blockchain.search_degrees(
+            name=params["name"], major=params["major"], degree=params["degree"],
+            graduated_from=params["from"], graduated_to=params["to"],
+            offset=max(self._int_param(query, "offset", 0), 0),
+            limit=min(max(self._int_param(query, "limit", 20), 1), MAX_SEARCH_LIMIT)
+        )
+
+    def _stats(self, query, body) -> Dict:
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 3),
+            "blocks": len(self.blockchain.chain),
+            "requests": self.latency.count,
+            "latency": self.latency.percentiles(),
+            "cache": {"size": len(self.cache), "hits": self.cache.hits, "misses": self.cache.misses},
+        }
+
+    def _metrics(self, query, body) -> str:
+        if not METRICS.enabled:
+            return "# metrik nonaktif; jalankan server dengan --metrics atau BLOCKCERT_METRICS=1\n"
+        METRICS.set_gauge("chain_height", len(self.blockchain.chain))
+        METRICS.set_gauge("verification_cache_entries", len(self.cache))
+        METRICS.set_gauge("verification_cache_hits", self.cache.hits)
+        METRICS.set_gauge("verification_cache_misses", self.cache.misses)
+        quantiles = {"p50_ms": "0.5", "p95_ms": "0.95", "p99_ms": "0.99", "max_ms": "1"}
+        for name, value in self.latency.percentiles().items():
+            if value is not None:
+                METRICS.set_gauge("http_request_latency_ms", value, quantile=quantiles[name])
+        return METRICS.to_prometheus()
+
+    # ---- Sinkronisasi peer ----
+
+    def _store(self):
+        self.refresh()
+        return self.blockchain.storage.blocks
+
+    @staticmethod
+    def _int_param(query, name: str, default: Optional[int] = None) -> int:
+        value = query.get(name, [None])[0]
+        if value is None:
+            if default is None:
+                raise HTTPError(400, f"Parameter '{name}' wajib diisi")
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            raise HTTPError(400, f"Parameter '{name}' harus berupa angka")
+
+    def _sync_tip(self, query, body) -> Dict:
+        store = self._store()
+        return {"height": len(store), "tip_hash": block_hash_at(self.blockchain.chain, -1)}
+
+    def _sync_headers(self, query, body) -> bytes:
+        store = self._store()
+        start = self._int_param(query, "from")
+        count = min(self._int_param(query, "count", MAX_SYNC_HEADERS), MAX_SYNC_HEADERS)
+        if not 0 <= start <= len(store):
+            raise HTTPError(400, f"Blok #{start} di luar jangkauan (height {len(store)})")
+        return b"".join(store.read_record(i, header_only=True)
+                        for i in range(start, min(start + count, len(store))))
+
+    def _sync_blocks(self, query, body) -> bytes:
+        store = self._store()
+        start = self._int_param(query, "from")
+        stop = min(self._int_param(query, "to"), len(store), start + MAX_SYNC_BLOCKS)
+        if not 0 <= start <= stop:
+            raise HTTPError(400, f"Rentang blok tidak valid (height {len(store)})")
+        records = []
+        size = 0
+        for i in range(start, stop):
+            record = store.read_record(i)
+            # Selalu kirim minimal satu blok walaupun melebihi batas ukuran
+            if records and size + len(record) > MAX_SYNC_BYTES:
+                break
+            records.append(record)
+            size += len(record)
+        return b"".join(records)
+
+    # ---- HTTP ----
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                start = time.perf_counter()
+                keep_alive = await self._handle_request(request_line, reader, writer)
+                await writer.drain()
+                elapsed = time.perf_counter() - start
+                self.latency.record(elapsed)
+                METRICS.observe("http_request_seconds", elapsed)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, request_line: bytes, reader, writer) -> bool:
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            self._write(writer, 400, {"error": "Request line tidak valid"}, keep_alive=False)
+            return False
+
+        keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+        try:
+            length = int(headers.get("content-length", 0))
+            if length > MAX_BODY_SIZE:
+                raise HTTPError(413, "Body terlalu besar")
+            raw_body = await reader.readexactly(length) if length else b""
+
+            url = urlsplit(target)
+            handler = self.routes.get((method, url.path))
+            if handler is None:
+                if any(path == url.path for _, path in self.routes):
+                    raise HTTPError(405, "Method tidak diizinkan")
+                raise HTTPError(404, "Endpoint tidak ditemukan")
+
+            try:
+                body = json.loads(raw_body) if raw_body else None
+            except ValueError:
+                raise HTTPError(400, "Body bukan JSON yang valid")
+            payload = handler(parse_qs(url.query), body)
+            encoding = None
+            if isinstance(payload, bytes) and "gzip" in headers.get("accept-encoding", ""):
+                # Kompresi di thread pool (zlib melepas GIL) agar request lain tetap dilayani
+                loop = asyncio.get_running_loop()
+                payload = await loop.run_in_executor(None, gzip.compress, payload, 1)
+                encoding = "gzip"
+            self._write(writer, 200, payload, keep_alive, encoding)
+        except HTTPError as e:
+            self._write(writer, e.status, {"error": e.message}, keep_alive)
+        except ValueError as e:
+            self._write(writer, 400, {"error": str(e)}, keep_alive)
+        except Exception as e:
+            self._write(writer, 500, {"error": str(e)}, keep_alive)
+        return keep_alive
+
+    def _write(self, writer, status: int, payload, keep_alive: bool, encoding: Optional[str] = None):
+        METRICS.inc("http_responses_total", status=status)
+        if isinstance(payload, bytes):
+            body = payload
+            content_type = "application/octet-stream"
+        elif isinstance(payload, str):
+            body = payload.encode()
+            content_type = "text/plain; version=0.0.4"
+        else:
+            body = json.dumps(payload).encode()
+            content_type = "application/json"
+        head = (
+            f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            + (f"Content-Encoding: {encoding}\r\n" if encoding else "") +
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode()
+        writer.write(head + body)
+
+
+def run_server(blockchain, host: str = "127.0.0.1", port: int = 8080, **kwargs):
+    """Menjalankan server verifikasi sampai dihentikan (Ctrl+C)"""
+    server = VerificationServer(blockchain, host, port, **kwargs)
+
+    async def main():
+        await server.start()
+        print(f"🌐 Server verifikasi berjalan di http://{server.host}:{server.port}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n👋 Server dihentikan")
@@ -0,0 +1,184 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from app.blockstore import block_hash_at
+from app.storage import CorruptStateError, JournalStorage
+
+
+SNAPSHOT_FORMAT = 1
+DEFAULT_SNAPSHOT_INTERVAL = 100
+DEFAULT_SNAPSHOT_KEEP = 2
+
+
+class Snapshot:
+    """Satu file snapshot: header JSON satu baris lalu payload.
+
+    Payload terdiri dari state JSON (statistik dan pending pool) diikuti salinan
+    record file index sampai tinggi snapshot. Header mencatat tinggi, hash
+    ujung chain, panjang setiap bagian dan SHA-256 seluruh payload.
+    """
+
+    def __init__(self, path: str, header: Dict):
+        self.path = path
+        self.header = header
+        self.height: int = header["height"]
+        self.tip_hash: str = header["tip_hash"]
+        self._state: Optional[Dict] = None
+        self._index: Optional[bytes] = None
+
+    @classmethod
+    def open(cls, path: str) -> "Snapshot":
+        with open(path, "rb") as f:
+            line = f.readline()
+        try:
+            header = json.loads(line)
+            if header.get("format") != SNAPSHOT_FORMAT:
+                raise ValueError(f"format {header.get('format')}")
+            return cls(path, header)
+        except (ValueError, KeyError) as e:
+            raise CorruptStateError(f"Header snapshot {path} rusak: {e}") from e
+
+    def _load(self):
+        if self._state is not None:
+            return
+        with open(self.path, "rb") as f:
+            f.readline()
+            payload = f.read()
+        state_length = self.header["state_length"]
+        if (len(payload) != state_length + self.header["index_length"] or
+                hashlib.sha256(payload).hexdigest() != self.header["sha256"]):
+            raise CorruptStateError(f"Checksum snapshot {self.path} tidak cocok")
+        self._state = json.loads(payload[:state_length])
+        self._index = payload[state_length:]
+
+    @property
+    def aggregates(self) -> Dict:
+        self._load()
+        return self._state["aggregates"]
+
+    @property
+    def pending(self) -> List[Dict]:
+        self._load()
+        return self._state["pending"]
+
+    @property
+    def index_records(self) -> bytes:
+        """Isi file index (JSON Lines) untuk blok 0..height-1"""
+        self._load()
+        return self._index
+
+    def verify(self):
+        """Baca seluruh payload dan periksa checksum-nya"""
+        self._load()
+
+    def matches(self, chain: Sequence) -> bool:
+        """Snapshot mencakup prefix dari chain ini"""
+        return 0 < self.height <= len(chain) and block_hash_at(chain, self.height - 1) == self.tip_hash
+
+
+class SnapshotManager:
+    """Snapshot berkala state turunan untuk pemulihan cepat.
+
+    Setiap `interval` blok sejak snapshot terakhir, statistik chain, record index dan pending pool
+    disimpan bersama tinggi dan hash ujung chain yang dicakupnya. Jika file
+    turunan hilang atau rusak, state dipulihkan dari snapshot terbaru yang
+    valid dan hanya blok setelahnya yang diproses ulang. Hanya `keep`
+    snapshot terbaru yang disimpan.
+    """
+
+    def __init__(self, directory: str, interval: int = DEFAULT_SNAPSHOT_INTERVAL,
+                 keep: int = DEFAULT_SNAPSHOT_KEEP):
+        self.directory = directory
+        self.interval = interval
+        self.keep = keep
+
+    def _path(self, height: int) -> str:
+        return os.path.join(self.directory, f"snapshot-{height:010d}.snap")
+
+    def list(self) -> List[Snapshot]:
+        """Snapshot yang header-nya terbaca, terbaru lebih dulu"""
+        snapshots = []
+        for name in self._names():
+            try:
+                snapshots.append(Snapshot.open(os.path.join(self.directory, name)))
+            except (OSError, CorruptStateError):
+                continue
+        return snapshots
+
+    def latest(self, chain: Sequence) -> Optional[Snapshot]:
+        """Snapshot terbaru yang checksum-nya valid dan cocok dengan chain"""
+        for snapshot in self.list():
+            if not snapshot.matches(chain):
+                continue
+            try:
+                snapshot.verify()
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️  {e}; snapshot diabaikan")
+                continue
+            return snapshot
+        return None
+
+    def due(self, height: int) -> bool:
+        """Apakah sudah `interval` blok sejak snapshot terakhir"""
+        if not self.interval:
+            return False
+        heights = [int(name[9:19]) for name in self._names()]
+        return height - max(heights, default=0) >= self.interval
+
+    def _names(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted((name for name in os.listdir(self.directory)
+                       if name.startswith("snapshot-") and name.endswith(".snap")), reverse=True)
+
+    def write(self, chain: Sequence, aggregates: Dict, index_records: bytes, pending: List[Dict]) -> Snapshot:
+        """Tulis snapshot untuk seluruh `chain` secara atomik lalu hapus snapshot lama"""
+        height = len(chain)
+        state = json.dumps({"aggregates": aggregates, "pending": pending}).encode("utf-8")
+        header = {
+            "format": SNAPSHOT_FORMAT,
+            "height": height,
+            "tip_hash": block_hash_at(chain, -1),
+            "created": datetime.now().isoformat(),
+            "state_length": len(state),
+            "index_length": len(index_records),
+            "sha256": hashlib.sha256(state + index_records).hexdigest(),
+        }
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(height)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            f.write(state)
+            f.write(index_records)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        self.prune()
+        return Snapshot(path, header)
+
+    def prune(self):
+        for snapshot in self.list()[self.keep:]:
+            os.remove(snapshot.path)
+
+
+def recover_journal(storage: JournalStorage, snapshots: SnapshotManager) -> Dict:
+    """Bangun ulang journal yang rusak dari record yang masih terbaca dan snapshot.
+
+    Pending pool snapshot terbaru yang cocok dengan block store digabung dengan
+    record journal yang masih valid; transaksi yang sudah masuk blok dibuang.
+    """
+    with storage.lock:
+        chain = storage.open_chain()
+        snapshot = snapshots.latest(chain)
+        pending, skipped = (storage.recover_pending(snapshot.pending, snapshot.height)
+                            if snapshot else storage.recover_pending())
+    return {
+        "snapshot_height": snapshot.height if snapshot else None,
+        "skipped_records": skipped,
+        "pending": len(pending),
+    }
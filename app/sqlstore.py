@@ -0,0 +1,190 @@
+import os
+import sqlite3
+import time
+from contextlib import closing
+from datetime import datetime
+from typing import Dict, Sequence
+
+from app.blockstore import block_hash_at
+from app.metrics import METRICS
+
+
+SQL_FILENAME = "blockchain.sqlite"
+SQL_SCHEMA_VERSION = 2
+# Jumlah transaksi per transaksi SQLite saat sinkronisasi
+SQL_BATCH_TRANSACTIONS = 50000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    block_index INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL UNIQUE,
+    previous_hash TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    nonce INTEGER NOT NULL,
+    version INTEGER NOT NULL,
+    merkle_root TEXT,
+    difficulty INTEGER,
+    tx_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    block_index INTEGER NOT NULL REFERENCES blocks(block_index),
+    position INTEGER NOT NULL,
+    transaction_id TEXT NOT NULL,
+    transaction_type TEXT NOT NULL,
+    student_nim TEXT NOT NULL,
+    student_name TEXT NOT NULL,
+    degree TEXT NOT NULL,
+    major TEXT NOT NULL,
+    gpa TEXT NOT NULL,
+    graduation_date TEXT NOT NULL,
+    document_hash TEXT NOT NULL,
+    issuer TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    reason TEXT,
+    PRIMARY KEY (block_index, position)
+) WITHOUT ROWID;
+"""
+
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_transactions_nim ON transactions(student_nim);
+CREATE INDEX IF NOT EXISTS idx_transactions_document_hash ON transactions(document_hash);
+CREATE INDEX IF NOT EXISTS idx_transactions_id ON transactions(transaction_id);
+CREATE INDEX IF NOT EXISTS idx_transactions_major_date ON transactions(major, graduation_date);
+CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(graduation_date);
+CREATE INDEX IF NOT EXISTS idx_transactions_type ON transactions(transaction_type);
+"""
+
+
+class SQLReadModel:
+    """Read model SQLite untuk query ad-hoc atas blok dan transaksi.
+
+    Tabel `blocks` dan `transactions` diisi dari chain secara bertahap mulai
+    dari tinggi terakhir yang tersinkron, dalam transaksi SQLite berukuran
+    `SQL_BATCH_TRANSACTIONS`. Jika ujung database tidak cocok lagi dengan
+    chain (mis. setelah migrasi), baris setelah blok terakhir yang sama
+    dihapus lalu disinkronkan ulang. Database memakai mode WAL sehingga
+    pembaca (portal, BI) tidak terblokir saat sinkronisasi.
+
+    Opsional: hanya dipelihara setelah file-nya dibuat lewat `sync-sql`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @property
+    def enabled(self) -> bool:
+        return os.path.exists(self.path)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def sync(self, chain: Sequence, progress=None) -> Dict:
+        """Susulkan database ke ujung chain; mengembalikan ringkasan sinkronisasi"""
+        started = time.perf_counter()
+        with closing(self._connect()) as conn, METRICS.time("sql_sync_seconds"):
+            with conn:
+                conn.executescript(_SCHEMA)
+                version = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            if version is not None and int(version[0]) != SQL_SCHEMA_VERSION:
+                # Read model turunan: skema lama cukup dibangun ulang dari chain
+                self._drop(conn)
+                with conn:
+                    conn.executescript(_SCHEMA)
+            with conn:
+                self._set_meta(conn, "schema_version", SQL_SCHEMA_VERSION)
+
+            height = conn.execute("SELECT COUNT(*) FROM blocks").fetchone()[0]
+            common = self._common_height(conn, chain, height)
+            if common < height:
+                with conn:
+                    conn.execute("DELETE FROM transactions WHERE block_index >= ?", (common,))
+                    conn.execute("DELETE FROM blocks WHERE block_index >= ?", (common,))
+
+            transactions = self._append(conn, chain, common, progress)
+            # Index dibuat setelah isi awal dimuat (lebih cepat daripada diperbarui per baris);
+            # pada sinkronisasi berikutnya index sudah ada
+            conn.executescript(_INDEXES)
+        return {
+            "height": len(chain),
+            "added_blocks": len(chain) - common,
+            "removed_blocks": height - common,
+            "transactions": transactions,
+            "seconds": time.perf_counter() - started,
+        }
+
+    def rebuild(self, chain: Sequence, progress=None) -> Dict:
+        """Kosongkan database lalu isi ulang dari seluruh chain"""
+        with closing(self._connect()) as conn:
+            self._drop(conn)
+        return self.sync(chain, progress)
+
+    @staticmethod
+    def _drop(conn: sqlite3.Connection):
+        with conn:
+            conn.executescript("DROP TABLE IF EXISTS transactions; DROP TABLE IF EXISTS blocks; "
+                               "DROP TABLE IF EXISTS meta;")
+
+    @staticmethod
+    def _common_height(conn: sqlite3.Connection, chain: Sequence, height: int) -> int:
+        """Jumlah blok awal yang sama di database dan chain (binary search atas hash blok)"""
+        def same(i: int) -> bool:
+            row = conn.execute("SELECT hash FROM blocks WHERE block_index = ?", (i,)).fetchone()
+            return row is not None and row[0] == block_hash_at(chain, i)
+
+        hi = min(height, len(chain))
+        if hi == 0 or same(hi - 1):
+            return hi
+        lo = 0
+        # Invarian: `lo` blok pertama sama, blok ke-`hi - 1` berbeda
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if same(mid - 1):
+                lo = mid
+            else:
+                hi = mid
+        return lo
+
+    def _append(self, conn: sqlite3.Connection, chain: Sequence, start: int, progress=None) -> int:
+        block_rows = []
+        tx_rows = []
+        total = 0
+
+        def flush():
+            with conn:
+                conn.executemany("INSERT INTO blocks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", block_rows)
+                conn.executemany("INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", tx_rows)
+                self._set_meta(conn, "synced_at", datetime.now().isoformat())
+            block_rows.clear()
+            tx_rows.clear()
+
+        for i in range(start, len(chain)):
+            block = chain[i]
+            block_rows.append((block.index, block.hash, block.previous_hash, block.timestamp.isoformat(),
+                               block.nonce, block.version, block.merkle_root, block.difficulty,
+                               len(block.transactions)))
+            for position, tx in enumerate(block.transactions):
+                tx_rows.append((block.index, position, tx.transaction_id, tx.transaction_type, tx.student_nim,
+                                tx.student_name, tx.degree, tx.major, tx.gpa, tx.graduation_date,
+                                tx.document_hash, tx.issuer, tx.timestamp.isoformat(), tx.reason))
+            total += len(block.transactions)
+            if len(tx_rows) >= SQL_BATCH_TRANSACTIONS:
+                flush()
+                if progress:
+                    progress(total, total)
+        if block_rows:
+            flush()
+        if progress:
+            progress(total, total, final=True)
+        METRICS.inc("sql_rows_written_total", total)
+        return total
+
+    @staticmethod
+    def _set_meta(conn: sqlite3.Connection, key: str, value):
+        conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, str(value)))
@@ -0,0 +1,415 @@
+import json
+import os
+import threading
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from app.blockstore import BlockStore, LazyChain
+from app.difficulty import infer_difficulty
+from app.locking import FileLock
+from app.metrics import METRICS, timed
+from app.models import Block, Transaction, BLOCK_VERSION_LEGACY
+
+
+# Format 2 menambahkan versi blok dan Merkle root pada record blok.
+# Format 3 menyimpan blok di BlockStore; journal hanya berisi pending pool.
+JOURNAL_FORMAT_VERSION = 3
+LEGACY_JOURNAL_FORMATS = (1, 2)
+
+FSYNC_ALWAYS = "always"
+FSYNC_INTERVAL = "interval"
+FSYNC_NEVER = "never"
+FSYNC_POLICIES = (FSYNC_ALWAYS, FSYNC_INTERVAL, FSYNC_NEVER)
+
+
+class CorruptStateError(ValueError):
+    """File data rusak (bukan sekadar record terakhir yang terpotong)"""
+
+
+class StaleChainError(ValueError):
+    """Blok yang akan disimpan tidak lagi menyambung ke ujung chain"""
+
+
+class _CommitBatch:
+    """Record dari beberapa penulis yang disimpan dengan satu write dan satu fsync"""
+
+    __slots__ = ("chunks", "done", "error")
+
+    def __init__(self):
+        self.chunks: List[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+
+
+class JournalStorage:
+    """Penyimpanan blockchain: block store biner + journal append-only.
+
+    Blok yang ditambang ditambahkan ke `BlockStore` (segmen biner yang dibaca
+    lewat mmap). Setiap transaksi pending ditulis sebagai satu record JSON per
+    baris di journal, sehingga biaya menulis tidak bergantung pada panjang
+    chain. Setelah blok ditambang, journal di-compact menjadi pending pool
+    yang tersisa.
+
+    Aman dipakai beberapa proses sekaligus: setiap perubahan file dilakukan
+    di bawah file lock `<journal>.lock`, dan compaction membaca ulang journal
+    di bawah lock sehingga transaksi yang ditambahkan proses lain tidak
+    hilang. Di dalam satu proses, thread yang menambah transaksi bersamaan
+    digabung (group commit): satu thread menulis record semua thread yang
+    menunggu lalu melakukan satu fsync untuk semuanya.
+    """
+
+    def __init__(self, path: str, blocks_dir: str, fsync_policy: str = FSYNC_ALWAYS,
+                 fsync_interval: float = 1.0):
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"fsync policy tidak dikenal: {fsync_policy}")
+        self.path = path
+        self.blocks_dir = blocks_dir
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval
+        self._fh = None
+        self._last_fsync = 0.0
+        self._blocks: Optional[BlockStore] = None
+        self.lock = FileLock(path + ".lock")
+        # Group commit: batch yang sedang mengumpulkan record dan penandanya
+        # apakah ada thread yang sedang menulis batch sebelumnya
+        self._commit = threading.Condition()
+        self._open_batch: Optional[_CommitBatch] = None
+        self._writing = False
+
+    @property
+    def blocks(self) -> BlockStore:
+        if self._blocks is None:
+            self._blocks = BlockStore(self.blocks_dir, repair=False)
+        return self._blocks
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    @timed("persist_seconds", op="append_transaction")
+    def append_transaction(self, transaction: Transaction):
+        """Menulis satu transaksi pending ke journal"""
+        self._append([{"op": "tx", "tx": transaction.to_dict()}])
+
+    @timed("persist_seconds", op="append_transactions")
+    def append_transactions(self, transactions: List[Transaction]):
+        """Menulis banyak transaksi pending dengan satu write dan satu flush"""
+        if transactions:
+            self._append([{"op": "tx", "tx": tx.to_dict()} for tx in transactions])
+
+    @timed("persist_seconds", op="append_block")
+    def append_block(self, block: Block,
+                     on_commit: Optional[Callable[[], None]] = None) -> List[Transaction]:
+        """Menambahkan blok ke block store lalu compact journal ke pending yang tersisa.
+
+        Di bawah lock, blok yang ditambang proses lain dimuat lebih dulu; jika
+        `block` tidak lagi menyambung ke ujung chain, `StaleChainError`
+        dilempar dan tidak ada yang ditulis. Pending pool dibaca ulang dari
+        journal (termasuk transaksi dari proses lain) dan dikembalikan.
+        `on_commit` dipanggil sebelum lock dilepas, untuk memperbarui file
+        turunan (index, statistik).
+        """
+        return self.append_blocks([block], on_commit)
+
+    @timed("persist_seconds", op="append_blocks")
+    def append_blocks(self, blocks: List[Block],
+                      on_commit: Optional[Callable[[], None]] = None) -> List[Transaction]:
+        """Seperti `append_block` untuk rangkaian blok berurutan, dengan satu fsync
+        dan satu compaction journal untuk semuanya"""
+        with self.lock:
+            store = self.blocks
+            store.refresh()
+            tip_hash = store.read_header(len(store) - 1).hash if len(store) else None
+            first = blocks[0]
+            if first.index != len(store) or (tip_hash is not None and first.previous_hash != tip_hash):
+                raise StaleChainError(
+                    f"Chain sudah berubah (height {len(store)}): blok #{first.index} tidak disimpan"
+                )
+            start = len(store)
+            for block in blocks:
+                store.append(block, fsync=False)
+            if self.fsync_policy != FSYNC_NEVER:
+                store.fsync(start)
+
+            header, records, _ = self._read_records()
+            pending = self._pending_from(header, records, LazyChain(store))
+            self.rewrite_pending(pending)
+            if on_commit is not None:
+                on_commit()
+        return pending
+
+    def replay(self) -> Tuple[LazyChain, List[Transaction]]:
+        """Membuka chain dan membangun ulang pending transactions dari journal.
+
+        Record yang sudah tidak berlaku (transaksi yang sudah masuk blok,
+        duplikat) dibuang dari journal saat itu juga. Journal yang rusak
+        menghasilkan `CorruptStateError`; tidak ada yang ditimpa.
+        """
+        with self.lock:
+            chain = self.open_chain()
+            header, records, _ = self._read_records()
+            if header.get("format", 1) in LEGACY_JOURNAL_FORMATS:
+                chain, pending = self._migrate_legacy(records)
+                return chain, pending
+            if header.get("format") != JOURNAL_FORMAT_VERSION:
+                raise CorruptStateError(f"Format journal tidak didukung: {header.get('format')}")
+            pending = self._pending_from(header, records, chain)
+            if len(pending) != len(records) or header.get("height") != len(chain):
+                self.rewrite_pending(pending)
+            return chain, pending
+
+    def open_chain(self) -> LazyChain:
+        """Buka ulang block store; record terpotong (crash saat menulis) dibuang.
+
+        Perbaikan hanya aman di bawah lock, sehingga lock diambil di sini.
+        """
+        with self.lock:
+            if self._blocks is not None:
+                self._blocks.close()
+            self._blocks = BlockStore(self.blocks_dir)
+            return LazyChain(self._blocks)
+
+    def recover_pending(self, base_pending: Sequence[dict] = (),
+                        base_height: Optional[int] = None) -> Tuple[List[Transaction], int]:
+        """Tulis ulang journal yang rusak dari record yang masih terbaca.
+
+        `base_pending` (record transaksi, mis. dari snapshot pada tinggi
+        `base_height`) digabung lebih dulu. Mengembalikan pending pool baru dan
+        jumlah baris yang dilewati.
+        """
+        with self.lock:
+            chain = LazyChain(self.blocks)
+            header, records, skipped = self._read_records(repair=False, skip_corrupt=True)
+            height = header.get("height", len(chain))
+            if base_height is not None:
+                height = min(height, base_height)
+            records = [{"op": "tx", "tx": tx} for tx in base_pending] + \
+                [record for record in records if record.get("op") == "tx"]
+            pending = self._pending_from({"height": height}, records, chain)
+            self.rewrite_pending(pending)
+            return pending, skipped
+
+    def read_pending(self) -> List[Transaction]:
+        """Membaca ulang pending pool dari journal tanpa memperbaiki file.
+
+        Dipakai proses yang berjalan lama (mis. scheduler mining) untuk melihat
+        transaksi yang ditambahkan proses lain. Record terakhir yang belum
+        selesai ditulis diabaikan, bukan dipotong.
+        """
+        if not self.exists():
+            return []
+        self.blocks.refresh()
+        header, records, _ = self._read_records(repair=False)
+        return self._pending_from(header, records, LazyChain(self.blocks))
+
+    def _pending_from(self, header: dict, records: List[dict], chain: LazyChain) -> List[Transaction]:
+        pending = {}
+        for record in records:
+            if record.get("op") != "tx":
+                raise CorruptStateError(f"Record journal tidak dikenal: {record.get('op')}")
+            tx = Transaction.from_dict(record["tx"])
+            pending[tx.transaction_id] = tx
+
+        # Crash antara append blok dan compact journal: buang transaksi yang
+        # sudah masuk blok setelah tinggi yang tercatat di header journal
+        for i in range(header.get("height", len(chain)), len(chain)):
+            for tx in chain[i].transactions:
+                pending.pop(tx.transaction_id, None)
+
+        return list(pending.values())
+
+    @timed("persist_seconds", op="rewrite")
+    def rewrite(self, chain: Sequence[Block], pending_transactions: List[Transaction]) -> LazyChain:
+        """Menulis ulang seluruh block store dan journal secara atomik"""
+        with self.lock:
+            old_blocks = self._blocks
+            self._blocks = BlockStore.rebuild(self.blocks_dir, chain)
+            if old_blocks is not None:
+                old_blocks.close()
+            self.rewrite_pending(pending_transactions)
+            return LazyChain(self._blocks)
+
+    @timed("persist_seconds", op="rewrite_pending")
+    def rewrite_pending(self, pending_transactions: List[Transaction]):
+        """Compact journal menjadi header + pending pool saat ini"""
+        with self.lock:
+            self.close()
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"op": "header", "format": JOURNAL_FORMAT_VERSION,
+                                    "height": len(self.blocks)}) + "\n")
+                for tx in pending_transactions:
+                    f.write(json.dumps({"op": "tx", "tx": tx.to_dict()}) + "\n")
+                f.flush()
+                if self.fsync_policy != FSYNC_NEVER:
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+
+    def flush(self, force: bool = False):
+        """Flush buffer ke OS dan fsync sesuai kebijakan"""
+        if self._fh is None:
+            return
+        self._fh.flush()
+        self._sync(self._fh.fileno(), force)
+
+    def _sync(self, fileno: int, force: bool = False):
+        now = time.monotonic()
+        if (force or self.fsync_policy == FSYNC_ALWAYS or
+                (self.fsync_policy == FSYNC_INTERVAL and now - self._last_fsync >= self.fsync_interval)):
+            os.fsync(fileno)
+            self._last_fsync = now
+
+    def close(self):
+        with self.lock:
+            if self._fh is not None:
+                self.flush(force=self.fsync_policy != FSYNC_NEVER)
+                self._fh.close()
+                self._fh = None
+
+    def _append(self, records: List[dict]):
+        """Group commit: gabungkan record thread lain yang menulis bersamaan.
+
+        Thread pertama yang mendapati tidak ada penulis aktif menjadi penulis
+        batch yang sedang terbuka; thread yang datang selama penulisan
+        mengumpulkan record-nya di batch berikutnya lalu menunggu.
+        """
+        data = "".join(json.dumps(record) + "\n" for record in records)
+        with self._commit:
+            batch = self._open_batch
+            if batch is None:
+                batch = self._open_batch = _CommitBatch()
+            batch.chunks.append(data)
+            while not batch.done:
+                if self._writing:
+                    self._commit.wait()
+                    continue
+                # Batch kita pasti batch yang terbuka: jadilah penulisnya
+                self._writing = True
+                self._open_batch = None
+                self._commit.release()
+                try:
+                    self._write_batch(batch)
+                except BaseException as e:
+                    batch.error = e
+                finally:
+                    self._commit.acquire()
+                    batch.done = True
+                    self._writing = False
+                    self._commit.notify_all()
+        if batch.error is not None:
+            raise batch.error
+
+    def _write_batch(self, batch: _CommitBatch):
+        METRICS.inc("journal_commits_total")
+        METRICS.inc("journal_commit_writers_total", len(batch.chunks))
+        with self.lock:
+            fh = self._journal_handle()
+            fh.write("".join(batch.chunks))
+            fh.flush()
+            # fsync di luar lock: proses lain bisa menulis sementara data
+            # ini dipindahkan ke disk, dan fsync mereka ikut ringan
+            fileno = os.dup(fh.fileno())
+        try:
+            self._sync(fileno)
+        finally:
+            os.close(fileno)
+
+    def _journal_handle(self):
+        """Handle append journal; dibuka ulang jika file diganti compaction proses lain"""
+        if self._fh is not None and os.fstat(self._fh.fileno()).st_ino != os.stat(self.path).st_ino:
+            self._fh.close()
+            self._fh = None
+        if self._fh is None:
+            self._fh = open(self.path, "a", encoding="utf-8")
+        return self._fh
+
+    def _read_records(self, repair: bool = True, skip_corrupt: bool = False) -> Tuple[dict, List[dict], int]:
+        header = {}
+        records = []
+        good_offset = 0
+        skipped = 0
+
+        with open(self.path, "rb") as f:
+            for number, line in enumerate(f, 1):
+                if not line.endswith(b"\n"):
+                    # Record terakhir terpotong (crash saat menulis): abaikan
+                    break
+                try:
+                    record = json.loads(line)
+                    if not isinstance(record, dict):
+                        raise ValueError("bukan object JSON")
+                except ValueError as e:
+                    if not skip_corrupt:
+                        raise CorruptStateError(f"Journal {self.path} rusak di baris {number}: {e}") from e
+                    skipped += 1
+                    good_offset += len(line)
+                    continue
+                if record.get("op") == "header":
+                    header = record
+                else:
+                    records.append(record)
+                good_offset += len(line)
+
+        if repair and good_offset != os.path.getsize(self.path):
+            with open(self.path, "r+b") as f:
+                f.truncate(good_offset)
+
+        return header, records, skipped
+
+    def _migrate_legacy(self, records: List[dict]) -> Tuple[LazyChain, List[Transaction]]:
+        """Migrasi satu kali dari journal format 1/2 (blok di dalam journal)"""
+        chain: List[Block] = []
+        pending = {}
+        for record in records:
+            op = record.get("op")
+            if op == "tx":
+                tx = Transaction.from_dict(record["tx"])
+                pending[tx.transaction_id] = tx
+            elif op == "block":
+                block = Block.from_dict(record["block"])
+                for tx in block.transactions:
+                    pending.pop(tx.transaction_id, None)
+                chain.append(block)
+            else:
+                raise ValueError(f"Record journal tidak dikenal: {op}")
+
+        pending_transactions = list(pending.values())
+        return self.rewrite(chain, pending_transactions), pending_transactions
+
+
+def migrate_pickle_to_journal(pickle_path: str, storage: JournalStorage) -> Tuple[LazyChain, List[Transaction]]:
+    """Migrasi satu kali dari format pickle lama ke journal.
+
+    File pickle lama di-rename menjadi `<nama>.migrated` setelah journal
+    berhasil ditulis.
+    """
+    import pickle
+
+    with open(pickle_path, "rb") as f:
+        data = pickle.load(f)
+
+    # Format lama: dict {"chain", "pending_transactions"} atau list of Block
+    if isinstance(data, dict) and "chain" in data:
+        chain = data.get("chain", [])
+        pending = data.get("pending_transactions", [])
+    elif isinstance(data, list):
+        chain, pending = data, []
+    else:
+        raise ValueError("Format file pickle tidak dikenal")
+
+    for block in chain:
+        # Blok dari pickle lama dibuat sebelum ada versi format dan Merkle root
+        if "version" not in vars(block):
+            block.version = BLOCK_VERSION_LEGACY
+            block.merkle_root = block.calculate_merkle_root()
+
+    # ... dan sebelum difficulty dicatat per blok; hash v1/v2 tidak memuat
+    # difficulty, jadi mencatatnya tidak mengubah hash
+    unrecorded = [block for block in chain if getattr(block, "difficulty", None) is None]
+    difficulty = infer_difficulty(unrecorded)
+    for block in unrecorded:
+        block.difficulty = difficulty
+
+    chain = storage.rewrite(chain, pending)
+    os.replace(pickle_path, pickle_path + ".migrated")
+    return chain, pending
@@ -0,0 +1,264 @@
+import gzip
+import json
+import signal
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+
+from app.blockstore import BLOCK_HEADER, BlockHeader, decode_blocks, decode_header, header_at
+from app.difficulty import check_difficulty_step
+from app.metrics import METRICS
+from app.mining import meets_difficulty
+from app.models import Block, BLOCK_VERSION_LEGACY
+from app.validation import (REASON_DIFFICULTY, REASON_HASH, REASON_MERKLE_ROOT, REASON_MESSAGES,
+                            REASON_PREVIOUS_HASH, REASON_PROOF_OF_WORK, check_block)
+
+
+DEFAULT_RANGE_SIZE = 100
+DEFAULT_SYNC_WORKERS = 4
+HEADER_BATCH = 10000
+SYNC_TIMEOUT = 60.0
+
+
+class SyncError(Exception):
+    """Sinkronisasi dengan peer gagal; chain lokal tidak diubah sejak blok terakhir yang valid"""
+
+
+class PeerClient:
+    """Klien HTTP untuk endpoint `/sync/*` milik `VerificationServer` peer"""
+
+    def __init__(self, url: str, timeout: float = SYNC_TIMEOUT):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def _get(self, path: str, **params) -> bytes:
+        url = f"{self.url}{path}"
+        if params:
+            url += "?" + urlencode(params)
+        request = urllib.request.Request(url, headers={"Accept-Encoding": "gzip"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                data = response.read()
+                if response.headers.get("Content-Encoding") == "gzip":
+                    data = gzip.decompress(data)
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read()).get("error")
+            except ValueError:
+                message = e.reason
+            raise SyncError(f"Peer {self.url} menolak {path}: {message}") from e
+        except (urllib.error.URLError, OSError) as e:
+            raise SyncError(f"Peer {self.url} tidak dapat dihubungi: {e}") from e
+        METRICS.inc("sync_bytes_total", len(data))
+        return data
+
+    def tip(self) -> Dict:
+        return json.loads(self._get("/sync/tip"))
+
+    def headers(self, start: int, count: int) -> List[BlockHeader]:
+        data = self._get("/sync/headers", **{"from": start, "count": count})
+        return [decode_header(data, offset) for offset in range(0, len(data), BLOCK_HEADER.size)]
+
+    def header(self, index: int) -> BlockHeader:
+        headers = self.headers(index, 1)
+        if not headers:
+            raise SyncError(f"Peer tidak memiliki blok #{index}")
+        return headers[0]
+
+    def blocks(self, start: int, stop: int) -> List[Block]:
+        """Blok start..stop-1; peer boleh mengirim lebih sedikit (batas ukuran)"""
+        blocks: List[Block] = []
+        while start + len(blocks) < stop:
+            data = self._get("/sync/blocks", **{"from": start + len(blocks), "to": stop})
+            received = decode_blocks(data)
+            if not received:
+                raise SyncError(f"Peer tidak mengirim blok #{start + len(blocks)}")
+            for block in received:
+                expected = start + len(blocks)
+                if block.index != expected or expected >= stop:
+                    raise SyncError(f"Peer mengirim blok #{block.index}, diharapkan blok #{expected} "
+                                    f"dari rentang #{start} - #{stop - 1}")
+                blocks.append(block)
+        return blocks
+
+
+def _check_header(header: BlockHeader, previous: Optional[BlockHeader], difficulty: int) -> Optional[str]:
+    """Cek header tanpa transaksi: sambungan, langkah difficulty, hash dan proof-of-work"""
+    if previous is not None:
+        if header.index != previous.index + 1 or header.previous_hash != previous.hash:
+            return REASON_PREVIOUS_HASH
+        if not check_difficulty_step(previous.difficulty, header.difficulty, header.index, difficulty):
+            return REASON_DIFFICULTY
+    if header.version != BLOCK_VERSION_LEGACY:
+        # Blok v2+ meng-commit Merkle root, jadi hash bisa dicek dari header saja
+        block = Block(index=header.index, transactions=[], timestamp=header.timestamp,
+                      previous_hash=header.previous_hash, nonce=header.nonce, hash=header.hash,
+                      version=header.version, merkle_root=header.merkle_root,
+                      difficulty=header.difficulty)
+        if block.calculate_hash() != header.hash:
+            return REASON_HASH
+    if header.index > 0 and not meets_difficulty(bytes.fromhex(header.hash), header.difficulty or difficulty):
+        return REASON_PROOF_OF_WORK
+    return None
+
+
+class PeerSync:
+    """Sinkronisasi chain dari peer: headers-first lalu unduh blok per rentang.
+
+    Header baru diunduh dan dicek lebih dulu (sambungan, difficulty, hash
+    dan proof-of-work), leluhur bersama dicari dengan binary search, lalu
+    blok yang kurang diunduh paralel per `range_size` blok dengan transfer
+    terkompres. Setiap blok dicek dengan aturan yang sama seperti
+    `is_chain_valid` sebelum disimpan, dan disimpan per rentang sehingga
+    sinkronisasi yang terputus bisa dilanjutkan.
+    """
+
+    def __init__(self, blockchain, peer: str, workers: int = DEFAULT_SYNC_WORKERS,
+                 range_size: int = DEFAULT_RANGE_SIZE, out=print):
+        self.blockchain = blockchain
+        self.client = PeerClient(peer)
+        self.workers = max(workers, 1)
+        self.range_size = max(range_size, 1)
+        self.out = out
+
+    def _local_hash(self, index: int) -> str:
+        return header_at(self.blockchain.chain, index).hash
+
+    def find_common_ancestor(self, remote_height: int) -> int:
+        """Indeks blok terakhir yang sama di chain lokal dan peer (-1 jika tidak ada).
+
+        Karena setiap blok meng-commit hash blok sebelumnya, blok yang sama
+        selalu membentuk prefix; cukup binary search pada satu hash per tinggi.
+        """
+        hi = min(len(self.blockchain.chain), remote_height) - 1
+        if hi < 0:
+            return -1
+        if self.client.header(hi).hash == self._local_hash(hi):
+            return hi
+        lo = -1
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if self.client.header(mid).hash == self._local_hash(mid):
+                lo = mid
+            else:
+                hi = mid
+        return lo
+
+    def fetch_headers(self, start: int, stop: int, previous: Optional[BlockHeader]) -> List[BlockHeader]:
+        headers: List[BlockHeader] = []
+        while start + len(headers) < stop:
+            batch = self.client.headers(start + len(headers), min(HEADER_BATCH, stop - start - len(headers)))
+            if not batch:
+                raise SyncError(f"Peer tidak mengirim header #{start + len(headers)}")
+            for header in batch:
+                reason = _check_header(header, previous, self.blockchain.difficulty)
+                if reason:
+                    raise SyncError(f"Header dari peer tidak valid: {REASON_MESSAGES[reason].format(index=header.index)}")
+                headers.append(header)
+                previous = header
+        return headers
+
+    def sync(self) -> int:
+        """Satu putaran sinkronisasi; mengembalikan jumlah blok yang ditambahkan"""
+        blockchain = self.blockchain
+        blockchain.refresh()
+        remote_height = self.client.tip()["height"]
+        local_height = len(blockchain.chain)
+        ancestor = self.find_common_ancestor(remote_height)
+
+        replace = False
+        if ancestor < local_height - 1:
+            if ancestor == remote_height - 1:
+                # Peer tertinggal: chain-nya prefix dari chain lokal
+                return 0
+            if local_height == 1:
+                # Node baru yang baru berisi genesis miliknya sendiri
+                replace = True
+            else:
+                raise SyncError(
+                    f"Chain lokal bercabang dari peer setelah blok #{ancestor} "
+                    f"(lokal {local_height} blok, peer {remote_height} blok); chain lokal tidak diubah"
+                )
+        if remote_height <= ancestor + 1:
+            return 0
+
+        start = ancestor + 1
+        previous = header_at(blockchain.chain, ancestor) if ancestor >= 0 else None
+        started = time.perf_counter()
+        headers = self.fetch_headers(start, remote_height, previous)
+        self.out(f"📑 {len(headers)} header diterima dan valid "
+                 f"(blok #{start} - #{remote_height - 1}, {time.perf_counter() - started:.2f} detik)")
+
+        previous_block = blockchain.chain[ancestor] if ancestor >= 0 else None
+        added = 0
+        transactions = 0
+        ranges = [(i, min(i + self.range_size, remote_height)) for i in range(start, remote_height, self.range_size)]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            # Jendela unduhan terbatas agar memori tidak bergantung panjang chain
+            window = deque()
+            next_range = 0
+            while next_range < len(ranges) or window:
+                while next_range < len(ranges) and len(window) < self.workers * 2:
+                    window.append((ranges[next_range], pool.submit(self.client.blocks, *ranges[next_range])))
+                    next_range += 1
+                (range_start, range_stop), future = window.popleft()
+                blocks = future.result()
+                if [block.index for block in blocks] != list(range(range_start, range_stop)):
+                    raise SyncError(f"Peer tidak mengirim tepat blok #{range_start} - #{range_stop - 1}")
+                for block in blocks:
+                    self._check(block, headers[block.index - start], previous_block)
+                    previous_block = block
+                blockchain.append_blocks(blocks, replace=replace and range_start == 0)
+                added += len(blocks)
+                transactions += sum(len(block.transactions) for block in blocks)
+                elapsed = time.perf_counter() - started
+                self.out(f"📥 Blok #{range_start} - #{range_stop - 1} disimpan "
+                         f"({added}/{len(headers)} blok, {transactions / elapsed:,.0f} tx/detik)")
+
+        blockchain.take_snapshot_if_due()
+        METRICS.inc("sync_blocks_total", added)
+        return added
+
+    def _check(self, block: Block, header: BlockHeader, previous: Optional[Block]):
+        if block.hash != header.hash or block.index != header.index:
+            raise SyncError(f"Blok #{header.index} dari peer tidak sama dengan header-nya")
+        if previous is None:
+            # Genesis tidak ditambang, cukup isinya konsisten dengan hash
+            reason = None
+            if block.merkle_root != block.calculate_merkle_root():
+                reason = REASON_MERKLE_ROOT
+            elif block.hash != block.calculate_hash():
+                reason = REASON_HASH
+        else:
+            reason = check_block(block, previous, self.blockchain.difficulty)
+        if reason:
+            raise SyncError(f"Blok dari peer ditolak: {REASON_MESSAGES[reason].format(index=block.index)}")
+
+    def follow(self, interval: float = 5.0, max_rounds: Optional[int] = None) -> int:
+        """Sinkronisasi terus-menerus sampai dihentikan (Ctrl+C/SIGTERM)"""
+        def stop(signum, frame):
+            raise KeyboardInterrupt
+
+        signal.signal(signal.SIGTERM, stop)
+        total = 0
+        rounds = 0
+        try:
+            while max_rounds is None or rounds < max_rounds:
+                try:
+                    added = self.sync()
+                except SyncError as e:
+                    # Peer sementara tidak tersedia atau mengirim data salah: coba lagi nanti
+                    self.out(f"⚠️  {e}")
+                    added = 0
+                total += added
+                rounds += 1
+                if added:
+                    self.out(f"🔄 Tinggi chain sekarang {len(self.blockchain.chain)} blok")
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            self.out("\n👋 Sinkronisasi dihentikan")
+        return total
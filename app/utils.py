@@ -1,6 +1,4 @@
 import hashlib
-import qrcode
-from PIL import Image
 import json
 from datetime import datetime
 
@@ -24,29 +22,54 @@ def validate_gpa(gpa: str) -> bool:
         return False
 
 
-def generate_verification_qr(student_data: dict, verification_url: str = "http://verify.unida.gontor.ac.id/verify"):
-    """Generate QR code untuk verifikasi ijazah"""
-    qr_data = {
+DEFAULT_VERIFICATION_URL = "http://verify.unida.gontor.ac.id/verify"
+
+
+def build_qr_payload(student_data: dict, verification_url: str = DEFAULT_VERIFICATION_URL,
+                     timestamp: str = None) -> dict:
+    """Isi QR verifikasi ijazah"""
+    return {
         "transaction_id": student_data.get("transaction_id"),
         "document_hash": student_data.get("document_hash"),
         "student_nim": student_data.get("nim"),
         "verification_url": verification_url,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": timestamp or datetime.now().isoformat()
     }
-    
+
+
+def render_qr_png(data: str, mask_pattern: int = None) -> bytes:
+    """Render string menjadi gambar QR PNG di memori.
+
+    Tanpa `mask_pattern`, qrcode mencoba 8 mask dan memilih yang terbaik;
+    mask tetap (0-7) jauh lebih cepat dan tetap valid untuk dipindai.
+    """
+    # Import di sini agar qrcode/PIL hanya dimuat oleh command yang membuat QR
+    import io
+    import qrcode
+
     qr = qrcode.QRCode(
         version=1,
         error_correction=qrcode.constants.ERROR_CORRECT_L,
         box_size=10,
         border=4,
+        mask_pattern=mask_pattern,
     )
     
-    qr.add_data(json.dumps(qr_data))
+    qr.add_data(data)
     qr.make(fit=True)
     
     img = qr.make_image(fill_color="black", back_color="white")
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def generate_verification_qr(student_data: dict, verification_url: str = DEFAULT_VERIFICATION_URL):
+    """Generate QR code untuk verifikasi ijazah"""
+    qr_data = build_qr_payload(student_data, verification_url)
     filename = f"qr_verification_{student_data['nim']}.png"
-    img.save(filename)
+    with open(filename, "wb") as f:
+        f.write(render_qr_png(json.dumps(qr_data)))
     
     print(f"✅ QR Code berhasil dibuat: {filename}")
     return filename
@@ -0,0 +1,200 @@
+import hashlib
+import hmac
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.blockstore import BlockStore, LazyChain, block_hash_at, header_at
+from app.difficulty import check_difficulty_step
+from app.mining import meets_difficulty
+from app.models import Block
+
+
+# Kode alasan blok tidak valid (machine-readable)
+REASON_MERKLE_ROOT = "merkle_root_mismatch"
+REASON_HASH = "hash_mismatch"
+REASON_PREVIOUS_HASH = "previous_hash_mismatch"
+REASON_PROOF_OF_WORK = "proof_of_work_invalid"
+REASON_DIFFICULTY = "difficulty_step_invalid"
+REASON_DUPLICATE_TRANSACTION = "duplicate_transaction"
+
+REASON_MESSAGES = {
+    REASON_MERKLE_ROOT: "Merkle root blok {index} tidak valid!",
+    REASON_HASH: "Hash blok {index} tidak valid!",
+    REASON_PREVIOUS_HASH: "Hash sebelumnya pada blok {index} tidak valid!",
+    REASON_PROOF_OF_WORK: "Proof-of-work blok {index} tidak valid!",
+    REASON_DIFFICULTY: "Perubahan difficulty pada blok {index} melanggar aturan retarget!",
+    REASON_DUPLICATE_TRANSACTION: "Blok {index} memuat transaksi duplikat!",
+}
+
+CHECKPOINT_KEY_ENV = "BLOCKCERT_CHECKPOINT_KEY"
+
+
+def check_block_contents(block: Block, difficulty: int) -> Optional[str]:
+    """Cek bagian blok yang tidak bergantung pada blok lain.
+
+    Proof-of-work dicek terhadap difficulty yang tercatat di blok; `difficulty`
+    konfigurasi hanya dipakai untuk blok lama yang belum dimigrasi (`migrate`
+    mencatat difficulty setiap blok). Mengembalikan kode alasan jika tidak
+    valid, atau None.
+    """
+    if block.difficulty is not None:
+        difficulty = block.difficulty
+    leaves = block.transaction_hashes()
+    # Merkle tree memasangkan node ganjil dengan dirinya sendiri, sehingga
+    # transaksi terakhir yang digandakan menghasilkan root yang sama
+    if (len(set(leaves)) != len(leaves) or
+            len({tx.transaction_id for tx in block.transactions}) != len(leaves)):
+        return REASON_DUPLICATE_TRANSACTION
+    if block.merkle_root != block.calculate_merkle_root(leaves):
+        return REASON_MERKLE_ROOT
+    if block.hash != block.calculate_hash():
+        return REASON_HASH
+    if not meets_difficulty(bytes.fromhex(block.hash), difficulty):
+        return REASON_PROOF_OF_WORK
+    return None
+
+
+def check_block(block: Block, previous_block: Block, difficulty: int) -> Optional[str]:
+    """Cek satu blok lengkap termasuk sambungannya ke blok sebelumnya"""
+    reason = check_block_contents(block, difficulty)
+    if reason is None and block.previous_hash != previous_block.hash:
+        reason = REASON_PREVIOUS_HASH
+    if reason is None and not check_difficulty_step(previous_block.difficulty, block.difficulty,
+                                                    block.index, difficulty):
+        reason = REASON_DIFFICULTY
+    return reason
+
+
+def _check_contents_chunk(blocks: List[Block], difficulty: int) -> Optional[Tuple[int, str]]:
+    """Worker: kembalikan blok tidak valid pertama di dalam chunk"""
+    for block in blocks:
+        reason = check_block_contents(block, difficulty)
+        if reason:
+            return block.index, reason
+    return None
+
+
+def _check_contents_range(blocks_dir: str, start: int, stop: int, difficulty: int) -> Optional[Tuple[int, str]]:
+    """Worker: baca blok start..stop langsung dari block store lalu cek isinya"""
+    store = BlockStore(blocks_dir, repair=False)
+    try:
+        return _check_contents_chunk((store.read_block(i) for i in range(start, stop)), difficulty)
+    finally:
+        store.close()
+
+
+def _report(valid: bool, start: int, height: int, invalid: Optional[Tuple[int, str]] = None) -> Dict:
+    report = {
+        "valid": valid,
+        "checked_from": start,
+        "height": height,
+        "invalid_block": None,
+        "reason": None,
+        "message": None,
+    }
+    if invalid:
+        index, reason = invalid
+        report.update(
+            invalid_block=index,
+            reason=reason,
+            message=REASON_MESSAGES[reason].format(index=index),
+        )
+    return report
+
+
+def validate_chain(chain: Sequence[Block], difficulty: int, start: int = 1,
+                   workers: int = 1, chunk_size: int = 256) -> Dict:
+    """Memvalidasi blok `start`..akhir chain.
+
+    Dengan `workers` > 1, perhitungan ulang Merkle root, hash dan
+    proof-of-work dibagi per chunk ke process pool; pengecekan previous_hash
+    yang murah dilakukan setelahnya dalam satu pass. Laporan berisi blok
+    tidak valid pertama beserta kode alasannya.
+    """
+    start = max(start, 1)
+    height = len(chain)
+    failures: List[Tuple[int, str]] = []
+
+    if workers > 1 and height - start > chunk_size:
+        from concurrent.futures import ProcessPoolExecutor
+
+        starts = list(range(start, height, chunk_size))
+        stops = [min(i + chunk_size, height) for i in starts]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            if isinstance(chain, LazyChain):
+                # Worker membaca blok sendiri dari block store lewat mmap
+                dirs = [chain.store.directory] * len(starts)
+                results = pool.map(_check_contents_range, dirs, starts, stops, [difficulty] * len(starts))
+            else:
+                chunks = [chain[i:j] for i, j in zip(starts, stops)]
+                results = pool.map(_check_contents_chunk, chunks, [difficulty] * len(chunks))
+            failures.extend(failure for failure in results if failure)
+    else:
+        for i in range(start, height):
+            reason = check_block_contents(chain[i], difficulty)
+            if reason:
+                failures.append((chain[i].index, reason))
+                break
+
+    # Pass akhir: sambungan previous_hash dan langkah difficulty, cukup dari header
+    previous = header_at(chain, start - 1) if height > start else None
+    for i in range(start, height):
+        header = header_at(chain, i)
+        if header.previous_hash != previous.hash:
+            failures.append((header.index, REASON_PREVIOUS_HASH))
+            break
+        if not check_difficulty_step(previous.difficulty, header.difficulty, header.index, difficulty):
+            failures.append((header.index, REASON_DIFFICULTY))
+            break
+        previous = header
+
+    if failures:
+        return _report(False, start, height, min(failures))
+    return _report(True, start, height)
+
+
+class ValidationCheckpoint:
+    """Checkpoint tinggi chain terakhir yang sudah divalidasi penuh.
+
+    Checkpoint disegel dengan HMAC-SHA256 jika `BLOCKCERT_CHECKPOINT_KEY`
+    di-set, atau dengan SHA-256 biasa jika tidak. Checkpoint hanya dipakai
+    jika segelnya cocok dan hash blok pada tinggi tersebut masih sama.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _digest(self, height: int, block_hash: str) -> str:
+        message = f"{height}:{block_hash}".encode()
+        key = os.environ.get(CHECKPOINT_KEY_ENV)
+        if key:
+            return hmac.new(key.encode(), message, hashlib.sha256).hexdigest()
+        return hashlib.sha256(message).hexdigest()
+
+    def load(self, chain: Sequence[Block]) -> int:
+        """Tinggi yang sudah tervalidasi menurut checkpoint (1 jika tidak ada)"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            height, block_hash = data["height"], data["block_hash"]
+        except (OSError, ValueError, KeyError):
+            return 1
+
+        if not hmac.compare_digest(data.get("digest", ""), self._digest(height, block_hash)):
+            return 1
+        if not 1 <= height <= len(chain) or block_hash_at(chain, height - 1) != block_hash:
+            return 1
+        return height
+
+    def save(self, chain: Sequence[Block]):
+        height = len(chain)
+        block_hash = block_hash_at(chain, -1)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "height": height,
+                "block_hash": block_hash,
+                "digest": self._digest(height, block_hash),
+            }, f)
+        os.replace(tmp_path, self.path)
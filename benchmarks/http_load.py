@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Load test untuk server verifikasi HTTP.
+
+Membuka beberapa koneksi keep-alive ke server dan mengirim request
+GET /verify dengan pasangan NIM/hash dari chain, lalu melaporkan
+throughput dan persentil latensi.
+
+Usage:
+  python3 benchmarks/http_load.py --url http://127.0.0.1:8080 [--requests N] [--concurrency C]
+  python3 benchmarks/http_load.py --spawn [--data-dir DIR]   # jalankan server in-process
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def sample_pairs(blockchain, limit: int):
+    """Ambil pasangan (nim, hash) dari index; setengahnya dibuat tidak valid"""
+    pairs = []
+    for document_hash, locations in blockchain.index.by_document_hash.items():
+        block_index, position = locations[0]
+        tx = blockchain.chain.transaction(block_index, position)
+        pairs.append((tx.student_nim, document_hash))
+        if len(pairs) >= limit:
+            break
+    misses = [(nim, "0" * 64) for nim, _ in pairs[: len(pairs) // 2]]
+    return pairs + misses or [("00000000", "0" * 64)]
+
+
+async def worker(host, port, pairs, offset, count, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i in range(count):
+            nim, document_hash = pairs[(offset + i) % len(pairs)]
+            request = (f"GET /verify?nim={nim}&hash={document_hash} HTTP/1.1\r\n"
+                       f"Host: {host}\r\n\r\n").encode()
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, pairs, total, concurrency):
+    latencies = []
+    per_worker = total // concurrency
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        worker(host, port, pairs, i * per_worker, per_worker, latencies) for i in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+
+    def pick(q):
+        return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 3)
+
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_sec": round(len(latencies) / elapsed, 1),
+        "latency_ms": {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": pick(1.0)},
+    }
+
+
+async def main_async(args):
+    from app.core import UniversityBlockchain
+
+    os.chdir(args.data_dir)
+    blockchain = UniversityBlockchain()
+    pairs = sample_pairs(blockchain, args.sample)
+
+    server = None
+    if args.spawn:
+        from app.server import VerificationServer
+        server = VerificationServer(blockchain, "127.0.0.1", 0)
+        await server.start()
+        host, port = "127.0.0.1", server.port
+    else:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+
+    try:
+        result = await run_load(host, port, pairs, args.requests, args.concurrency)
+    finally:
+        if server:
+            await server.close()
+    print(json.dumps(result, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verification server load test")
+    parser.add_argument("--url", default="http://127.0.0.1:8080", help="Server base URL")
+    parser.add_argument("--spawn", action="store_true", help="Start a server in this process on a free port")
+    parser.add_argument("--data-dir", default=ROOT, help="Directory whose data/ holds the chain")
+    parser.add_argument("--requests", type=int, default=20000, help="Total requests")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent keep-alive connections")
+    parser.add_argument("--sample", type=int, default=1000, help="Distinct (NIM, hash) pairs to request")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark untuk CLI.
+
+Mengukur waktu import modul dan time-to-first-output dari `run.py` untuk
+beberapa command, masing-masing di proses Python baru.
+
+Usage: python3 benchmarks/startup.py [--runs N] [--data-dir DIR] [--json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUN_PY = os.path.join(ROOT, "run.py")
+
+IMPORTS = ["app.core", "blockchain.cli"]
+COMMANDS = [["--help"], ["info"], ["mine", "--help"], ["validate"]]
+
+
+def time_import(module: str) -> float:
+    """Waktu `import module` di interpreter baru, dikurangi interpreter kosong"""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip())
+
+
+def time_command(args, cwd: str):
+    """Kembalikan (time-to-first-output, total) untuk satu eksekusi CLI"""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, RUN_PY, *args], cwd=cwd,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    proc.stdout.read(1)
+    first_output = time.perf_counter() - start
+    proc.stdout.read()
+    proc.wait()
+    return first_output, time.perf_counter() - start
+
+
+def summarize(samples):
+    return {
+        "min_ms": round(min(samples) * 1000, 2),
+        "median_ms": round(statistics.median(samples) * 1000, 2),
+        "max_ms": round(max(samples) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI cold start benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="Runs per measurement")
+    parser.add_argument("--data-dir", default=ROOT,
+                        help="Working directory whose data/ is used by the CLI (default: repository root)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = {"imports": {}, "commands": {}}
+    for module in IMPORTS:
+        results["imports"][module] = summarize([time_import(module) for _ in range(args.runs)])
+
+    for command in COMMANDS:
+        first, total = zip(*(time_command(command, args.data_dir) for _ in range(args.runs)))
+        results["commands"][" ".join(command)] = {
+            "first_output": summarize(first),
+            "total": summarize(total),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("📦 Import time")
+    for module, stats in results["imports"].items():
+        print(f"   {module:<20} median {stats['median_ms']:>8.2f} ms  (min {stats['min_ms']:.2f})")
+    print("⏱️  CLI time-to-first-output / total")
+    for command, stats in results["commands"].items():
+        print(f"   {command:<20} median {stats['first_output']['median_ms']:>8.2f} ms"
+              f" / {stats['total']['median_ms']:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite untuk operasi inti blockchain.
+
+Membangun chain sintetis yang deterministik (record mahasiswa dibuat dari
+seed dengan pola `data/students.json`) untuk beberapa ukuran, lalu mengukur
+add_degree_transaction, mine_pending_transactions, verify_degree,
+is_chain_valid, save_blockchain/load_blockchain dan get_blockchain_info.
+Setiap ukuran dijalankan di proses baru sehingga peak RSS-nya terpisah.
+
+Usage:
+  python3 benchmarks/suite.py run [--sizes 1000,10000,100000] [--output results.json]
+  python3 benchmarks/suite.py compare BASE.json NEW.json [--threshold 0.10]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+STUDENTS_TEMPLATE = os.path.join(ROOT, "data", "students.json")
+FIRST_NAMES = ["Ahmad", "Budi", "Citra", "Dewi", "Eko", "Fatimah", "Gilang", "Hana", "Ikbal", "Joko",
+               "Kartika", "Lukman", "Maya", "Nur", "Oki", "Putri", "Rizki", "Sari", "Taufik", "Umar"]
+LAST_NAMES = ["Pratama", "Saputra", "Wijaya", "Hidayat", "Nugroho", "Rahman", "Santoso", "Kurniawan",
+              "Lestari", "Siregar", "Hasibuan", "Syahputra", "Fauzi", "Maulana", "Ramadhan"]
+
+# Metrik yang lebih besar = lebih baik; selain itu lebih kecil = lebih baik
+HIGHER_IS_BETTER = ("throughput_per_s",)
+COMPARED_METRICS = ("throughput_per_s", "p50_ms", "p95_ms", "p99_ms", "total_s")
+
+
+def _programs():
+    """Pasangan (degree, major) dari data/students.json, atau default"""
+    try:
+        with open(STUDENTS_TEMPLATE, "r", encoding="utf-8") as fh:
+            pairs = sorted({(s["degree"], s["major"]) for s in json.load(fh)})
+        if pairs:
+            return pairs
+    except (OSError, ValueError, KeyError):
+        pass
+    return [("Sarjana Komputer", "Teknik Informatika")]
+
+
+def generate_students(count: int, seed: int = 42, start_nim: int = 20000000):
+    """Generator record mahasiswa sintetis; hasil sama untuk seed yang sama"""
+    rng = random.Random(seed)
+    programs = _programs()
+    for i in range(count):
+        degree, major = programs[rng.randrange(len(programs))]
+        yield {
+            "nim": str(start_nim + i),
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "degree": degree,
+            "major": major,
+            "gpa": f"{rng.uniform(2.0, 4.0):.2f}",
+            "graduation_date": f"{rng.randint(2015, 2025)}-{rng.choice(['03', '06', '09', '12'])}-15",
+        }
+
+
+def build_chain(data_dir: str, transactions: int, tx_per_block: int, difficulty: int, seed: int):
+    """Membangun chain berisi `transactions` ijazah dalam blok berisi `tx_per_block`"""
+    from app.core import UniversityBlockchain
+    from app.storage import FSYNC_NEVER
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        blockchain = UniversityBlockchain(difficulty=difficulty, data_dir=data_dir, fsync_policy=FSYNC_NEVER)
+        # Index dan statistik diperbarui per blok seperti pada pemakaian normal
+        blockchain.index
+        blockchain.aggregates
+        students = generate_students(transactions, seed)
+        remaining = transactions
+        while remaining > 0:
+            batch = min(tx_per_block, remaining)
+            blockchain.add_bulk_transactions(next(students) for _ in range(batch))
+            blockchain.mine_pending_transactions()
+            remaining -= batch
+        blockchain.storage.close()
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+
+    def pick(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+
+    return {"p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99)}
+
+
+def measure(fn, runs: int):
+    """Jalankan `fn` sebanyak `runs` kali dengan stdout dibuang"""
+    samples = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(runs):
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(samples, items: int = None):
+    """Statistik satu operasi; `items` = jumlah item yang diproses seluruh sampel"""
+    total = sum(samples)
+    items = items if items is not None else len(samples)
+    return {
+        "ops": len(samples),
+        "items": items,
+        "total_s": round(total, 6),
+        "throughput_per_s": round(items / total, 2) if total > 0 else None,
+        **percentiles(samples),
+    }
+
+
+def peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KiB, macOS byte
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 2)
+
+
+def run_size(size: int, tx_per_block: int, difficulty: int, samples: int, seed: int, work_dir: str):
+    """Semua benchmark untuk satu ukuran chain (dijalankan di proses sendiri)"""
+    from app.core import UniversityBlockchain
+
+    data_dir = os.path.join(work_dir, f"chain_{size}")
+    start = time.perf_counter()
+    build_chain(data_dir, size, tx_per_block, difficulty, seed)
+    results = {"build_s": round(time.perf_counter() - start, 3), "operations": {}}
+    ops = results["operations"]
+
+    def open_chain():
+        return UniversityBlockchain(difficulty=difficulty, data_dir=data_dir)
+
+    # load_blockchain: membuka chain dari storage di instance baru
+    ops["load_blockchain"] = summarize(measure(open_chain, samples))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        blockchain = open_chain()
+
+    # get_blockchain_info: panggilan pertama memuat statistik, sisanya dari memori
+    cold = measure(blockchain.get_blockchain_info, 1)
+    ops["get_blockchain_info_cold"] = summarize(cold)
+    ops["get_blockchain_info"] = summarize(measure(blockchain.get_blockchain_info, samples))
+
+    rng = random.Random(seed)
+    chain = blockchain.chain
+    pairs = []
+    for _ in range(samples):
+        block_index = rng.randrange(1, len(chain))
+        tx = chain.transaction(block_index, rng.randrange(chain.header(block_index).tx_count))
+        pairs.append((tx.document_hash, tx.student_nim))
+    pairs_iter = iter(pairs)
+    ops["verify_degree_cold"] = summarize(measure(lambda: blockchain.verify_degree(*pairs[0]), 1))
+    ops["verify_degree"] = summarize(measure(lambda: blockchain.verify_degree(*next(pairs_iter)), samples))
+
+    new_students = generate_students(samples, seed + 1, start_nim=90000000)
+    ops["add_degree_transaction"] = summarize(
+        measure(lambda: blockchain.add_degree_transaction(next(new_students)), samples))
+
+    ops["mine_pending_transactions"] = summarize(
+        measure(blockchain.mine_pending_transactions, 1), items=samples)
+
+    height = len(blockchain.chain)
+    ops["is_chain_valid"] = summarize(measure(blockchain.is_chain_valid, 1), items=height)
+    ops["save_blockchain"] = summarize(measure(blockchain.save_blockchain, 1), items=height)
+
+    blockchain.storage.close()
+    shutil.rmtree(data_dir, ignore_errors=True)
+    results["blocks"] = height
+    results["peak_rss_mb"] = peak_rss_mb()
+    return results
+
+
+def run(args):
+    sizes = [int(size) for size in args.sizes.split(",")]
+    work_dir = tempfile.mkdtemp(prefix="blockchain-bench-")
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": args.seed,
+            "tx_per_block": args.tx_per_block,
+            "difficulty": args.difficulty,
+            "samples": args.samples,
+        },
+        "results": {},
+    }
+
+    ctx = multiprocessing.get_context("spawn")
+    try:
+        for size in sizes:
+            print(f"📏 {size:,} transaksi...", file=sys.stderr, flush=True)
+            with ctx.Pool(1) as pool:
+                result = pool.apply(run_size, (size, args.tx_per_block, args.difficulty,
+                                               args.samples, args.seed, work_dir))
+            report["results"][str(size)] = result
+            for name, stats in result["operations"].items():
+                print(f"   {name:<28} {stats['throughput_per_s'] or 0:>12,.1f}/s"
+                      f"  p95 {stats['p95_ms']:>10.3f} ms", file=sys.stderr)
+            print(f"   {'peak RSS':<28} {result['peak_rss_mb']:>12,.1f} MB", file=sys.stderr)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(output + "\n")
+        print(f"✅ Hasil ditulis ke {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+def _worse_by(metric: str, base: float, new: float) -> float:
+    """Perubahan relatif ke arah yang lebih buruk (positif = regresi)"""
+    if not base:
+        return 0.0
+    if metric in HIGHER_IS_BETTER:
+        return (base - new) / base
+    return (new - base) / base
+
+
+def compare_reports(base, new, threshold: float):
+    """Daftar regresi (size, operation, metric, base, new, change) di atas threshold"""
+    regressions = []
+    for size, base_result in base["results"].items():
+        new_result = new["results"].get(size)
+        if new_result is None:
+            continue
+        for operation, base_stats in base_result["operations"].items():
+            new_stats = new_result["operations"].get(operation)
+            if new_stats is None:
+                continue
+            for metric in COMPARED_METRICS:
+                if base_stats.get(metric) is None or new_stats.get(metric) is None:
+                    continue
+                change = _worse_by(metric, base_stats[metric], new_stats[metric])
+                if change > threshold:
+                    regressions.append((size, operation, metric, base_stats[metric], new_stats[metric], change))
+        change = _worse_by("peak_rss_mb", base_result["peak_rss_mb"], new_result["peak_rss_mb"])
+        if change > threshold:
+            regressions.append((size, "process", "peak_rss_mb", base_result["peak_rss_mb"],
+                                new_result["peak_rss_mb"], change))
+    return regressions
+
+
+def compare(args):
+    with open(args.base, "r", encoding="utf-8") as fh:
+        base = json.load(fh)
+    with open(args.new, "r", encoding="utf-8") as fh:
+        new = json.load(fh)
+
+    regressions = compare_reports(base, new, args.threshold)
+    if not regressions:
+        print(f"✅ Tidak ada regresi di atas {args.threshold:.0%}")
+        return 0
+
+    print(f"❌ {len(regressions)} regresi di atas {args.threshold:.0%}:")
+    for size, operation, metric, old, current, change in regressions:
+        print(f"   [{size}] {operation}.{metric}: {old} -> {current} ({change:+.1%})")
+    return 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Blockchain benchmark suite")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run benchmarks and write JSON results")
+    run_parser.add_argument("--sizes", default="1000,10000,100000",
+                            help="Comma-separated chain sizes in transactions (e.g. 1000,10000,100000,1000000)")
+    run_parser.add_argument("--tx-per-block", type=int, default=1000, help="Transactions per synthetic block")
+    run_parser.add_argument("--difficulty", type=int, default=2, help="Mining difficulty of the synthetic chain")
+    run_parser.add_argument("--samples", type=int, default=200, help="Samples per latency measurement")
+    run_parser.add_argument("--seed", type=int, default=42, help="Seed for the synthetic records")
+    run_parser.add_argument("--output", help="Write results to this JSON file (default: stdout)")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two result files and flag regressions")
+    compare_parser.add_argument("base", help="Baseline results JSON")
+    compare_parser.add_argument("new", help="New results JSON")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="Relative change treated as a regression (default 0.10)")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,55 @@
 import argparse
+import os
 import sys
+import time
 from datetime import datetime
 import json
 
-from app.core import UniversityBlockchain
+from app.core import UniversityBlockchain, verify_inclusion_proof
+from app.export import EXPORT_FORMATS
+from app.ingest import INGEST_FORMATS, ProgressReporter, ingest_file
+from app.metrics import METRICS, METRICS_FILENAME, MetricsRegistry, load_metrics_file
 from app.utils import generate_verification_qr, format_student_data
 
+METRICS_PATH = os.path.join("data", METRICS_FILENAME)
+
 
 class BlockchainCLI:
     def __init__(self):
-        self.blockchain = UniversityBlockchain()
+        self._blockchain = None
+
+    @property
+    def blockchain(self) -> UniversityBlockchain:
+        """Chain baru dibuka saat command pertama kali membutuhkannya"""
+        if self._blockchain is None:
+            self._blockchain = UniversityBlockchain()
+        return self._blockchain
     
+    @staticmethod
+    def _add_range_arguments(parser):
+        """Argumen rentang blok dan filter untuk display/export"""
+        parser.add_argument("--from", dest="start", type=int, default=0, help="First block index")
+        parser.add_argument("--to", dest="stop", type=int, help="Last block index (inclusive)")
+        parser.add_argument("--nim", help="Only degrees of this NIM")
+        parser.add_argument("--major", help="Only degrees of this major")
+        parser.add_argument("--issuer", help="Only degrees from this issuer")
+
+    @staticmethod
+    def _range_kwargs(args):
+        return {
+            "start": args.start,
+            "stop": args.stop + 1 if args.stop is not None else None,
+            "nim": args.nim,
+            "major": args.major,
+            "issuer": args.issuer,
+        }
+
     def run(self):
         """Menjalankan CLI"""
         parser = argparse.ArgumentParser(description="University Blockchain System")
+        parser.add_argument("--metrics", action="store_true",
+                            help=f"Record performance metrics for this run into {METRICS_PATH}")
+        parser.add_argument("--profile", metavar="FILE", help="Write a cProfile dump of this command to FILE")
         subparsers = parser.add_subparsers(dest="command", help="Available commands")
         
         # Add degree command
@@ -26,62 +62,230 @@ class BlockchainCLI:
         add_parser.add_argument("--grad-date", required=True, help="Graduation date (YYYY-MM-DD)")
         
         # Mine command
-        subparsers.add_parser("mine", help="Mine pending transactions")
+        mine_parser = subparsers.add_parser("mine", help="Mine pending transactions")
+        mine_parser.add_argument("--workers", type=int, default=1,
+                                 help="Number of mining processes (0 = all CPU cores)")
+        mine_parser.add_argument("--max-tx", type=int, help="Maximum transactions per block (splits larger pools)")
+        mine_parser.add_argument("--max-bytes", type=int, help="Maximum transaction bytes per block (splits larger pools)")
+        mine_parser.add_argument("--daemon", action="store_true",
+                                 help="Keep running and cut blocks automatically from the pending pool")
+        mine_parser.add_argument("--max-wait", type=float, default=30.0,
+                                 help="Daemon: cut a block once the oldest pending transaction waited this many seconds")
+        mine_parser.add_argument("--poll-interval", type=float, default=1.0,
+                                 help="Daemon: seconds between pending pool checks")
         
         # Verify command
         verify_parser = subparsers.add_parser("verify", help="Verify a degree")
         verify_parser.add_argument("--nim", required=True, help="Student NIM")
         verify_parser.add_argument("--hash", required=True, help="Document hash")
+        verify_parser.add_argument("--proof", action="store_true", help="Print a Merkle inclusion proof as JSON")
+        verify_parser.add_argument("--proof-out", help="Write the Merkle inclusion proof to this file")
+
+        # Revoke command
+        revoke_parser = subparsers.add_parser("revoke", help="Revoke an issued degree (takes effect once mined)")
+        revoke_parser.add_argument("--nim", required=True, help="Student NIM")
+        revoke_parser.add_argument("--hash", required=True, help="Document hash of the degree")
+        revoke_parser.add_argument("--reason", required=True, help="Reason for the revocation")
+
+        # Bulk verify command
+        verify_bulk_parser = subparsers.add_parser("verify-bulk", help="Verify many (NIM, document hash) pairs from a file")
+        verify_bulk_parser.add_argument("--file", required=True,
+                                        help="CSV, NDJSON or JSON array with nim and hash columns")
+        verify_bulk_parser.add_argument("--format", choices=INGEST_FORMATS, help="Input format (default: detect from file)")
+        verify_bulk_parser.add_argument("--output", required=True, help="Result file (.csv for CSV, otherwise NDJSON)")
+
+        # Verify proof command
+        proof_parser = subparsers.add_parser("verify-proof", help="Check a Merkle inclusion proof file")
+        proof_parser.add_argument("--file", required=True, help="Path to a proof JSON produced by 'verify --proof-out'")
+        proof_parser.add_argument("--block-hash", help="Trusted hash of the proof's block (default: compare with the local chain)")
+
+        # Migrate command
+        subparsers.add_parser("migrate", help="Upgrade legacy blocks to the Merkle block format (re-mines them)")
         
         # Student info command
         student_parser = subparsers.add_parser("student-info", help="Get student degrees")
         student_parser.add_argument("--nim", required=True, help="Student NIM")
         
+        # Search command
+        search_parser = subparsers.add_parser("search", help="Search degrees by name, major, degree and graduation date")
+        search_parser.add_argument("--name", help="Student name words (prefixes allowed)")
+        search_parser.add_argument("--major", help="Major words (prefixes allowed)")
+        search_parser.add_argument("--degree", help="Degree words (prefixes allowed)")
+        search_parser.add_argument("--graduated-from", help="Earliest graduation date (YYYY, YYYY-MM or YYYY-MM-DD)")
+        search_parser.add_argument("--graduated-to", help="Latest graduation date (YYYY, YYYY-MM or YYYY-MM-DD)")
+        search_parser.add_argument("--page", type=int, default=1, help="Result page (starting at 1)")
+        search_parser.add_argument("--page-size", type=int, default=20, help="Results per page")
+        search_parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+
+        # Cohort report command
+        report_parser = subparsers.add_parser("report", help="Cohort analytics: GPA statistics, graduate counts and issuance over time")
+        report_parser.add_argument("--by", default="major", choices=("major", "degree", "year", "issuer"),
+                                   help="Group GPA statistics by this field")
+        report_parser.add_argument("--period", default="month", choices=("year", "month", "day"),
+                                   help="Period for issuance counts")
+        report_parser.add_argument("--major", help="Only graduates of this major")
+        report_parser.add_argument("--year-from", type=int, help="First graduation year")
+        report_parser.add_argument("--year-to", type=int, help="Last graduation year")
+        report_parser.add_argument("--format", default="table", choices=("table", "csv", "json"), help="Output format")
+        report_parser.add_argument("--output", help="Write the report to this file instead of stdout")
+
         # Blockchain info command
         subparsers.add_parser("info", help="Show blockchain information")
         
         # Validate command
-        subparsers.add_parser("validate", help="Validate blockchain integrity")
+        validate_parser = subparsers.add_parser("validate", help="Validate blockchain integrity")
+        validate_parser.add_argument("--full", action="store_true",
+                                     help="Re-validate every block instead of only blocks after the last checkpoint")
+        validate_parser.add_argument("--workers", type=int, default=1,
+                                     help="Processes used to recompute block hashes (0 = all CPU cores)")
+        validate_parser.add_argument("--json", action="store_true", help="Print the validation report as JSON")
         
         # Display command
         display_parser = subparsers.add_parser("display", help="Display blockchain")
         display_parser.add_argument("--detailed", action="store_true", help="Show detailed view")
+        display_parser.add_argument("--limit", type=int, help="Show at most N blocks")
+        display_parser.add_argument("--page-size", type=int, default=50, help="Blocks per printed table page")
+        self._add_range_arguments(display_parser)
+
+        # Export command
+        export_parser = subparsers.add_parser("export", help="Export blocks and transactions as JSON Lines or CSV")
+        export_parser.add_argument("--output", required=True, help="Output file (.csv for CSV, otherwise JSON Lines)")
+        export_parser.add_argument("--format", choices=EXPORT_FORMATS, help="Output format (default: from extension)")
+        self._add_range_arguments(export_parser)
         
         # Generate QR command
         qr_parser = subparsers.add_parser("generate-qr", help="Generate verification QR code")
         qr_parser.add_argument("--nim", required=True, help="Student NIM")
 
+        # Bulk QR command
+        qr_bulk_parser = subparsers.add_parser("generate-qr-bulk", help="Generate verification QR codes for a cohort into one archive")
+        qr_bulk_parser.add_argument("--output", required=True, help="Archive path (.zip, .tar, .tar.gz or .tgz)")
+        qr_bulk_parser.add_argument("--from-block", type=int, help="First block to include")
+        qr_bulk_parser.add_argument("--to-block", type=int, help="Last block to include")
+        qr_bulk_parser.add_argument("--major", help="Only students of this major")
+        qr_bulk_parser.add_argument("--nims", help="Comma-separated NIM list")
+        qr_bulk_parser.add_argument("--nim-file", help="File with one NIM per line")
+        qr_bulk_parser.add_argument("--workers", type=int, default=0, help="Render processes (0 = all CPUs)")
+
+        # SQL read model commands
+        subparsers.add_parser("sync-sql", help="Create or update the SQLite read model (data/blockchain.sqlite)")
+        subparsers.add_parser("rebuild-sql", help="Rebuild the SQLite read model from the whole chain")
+
+        # Snapshot & recovery commands
+        snapshot_parser = subparsers.add_parser("snapshot", help="List or create state snapshots")
+        snapshot_parser.add_argument("--create", action="store_true", help="Create a snapshot at the current tip")
+        subparsers.add_parser("recover", help="Rebuild a corrupt pending-transaction journal from the latest snapshot")
+
+        # Difficulty command
+        difficulty_parser = subparsers.add_parser("difficulty", help="Show or configure difficulty retargeting")
+        difficulty_parser.add_argument("--target-block-time", type=float, help="Target mining time per block in seconds")
+        difficulty_parser.add_argument("--min", dest="min_difficulty", type=int, help="Lowest difficulty retargeting may choose")
+        difficulty_parser.add_argument("--max", dest="max_difficulty", type=int, help="Highest difficulty retargeting may choose")
+        difficulty_parser.add_argument("--disable", action="store_true", help="Turn retargeting off (keep the tip difficulty)")
+
+        # Stats command
+        stats_parser = subparsers.add_parser("stats", help="Show recorded performance metrics")
+        stats_parser.add_argument("--prometheus", metavar="FILE", help="Export metrics in Prometheus text format to FILE")
+        stats_parser.add_argument("--json", action="store_true", help="Print raw metrics as JSON")
+        stats_parser.add_argument("--reset", action="store_true", help="Clear recorded metrics")
+
+        # Peer sync command
+        sync_parser = subparsers.add_parser("sync", help="Replicate the chain from a peer's verification server")
+        sync_parser.add_argument("--peer", required=True, help="Peer base URL, e.g. http://10.0.0.5:8080")
+        sync_parser.add_argument("--workers", type=int, default=4, help="Parallel block range downloads")
+        sync_parser.add_argument("--range-size", type=int, default=100, help="Blocks per download request")
+        sync_parser.add_argument("--follow", action="store_true", help="Keep following the peer's tip")
+        sync_parser.add_argument("--interval", type=float, default=5.0, help="Seconds between polls with --follow")
+
+        # Verification server command
+        serve_parser = subparsers.add_parser("serve", help="Run the HTTP verification server")
+        serve_parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+        serve_parser.add_argument("--port", type=int, default=8080, help="Bind port")
+        serve_parser.add_argument("--cache-size", type=int, default=100000, help="Verification result cache entries")
+        serve_parser.add_argument("--refresh-interval", type=float, default=1.0,
+                                  help="Seconds between checks for newly mined blocks")
+
         # Bulk add command
-        bulk_parser = subparsers.add_parser("add-bulk", help="Add multiple degree transactions from a JSON file")
-        bulk_parser.add_argument("--file", required=True, help="Path to JSON file containing an array of student objects")
+        bulk_parser = subparsers.add_parser("add-bulk", help="Add multiple degree transactions from a JSON, NDJSON or CSV file")
+        bulk_parser.add_argument("--file", required=True, help="Path to a JSON array, NDJSON or CSV file of student records")
+        bulk_parser.add_argument("--format", choices=INGEST_FORMATS, help="Input format (default: detect from file)")
+        bulk_parser.add_argument("--chunk-size", type=int, default=5000,
+                                 help="Commit to storage every N valid records (0 = once for the whole file)")
+        bulk_parser.add_argument("--errors", help="Write rows that fail validation to this CSV report")
         
         args = parser.parse_args()
         
         if not args.command:
             parser.print_help()
             return
-        
+
+        if args.metrics:
+            METRICS.enable()
+        profiler = None
+        if args.profile:
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+
         try:
             if args.command == "add-degree":
                 self.add_degree(args)
             elif args.command == "mine":
-                self.mine_block()
+                self.mine_block(args)
             elif args.command == "verify":
                 self.verify_degree(args)
+            elif args.command == "revoke":
+                self.revoke_degree(args)
+            elif args.command == "verify-bulk":
+                self.verify_bulk(args)
+            elif args.command == "verify-proof":
+                self.verify_proof(args)
+            elif args.command == "migrate":
+                self.migrate_chain()
             elif args.command == "student-info":
                 self.get_student_info(args)
+            elif args.command == "search":
+                self.search(args)
+            elif args.command == "report":
+                self.report(args)
             elif args.command == "info":
                 self.show_info()
             elif args.command == "validate":
-                self.validate_chain()
+                self.validate_chain(args)
             elif args.command == "display":
-                self.display_chain(args.detailed)
+                self.display_chain(args)
+            elif args.command == "export":
+                self.export_chain(args)
             elif args.command == "generate-qr":
                 self.generate_qr_code(args)
+            elif args.command == "generate-qr-bulk":
+                self.generate_qr_bulk(args)
             elif args.command == "add-bulk":
                 self.add_bulk(args)
+            elif args.command == "sync":
+                self.sync_peer(args)
+            elif args.command == "serve":
+                self.serve(args)
+            elif args.command == "difficulty":
+                self.configure_difficulty(args)
+            elif args.command == "stats":
+                self.show_stats(args)
+            elif args.command in ("sync-sql", "rebuild-sql"):
+                self.sync_sql(rebuild=args.command == "rebuild-sql")
+            elif args.command == "snapshot":
+                self.snapshot(args)
+            elif args.command == "recover":
+                self.recover()
         except Exception as e:
             print(f"❌ Error: {e}")
+        finally:
+            if profiler:
+                profiler.disable()
+                profiler.dump_stats(args.profile)
+                print(f"🧪 Profil ditulis ke {args.profile} (lihat dengan: python -m pstats {args.profile})")
+            if METRICS.enabled and args.command != "stats":
+                os.makedirs(os.path.dirname(METRICS_PATH), exist_ok=True)
+                METRICS.dump(METRICS_PATH)
     
     def add_degree(self, args):
         """Menambahkan transaksi ijazah"""
@@ -96,9 +300,24 @@ class BlockchainCLI:
             print(f"📋 Transaction ID: {transaction_id}")
             print(f"⏳ Status: Pending (butuh mining)")
     
-    def mine_block(self):
+    def mine_block(self, args):
         """Menambang blok baru"""
-        success = self.blockchain.mine_pending_transactions()
+        if args.daemon:
+            from app.scheduler import MiningScheduler
+
+            scheduler = MiningScheduler(
+                self.blockchain, max_transactions=args.max_tx or 1000, max_bytes=args.max_bytes or 1_000_000,
+                max_wait=args.max_wait, poll_interval=args.poll_interval, workers=args.workers
+            )
+            scheduler.run()
+            return
+
+        success = self.blockchain.mine_pending_transactions(
+            workers=args.workers, max_transactions=args.max_tx, max_bytes=args.max_bytes)
+        # Dengan batas ukuran, pool besar dipecah menjadi beberapa blok
+        while success and (args.max_tx or args.max_bytes) and self.blockchain.pending_transactions:
+            success = self.blockchain.mine_pending_transactions(
+                workers=args.workers, max_transactions=args.max_tx, max_bytes=args.max_bytes)
         if success:
             print("🎉 Mining selesai! Blockchain telah diperbarui.")
     
@@ -113,10 +332,77 @@ class BlockchainCLI:
             print(f"🎓 Gelar: {result['transaction_data']['degree']}")
             print(f"📚 Jurusan: {result['transaction_data']['major']}")
             print(f"🔗 Hash Blok: {result['block_hash'][:16]}...")
+
+            if args.proof or args.proof_out:
+                proof = self.blockchain.get_inclusion_proof(args.hash, args.nim)
+                check = self.blockchain.check_inclusion_proof(proof)
+                print(f"🌳 Merkle proof: {len(proof['proof'])} hash ({'valid' if check['valid'] else check['reason']})")
+                if args.proof_out:
+                    with open(args.proof_out, "w", encoding="utf-8") as fh:
+                        json.dump(proof, fh, indent=2)
+                    print(f"📄 Proof disimpan: {args.proof_out}")
+                else:
+                    print(json.dumps(proof, indent=2))
+        elif result.get("revoked"):
+            revocation = result["revocation"]
+            print("⛔ IJAZAH TELAH DICABUT")
+            print(f"📦 Diterbitkan di Blok: #{result['block_index']}")
+            print(f"👨‍🎓 Nama: {result['transaction_data']['student_name']}")
+            print(f"🎓 Gelar: {result['transaction_data']['degree']}")
+            print(f"🚫 Dicabut di Blok: #{revocation['block_index']} ({revocation['timestamp']})")
+            print(f"💡 Alasan: {revocation['reason']}")
         else:
             print("❌ IJAZAH TIDAK TERVERIFIKASI")
             print(f"💡 Pesan: {result['message']}")
     
+    def revoke_degree(self, args):
+        """Mencabut ijazah"""
+        tx_id = self.blockchain.revoke_degree(args.hash, args.nim, args.reason)
+        print(f"✅ Pencabutan ijazah NIM {args.nim} ditambahkan ke pending transactions")
+        print(f"🆔 Transaction ID: {tx_id}")
+        print("💡 Jalankan `mine` agar pencabutan berlaku")
+
+    def verify_bulk(self, args):
+        """Verifikasi massal dari file"""
+        from app.bulk_verify import verify_file
+
+        try:
+            result = verify_file(self.blockchain, args.file, args.output, fmt=args.format,
+                                 progress=ProgressReporter(label="terverifikasi"))
+        except FileNotFoundError:
+            print(f"❌ File tidak ditemukan: {args.file}")
+            return
+        print(f"✅ {result['verified']} terverifikasi, {result['not_verified']} tidak terverifikasi")
+        print(f"⚡ {result['rows_per_sec']:,.0f} rows/sec")
+        print(f"📄 Hasil: {args.output}")
+
+    def verify_proof(self, args):
+        """Memeriksa Merkle inclusion proof dari file"""
+        with open(args.file, "r", encoding="utf-8") as fh:
+            proof = json.load(fh)
+
+        if args.block_hash:
+            result = verify_inclusion_proof(proof, args.block_hash)
+        else:
+            result = self.blockchain.check_inclusion_proof(proof)
+        if result["valid"]:
+            tx = proof["transaction"]
+            print("✅ PROOF VALID")
+            print(f"👨‍🎓 NIM: {tx['student_nim']} - {tx['student_name']}")
+            print(f"🔐 Document Hash: {tx['document_hash'][:16]}...")
+            print(f"📦 Blok: #{proof['block']['index']} ({proof['block']['hash'][:16]}...)")
+        else:
+            print("❌ PROOF TIDAK VALID")
+            print(f"💡 Pesan: {result['reason']}")
+
+    def migrate_chain(self):
+        """Migrasi blok format lama ke format Merkle"""
+        count = self.blockchain.upgrade_chain_format()
+        if count:
+            print(f"✅ {count} blok dimigrasi. Hash blok berubah; bagikan ulang hash/QR yang lama.")
+        else:
+            print("✅ Semua blok sudah menggunakan format terbaru")
+
     def get_student_info(self, args):
         """Mendapatkan info mahasiswa"""
         degrees = self.blockchain.get_student_degrees(args.nim)
@@ -128,12 +414,72 @@ class BlockchainCLI:
         print(f"📚 Daftar Ijazah untuk NIM {args.nim}:")
         for i, degree in enumerate(degrees, 1):
             data = degree['degree_data']
-            print(f"\n{i}. {data['degree']} - {data['major']}")
+            print(f"\n{i}. {data['degree']} - {data['major']}{' (DICABUT)' if degree['revoked'] else ''}")
             print(f"   📊 GPA: {data['gpa']}")
             print(f"   🎓 Tanggal Lulus: {data['graduation_date']}")
             print(f"   📦 Blok: #{degree['block_index']}")
             print(f"   🔐 Hash: {data['document_hash'][:16]}...")
     
+    def search(self, args):
+        """Mencari ijazah lewat inverted index"""
+        page = max(args.page, 1)
+        page_size = max(args.page_size, 1)
+        started = time.perf_counter()
+        found = self.blockchain.search_degrees(
+            name=args.name, major=args.major, degree=args.degree,
+            graduated_from=args.graduated_from, graduated_to=args.graduated_to,
+            offset=(page - 1) * page_size, limit=page_size
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if args.json:
+            print(json.dumps(found, indent=2))
+            return
+
+        if not found["total"]:
+            print("❌ Tidak ada ijazah yang cocok")
+            return
+
+        print(f"🔎 {found['total']} ijazah ditemukan ({elapsed_ms:.1f} ms), halaman {page}:")
+        for i, degree in enumerate(found["results"], found["offset"] + 1):
+            data = degree['degree_data']
+            print(f"\n{i}. {data['student_name']} ({data['student_nim']}){' — DICABUT' if degree['revoked'] else ''}")
+            print(f"   🎓 {data['degree']} - {data['major']}, lulus {data['graduation_date']}")
+            print(f"   📦 Blok: #{degree['block_index']}")
+            print(f"   🔐 Hash: {data['document_hash'][:16]}...")
+        if found["offset"] + len(found["results"]) < found["total"]:
+            print(f"\n➡️  Halaman berikutnya: --page {page + 1}")
+
+    def report(self, args):
+        """Laporan analitik angkatan dari proyeksi kolom transaksi ijazah"""
+        try:
+            from app.report import cohort_report, format_report, load_projection, report_to_csv
+        except ImportError:
+            print("❌ Perintah report membutuhkan NumPy: pip install -r requirements.txt")
+            return
+
+        started = time.perf_counter()
+        projection = load_projection(self.blockchain)
+        loaded = time.perf_counter()
+        report = cohort_report(projection, by=args.by, period=args.period, major=args.major,
+                               year_from=args.year_from, year_to=args.year_to)
+        elapsed_ms = (time.perf_counter() - loaded) * 1000
+
+        if args.format == "json":
+            text = json.dumps(report, indent=2)
+        elif args.format == "csv":
+            text = report_to_csv(report)
+        else:
+            text = format_report(report)
+
+        if args.output:
+            with open(args.output, "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+            print(f"✅ Laporan ({report['records']} ijazah) ditulis ke {args.output}")
+        else:
+            print(text)
+        if args.format == "table" or args.output:
+            print(f"⏱️  Proyeksi dimuat dalam {loaded - started:.2f} detik, laporan dihitung dalam {elapsed_ms:.1f} ms")
+
     def show_info(self):
         """Menampilkan info blockchain"""
         info = self.blockchain.get_blockchain_info()
@@ -142,24 +488,52 @@ class BlockchainCLI:
         print(f"📦 Total Blok: {info['total_blocks']}")
         print(f"📋 Total Transaksi: {info['total_transactions']}")
         print(f"🎓 Transaksi Ijazah: {info['degree_transactions']}")
+        if info["revoked_degrees"]:
+            print(f"🚫 Ijazah Dicabut: {info['revoked_degrees']}")
+        if info["degrees_by_major"]:
+            top_majors = sorted(info["degrees_by_major"].items(), key=lambda item: -item[1])[:5]
+            print(f"📚 Jurusan Terbanyak: {', '.join(f'{major} ({count})' for major, count in top_majors)}")
         print(f"⏳ Pending Transactions: {info['pending_transactions']}")
-        print(f"⚙️  Difficulty: {info['difficulty']}")
+        print(f"⚙️  Difficulty: {info['difficulty']} (blok berikutnya: {info['next_difficulty']})")
         print(f"🔗 Hash Terakhir: {info['chain_hash'][:16]}...")
     
-    def validate_chain(self):
+    def validate_chain(self, args):
         """Validasi blockchain"""
+        workers = args.workers or os.cpu_count() or 1
+        report = self.blockchain.validate(full=args.full, workers=workers)
+
+        if args.json:
+            print(json.dumps(report, indent=2))
+            return
+
         print("🔍 Memvalidasi blockchain...")
-        is_valid = self.blockchain.is_chain_valid()
-        
-        if is_valid:
+        if report["checked_from"] < report["height"]:
+            print(f"📦 Blok dicek: #{report['checked_from']} - #{report['height'] - 1}")
+        else:
+            print("📌 Tidak ada blok baru sejak checkpoint terakhir (gunakan --full untuk cek ulang semua)")
+        if not report["aggregates"]["consistent"]:
+            fields = ", ".join(report["aggregates"]["mismatched_fields"])
+            print(f"⚠️  Statistik chain tidak konsisten ({fields}); sudah dihitung ulang")
+        if report["valid"]:
             print("✅ Blockchain valid dan aman!")
         else:
+            print(f"❌ {report['message']}")
             print("❌ Blockchain tidak valid!")
     
-    def display_chain(self, detailed=False):
+    def display_chain(self, args):
         """Menampilkan blockchain"""
         print("📚 MENAMPILKAN BLOCKCHAIN")
-        self.blockchain.display_chain(detailed)
+        self.blockchain.display_chain(args.detailed, limit=args.limit, page_size=args.page_size,
+                                      **self._range_kwargs(args))
+
+    def export_chain(self, args):
+        """Export blok dan transaksi ke file"""
+        from app.export import export_chain
+
+        result = export_chain(self.blockchain, args.output, fmt=args.format,
+                              progress=ProgressReporter(label="transaksi diekspor"),
+                              **self._range_kwargs(args))
+        print(f"✅ {result['blocks']} blok, {result['transactions']} transaksi diekspor ke {args.output} ({result['format']})")
     
     def generate_qr_code(self, args):
         """Generate QR code untuk verifikasi"""
@@ -170,6 +544,9 @@ class BlockchainCLI:
         
         # Ambil ijazah terbaru
         latest_degree = degrees[-1]
+        if latest_degree["revoked"]:
+            print(f"❌ Ijazah terbaru NIM {args.nim} telah dicabut; QR Code tidak dibuat")
+            return
         student_data = {
             "nim": args.nim,
             "transaction_id": latest_degree['degree_data']['transaction_id'],
@@ -179,19 +556,172 @@ class BlockchainCLI:
         filename = generate_verification_qr(student_data)
         print(f"✅ QR Code untuk NIM {args.nim} berhasil dibuat: {filename}")
 
+    def generate_qr_bulk(self, args):
+        """Generate QR code verifikasi untuk banyak mahasiswa ke satu arsip"""
+        from app.qr_batch import generate_qr_archive, select_degrees
+
+        nims = None
+        if args.nims or args.nim_file:
+            nims = [nim.strip() for nim in (args.nims or "").split(",") if nim.strip()]
+            if args.nim_file:
+                with open(args.nim_file, "r", encoding="utf-8") as fh:
+                    nims.extend(line.strip() for line in fh if line.strip())
+
+        degrees = select_degrees(self.blockchain, args.from_block, args.to_block, args.major, nims)
+        if not degrees:
+            print("❌ Tidak ada ijazah yang cocok dengan filter")
+            return
+
+        print(f"🖨️  Membuat QR untuk {len(degrees)} mahasiswa...")
+        result = generate_qr_archive(degrees, args.output, workers=args.workers,
+                                     progress=ProgressReporter(label="QR dibuat"))
+        print(f"✅ {result['generated']} QR code ditulis ke {args.output}")
+        print(f"⚡ {result['per_sec']:,.0f} QR/sec")
+
+    def configure_difficulty(self, args):
+        """Menampilkan atau mengubah konfigurasi retarget difficulty"""
+        from app.difficulty import RETARGET_INTERVAL
+
+        control = self.blockchain.difficulty_control
+        if any(value is not None for value in (args.target_block_time, args.min_difficulty,
+                                                args.max_difficulty)) or args.disable:
+            control.configure(args.target_block_time, args.min_difficulty, args.max_difficulty,
+                              disable=args.disable)
+            print("✅ Konfigurasi retarget disimpan")
+
+        rate = control.hash_rate()
+        next_difficulty = self.blockchain.next_difficulty()
+        expected = control.expected_block_time(next_difficulty)
+        print("⚙️  DIFFICULTY")
+        print(f"📦 Difficulty ujung chain: {self.blockchain.current_difficulty}")
+        print(f"⏭️  Difficulty blok berikutnya: {next_difficulty}")
+        if control.target_block_time is None:
+            print("🎯 Retarget: nonaktif (gunakan --target-block-time untuk mengaktifkan)")
+        else:
+            print(f"🎯 Target waktu blok: {control.target_block_time:g} detik, retarget setiap {RETARGET_INTERVAL} blok "
+                  f"(difficulty {control.min_difficulty}-{control.max_difficulty})")
+        if rate:
+            print(f"⚡ Hash rate terukur: {rate:,.0f} hashes/sec ({len(control.samples)} blok terakhir)")
+            print(f"⏱️  Perkiraan waktu mining blok berikutnya: {expected:.2f} detik")
+        else:
+            print("⚡ Hash rate belum terukur (tambang minimal satu blok)")
+
+    def snapshot(self, args):
+        """Menampilkan atau membuat snapshot state"""
+        if args.create:
+            created = self.blockchain.take_snapshot()
+            print(f"📸 Snapshot dibuat untuk blok #0 - #{created.height - 1}")
+
+        snapshots = self.blockchain.snapshots.list()
+        if not snapshots:
+            print("📭 Belum ada snapshot (dibuat otomatis setiap "
+                  f"{self.blockchain.snapshots.interval} blok, atau gunakan --create)")
+            return
+        print("📸 SNAPSHOT")
+        for snapshot in snapshots:
+            try:
+                snapshot.verify()
+                status = "✅ valid" if snapshot.matches(self.blockchain.chain) else "⚠️  tidak cocok dengan chain"
+            except (OSError, ValueError, KeyError) as e:
+                status = f"❌ {e}"
+            size = os.path.getsize(snapshot.path) / 1024
+            print(f"   #{snapshot.height - 1:<8} {snapshot.header.get('created', '')[:19]}  "
+                  f"{size:,.1f} KB  {status}")
+
+    def sync_sql(self, rebuild: bool = False):
+        """Sinkronkan read model SQLite dengan chain"""
+        result = self.blockchain.sync_sql(rebuild=rebuild,
+                                          progress=ProgressReporter(label="transaksi ditulis"))
+        if result["removed_blocks"]:
+            print(f"⚠️  Ujung read model tidak cocok dengan chain: {result['removed_blocks']} blok dihapus dan ditulis ulang")
+        rate = result["transactions"] / max(result["seconds"], 1e-9)
+        print(f"✅ Read model SQL {self.blockchain.sql.path}: {result['added_blocks']} blok, "
+              f"{result['transactions']} transaksi ditulis ({result['seconds']:.2f} detik, {rate:,.0f} tx/detik); "
+              f"tinggi {result['height']}")
+
+    def recover(self):
+        """Memulihkan journal pending yang rusak"""
+        report = UniversityBlockchain.recover()
+        source = (f"snapshot blok #{report['snapshot_height'] - 1}"
+                  if report["snapshot_height"] else "record journal yang masih terbaca")
+        print(f"🩹 Journal dipulihkan dari {source}")
+        print(f"⏳ Pending transactions: {report['pending']} ({report['skipped_records']} baris rusak dilewati)")
+
+    def show_stats(self, args):
+        """Menampilkan metrik performa yang terekam"""
+        if args.reset:
+            if os.path.exists(METRICS_PATH):
+                os.remove(METRICS_PATH)
+            print("🧹 Metrik dihapus")
+            return
+
+        registry = MetricsRegistry()
+        registry.merge_dict(load_metrics_file(METRICS_PATH))
+        if args.prometheus:
+            with open(args.prometheus, "w", encoding="utf-8") as fh:
+                fh.write(registry.to_prometheus())
+            print(f"✅ Metrik Prometheus ditulis ke {args.prometheus}")
+            return
+        if args.json:
+            print(json.dumps(registry.to_dict(), indent=2))
+            return
+
+        if not registry.counters and not registry.gauges and not registry.histograms:
+            print("📭 Belum ada metrik. Jalankan command dengan --metrics (atau BLOCKCERT_METRICS=1).")
+            return
+
+        def label(key):
+            name, labels = key
+            return name + ("{" + ",".join(f"{k}={v}" for k, v in labels) + "}" if labels else "")
+
+        print("📈 METRIK PERFORMA")
+        for key, value in sorted(registry.counters.items()):
+            print(f"   {label(key):<45} {value:>14,.0f}")
+        for key, value in sorted(registry.gauges.items()):
+            print(f"   {label(key):<45} {value:>14,.2f}")
+        for key, histogram in sorted(registry.histograms.items()):
+            mean_ms = histogram.sum / histogram.count * 1000 if histogram.count else 0.0
+            print(f"   {label(key):<45} n={histogram.count:<8} mean {mean_ms:>9.3f} ms"
+                  f"  p95 <= {histogram.quantile(0.95) * 1000:g} ms")
+
+    def sync_peer(self, args):
+        """Sinkronisasi chain dari peer"""
+        from app.sync import PeerSync
+
+        sync = PeerSync(self.blockchain, args.peer, workers=args.workers, range_size=args.range_size)
+        if args.follow:
+            print(f"🛰️  Mengikuti {args.peer} setiap {args.interval:g} detik (Ctrl+C untuk berhenti)")
+            sync.follow(args.interval)
+            return
+        added = sync.sync()
+        if added:
+            print(f"✅ {added} blok disinkronkan, tinggi chain {len(self.blockchain.chain)} blok")
+        else:
+            print(f"✅ Chain sudah sama dengan peer ({len(self.blockchain.chain)} blok)")
+
+    def serve(self, args):
+        """Menjalankan server verifikasi HTTP"""
+        from app.server import run_server
+        run_server(self.blockchain, args.host, args.port,
+                   cache_size=args.cache_size, refresh_interval=args.refresh_interval)
+
     def add_bulk(self, args):
-        """Add many students from a JSON file."""
+        """Add many students from a JSON array, NDJSON or CSV file."""
         file_path = args.file
         try:
-            with open(file_path, "r", encoding="utf-8") as fh:
-                data = json.load(fh)
-
-            if not isinstance(data, list):
-                print("❌ File harus berisi array JSON dari objek mahasiswa")
-                return
+            result = ingest_file(
+                self.blockchain, file_path, fmt=args.format, chunk_size=args.chunk_size,
+                error_report=args.errors, progress=ProgressReporter()
+            )
 
-            tx_ids = self.blockchain.add_bulk_transactions(data)
-            print(f"✅ Berhasil menambahkan {len(tx_ids)} transaksi (pending).")
+            print(f"✅ Berhasil menambahkan {result['added']} transaksi (pending).")
+            if result["errors"]:
+                print(f"⚠️  {len(result['errors'])} baris gagal divalidasi")
+                if args.errors:
+                    print(f"📄 Laporan error: {args.errors}")
+                else:
+                    for error in result["errors"][:10]:
+                        print(f"   ❌ Baris {error['row']} ({error['nim']}): {error['error']}")
         except FileNotFoundError:
             print(f"❌ File tidak ditemukan: {file_path}")
         except json.JSONDecodeError as e:
@@ -199,7 +729,6 @@ class BlockchainCLI:
         except Exception as e:
             print(f"❌ Error saat menambahkan bulk: {e}")
 
-
 def main():
     cli = BlockchainCLI()
     cli.run()
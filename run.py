@@ -9,17 +9,16 @@ import os
 # Add current directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from blockchain.main import demo_system
-from blockchain.cli import BlockchainCLI
-
 
 def main():
     if len(sys.argv) > 1:
         # Run CLI mode
+        from blockchain.cli import BlockchainCLI
         cli = BlockchainCLI()
         cli.run()
     else:
         # Run demo mode
+        from blockchain.main import demo_system
         demo_system()
         print("\n" + "="*50)
         print("Gunakan 'python run.py --help' untuk melihat command yang tersedia")
@@ -0,0 +1,62 @@
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import UniversityBlockchain  # noqa: E402
+
+
+def student(nim: str, name: str = "Anna Wijaya", major: str = "Teknik Informatika",
+            graduation_date: str = "2024-06-15", gpa: str = "3.75") -> dict:
+    return {
+        "nim": nim,
+        "name": name,
+        "degree": "Sarjana Komputer",
+        "major": major,
+        "gpa": gpa,
+        "graduation_date": graduation_date,
+    }
+
+
+def mine_students(blockchain, count: int, first: int = 0):
+    """Tambang `count` blok, masing-masing berisi satu ijazah (NIM 2021xxxx)"""
+    for i in range(first, first + count):
+        blockchain.add_degree_transaction(student(f"2021{i:04d}", name=f"Mahasiswa {i}"))
+        blockchain.mine_pending_transactions(quiet=True)
+
+
+@pytest.fixture
+def make_chain(tmp_path):
+    """Buat UniversityBlockchain di direktori sementara (difficulty rendah agar cepat)"""
+    def make(name: str = "node", difficulty: int = 1) -> UniversityBlockchain:
+        return UniversityBlockchain(difficulty=difficulty, data_dir=str(tmp_path / name))
+    return make
+
+
+@pytest.fixture
+def serve():
+    """Jalankan VerificationServer di localhost (port acak) pada thread terpisah"""
+    from app.server import VerificationServer
+
+    started = []
+
+    def start(blockchain, **kwargs) -> VerificationServer:
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        server = VerificationServer(blockchain, "127.0.0.1", 0, **{"refresh_interval": 0.05, **kwargs})
+        asyncio.run_coroutine_threadsafe(server.start(), loop).result(timeout=10)
+        started.append((loop, thread, server))
+        server.url = f"http://127.0.0.1:{server.port}"
+        return server
+
+    yield start
+
+    for loop, thread, server in started:
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result(timeout=10)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=10)
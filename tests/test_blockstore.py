@@ -0,0 +1,112 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from app.blockstore import BlockStore, LazyChain, block_hash_at, decode_block, encode_block, header_at
+from app.models import BLOCK_VERSION_LEGACY, Block, Transaction
+
+
+def _transaction(i: int, reason=None) -> Transaction:
+    return Transaction(
+        transaction_type="degree_revocation" if reason else "degree_issuance", student_nim=f"2021{i:04d}",
+        student_name=f"Mahasiswa {i} Ünïcode", degree="Sarjana Komputer", major="Teknik Informatika",
+        gpa="3.50", graduation_date="2024-06-15", document_hash=f"{i:064x}", issuer="University Registrar",
+        timestamp=datetime.now(), reason=reason
+    )
+
+
+def _chain(length: int, per_block: int = 3):
+    chain = [Block(index=0, transactions=[_transaction(0)], timestamp=datetime.now(), previous_hash="0" * 64,
+                   version=BLOCK_VERSION_LEGACY)]
+    for i in range(1, length):
+        txs = [_transaction(i * 10 + j, reason="Salah cetak" if j == 1 else None) for j in range(per_block)]
+        chain.append(Block(index=i, transactions=txs, timestamp=datetime.now(), previous_hash=chain[-1].hash,
+                           nonce=i * 7, difficulty=2))
+    return chain
+
+
+def _same(a: Block, b: Block):
+    assert a.to_dict() == b.to_dict()
+    assert a.calculate_hash() == b.calculate_hash()
+
+
+def test_encode_decode_round_trip():
+    for block in _chain(3):
+        _same(decode_block(encode_block(block)), block)
+
+
+def test_store_round_trip_across_segments(tmp_path):
+    chain = _chain(12)
+    store = BlockStore(str(tmp_path / "blocks"), segment_size=2048)
+    for block in chain:
+        store.append(block, fsync=False)
+    store.close()
+
+    reopened = BlockStore(str(tmp_path / "blocks"), segment_size=2048)
+    assert len(reopened.segments) > 1
+    assert len(reopened) == len(chain)
+    for i, block in enumerate(chain):
+        _same(reopened.read_block(i), block)
+        assert reopened.read_header(i).hash == block.hash
+        assert reopened.read_header(i).difficulty == block.difficulty
+        for position, tx in enumerate(block.transactions):
+            assert reopened.read_transaction(i, position).to_dict() == tx.to_dict()
+
+    with pytest.raises(IndexError):
+        reopened.read_block(len(chain))
+    with pytest.raises(ValueError):
+        reopened.append(chain[3])
+
+
+def test_torn_append_is_repaired(tmp_path):
+    directory = str(tmp_path / "blocks")
+    chain = _chain(3)
+    store = BlockStore(directory)
+    for block in chain:
+        store.append(block, fsync=False)
+    store.close()
+    dat = os.path.join(directory, "blk00000.dat")
+    size = os.path.getsize(dat)
+    with open(dat, "ab") as f:
+        # Crash setelah sebagian record ditulis, sebelum entri .idx
+        f.write(encode_block(chain[-1])[:40])
+
+    reader = BlockStore(directory, repair=False)
+    assert len(reader) == 3 and os.path.getsize(dat) > size
+    assert len(BlockStore(directory)) == 3
+    assert os.path.getsize(dat) == size
+
+
+def test_lazy_chain_decodes_on_access_with_bounded_cache(tmp_path):
+    chain = _chain(10)
+    store = BlockStore(str(tmp_path / "blocks"))
+    for block in chain:
+        store.append(block, fsync=False)
+    lazy = LazyChain(store, cache_size=2)
+
+    assert len(lazy) == 10
+    _same(lazy[-1], chain[-1])
+    assert [b.hash for b in lazy[2:5]] == [b.hash for b in chain[2:5]]
+    assert len(lazy._cache) == 2
+    assert [b.hash for b in lazy] == [b.hash for b in chain]
+    assert len(lazy._cache) == 2
+    assert lazy.transaction(4, 2).to_dict() == chain[4].transactions[2].to_dict()
+    assert header_at(lazy, 6).previous_hash == chain[5].hash
+    assert block_hash_at(lazy, -1) == chain[-1].hash
+
+
+def test_refresh_sees_blocks_appended_by_another_writer(tmp_path):
+    directory = str(tmp_path / "blocks")
+    chain = _chain(4)
+    writer = BlockStore(directory)
+    writer.append(chain[0], fsync=False)
+    reader = BlockStore(directory, repair=False)
+    lazy = LazyChain(reader)
+    assert len(lazy) == 1
+
+    for block in chain[1:]:
+        writer.append(block, fsync=False)
+
+    assert reader.refresh() == 3
+    assert lazy[3].hash == chain[3].hash
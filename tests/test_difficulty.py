@@ -0,0 +1,72 @@
+from datetime import datetime
+
+import pytest
+
+from app.difficulty import RETARGET_INTERVAL, check_difficulty_step
+from app.mining import mine_block
+from app.models import Block, Transaction
+from app.sync import PeerSync, SyncError
+from app.validation import REASON_DIFFICULTY, validate_chain
+
+
+def _transaction(i: int) -> Transaction:
+    return Transaction(
+        transaction_type="degree_issuance", student_nim=f"2021{i:04d}", student_name=f"Mahasiswa {i}",
+        degree="Sarjana Komputer", major="Teknik Informatika", gpa="3.50", graduation_date="2024-06-15",
+        document_hash=f"{i:064x}", issuer="University Registrar", timestamp=datetime.now()
+    )
+
+
+def _chain(difficulties):
+    """Genesis dengan difficulty pertama, lalu satu blok tertambang per difficulty berikutnya"""
+    chain = [Block(index=0, transactions=[_transaction(0)], timestamp=datetime.now(),
+                   previous_hash="0" * 64, difficulty=difficulties[0])]
+    for i, difficulty in enumerate(difficulties[1:], 1):
+        block = Block(index=i, transactions=[_transaction(i)], timestamp=datetime.now(),
+                      previous_hash=chain[-1].hash, difficulty=difficulty)
+        result = mine_block(block, difficulty)
+        block.nonce, block.hash = result.nonce, result.hash
+        chain.append(block)
+    return chain
+
+
+def test_step_rule():
+    assert check_difficulty_step(2, 2, 5)
+    assert not check_difficulty_step(2, 1, 5)
+    assert check_difficulty_step(2, 1, RETARGET_INTERVAL)
+    assert check_difficulty_step(2, 3, 2 * RETARGET_INTERVAL)
+    assert not check_difficulty_step(2, 4, RETARGET_INTERVAL)
+    assert not check_difficulty_step(1, 0, RETARGET_INTERVAL)
+    # Blok #1 setelah genesis tanpa difficulty dicek terhadap difficulty awal
+    assert check_difficulty_step(None, 2, 1, start=2)
+    assert not check_difficulty_step(None, 1, 1, start=2)
+
+
+def test_difficulty_drop_between_retargets_is_invalid():
+    chain = _chain([2, 2, 2, 1, 1])
+
+    report = validate_chain(chain, 2)
+
+    assert not report["valid"]
+    assert report["invalid_block"] == 3
+    assert report["reason"] == REASON_DIFFICULTY
+
+
+def test_retarget_height_may_change_one_step():
+    difficulties = [2] * RETARGET_INTERVAL + [1, 1]
+    assert validate_chain(_chain(difficulties), 2)["valid"]
+
+    difficulties = [2] * (RETARGET_INTERVAL - 1) + [1, 1, 1]
+    assert not validate_chain(_chain(difficulties), 2)["valid"]
+
+
+def test_peer_serving_a_difficulty_drop_is_rejected(make_chain, serve):
+    source = make_chain("source", difficulty=2)
+    forged = _chain([2, 2, 1, 1])
+    source.append_blocks(forged, replace=True)
+    server = serve(source)
+
+    node = make_chain("node", difficulty=2)
+    with pytest.raises(SyncError):
+        PeerSync(node, server.url, out=lambda line: None).sync()
+    assert len(node.chain) == 1
@@ -0,0 +1,26 @@
+import json
+from datetime import datetime
+
+from app.export import export_chain
+from app.models import Block
+from conftest import mine_students
+
+
+def test_jsonl_block_records_are_enough_to_recompute_block_hash(make_chain, tmp_path):
+    blockchain = make_chain(difficulty=2)
+    mine_students(blockchain, 3)
+    path = tmp_path / "chain.jsonl"
+
+    result = export_chain(blockchain, str(path))
+
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    blocks = [record for record in records if record["type"] == "block"]
+    assert result["blocks"] == len(blocks) == len(blockchain.chain)
+    for record in blocks:
+        assert record["difficulty"] == blockchain.chain[record["index"]].difficulty
+        block = Block(index=record["index"], transactions=[],
+                      timestamp=datetime.fromisoformat(record["timestamp"]),
+                      previous_hash=record["previous_hash"], nonce=record["nonce"],
+                      version=record["version"], merkle_root=record["merkle_root"],
+                      difficulty=record["difficulty"])
+        assert block.hash == record["hash"]
@@ -0,0 +1,88 @@
+import threading
+import time
+
+import pytest
+
+from app.metrics import METRICS
+from app.storage import JournalStorage
+from conftest import student
+
+
+@pytest.fixture
+def metrics():
+    enabled = METRICS.enabled
+    METRICS.enable()
+    METRICS.reset()
+    yield METRICS
+    METRICS.enabled = enabled
+    METRICS.reset()
+
+
+def test_concurrent_adds_share_commits_under_the_file_lock(make_chain, metrics, monkeypatch):
+    blockchain = make_chain()
+    storage = blockchain.storage
+    writes_outside_lock = []
+    journal_handle = JournalStorage._journal_handle
+    sync = JournalStorage._sync
+
+    def checked_handle(self):
+        if storage.lock._depth == 0:
+            writes_outside_lock.append(True)
+        return journal_handle(self)
+
+    def slow_sync(self, fileno, force=False):
+        # fsync lambat: thread lain sempat mengantre di batch berikutnya
+        time.sleep(0.02)
+        sync(self, fileno, force)
+
+    monkeypatch.setattr(JournalStorage, "_journal_handle", checked_handle)
+    monkeypatch.setattr(JournalStorage, "_sync", slow_sync)
+
+    threads = [threading.Thread(target=blockchain.add_degree_transaction, args=(student(f"2021{i:04d}"),))
+               for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    commits = metrics.counters[("journal_commits_total", ())]
+    writers = metrics.counters[("journal_commit_writers_total", ())]
+    assert writers == 16
+    assert commits < writers
+    assert not writes_outside_lock
+
+    nims = sorted(tx.student_nim for tx in blockchain.pending_transactions)
+    assert nims == [f"2021{i:04d}" for i in range(16)]
+    reopened = make_chain()
+    assert sorted(tx.student_nim for tx in reopened.pending_transactions) == nims
+
+
+def test_failed_write_leaves_pending_pool_unchanged(make_chain, monkeypatch):
+    blockchain = make_chain()
+    blockchain.add_degree_transaction(student("20210001"))
+
+    def broken_write(self, batch):
+        raise OSError("disk penuh")
+
+    monkeypatch.setattr(JournalStorage, "_write_batch", broken_write)
+    assert blockchain.add_degree_transaction(student("20210002")) == ""
+    assert [tx.student_nim for tx in blockchain.pending_transactions] == ["20210001"]
+    assert not blockchain._persisting
+    monkeypatch.undo()
+
+    assert [tx.student_nim for tx in make_chain().pending_transactions] == ["20210001"]
+
+
+def test_reload_does_not_duplicate_a_transaction_being_written(make_chain, monkeypatch):
+    blockchain = make_chain()
+    append = JournalStorage.append_transactions
+
+    def append_then_reload(self, transactions):
+        append(self, transactions)
+        # Scheduler memuat ulang pool tepat setelah journal ditulis
+        blockchain.reload_pending()
+
+    monkeypatch.setattr(JournalStorage, "append_transactions", append_then_reload)
+    blockchain.add_degree_transaction(student("20210001"))
+
+    assert [tx.student_nim for tx in blockchain.pending_transactions] == ["20210001"]
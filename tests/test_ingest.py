@@ -0,0 +1,58 @@
+import json
+
+from app.ingest import InvalidRecord, ingest_file, iter_json_array, iter_ndjson
+from conftest import student
+
+
+def test_ndjson_bad_lines_become_markers(tmp_path):
+    path = tmp_path / "students.ndjson"
+    path.write_text("\n".join([json.dumps(student("20210001")), "{bad json", "[1, 2]", ""]), encoding="utf-8")
+
+    records = list(iter_ndjson(str(path)))
+
+    assert records[0]["nim"] == "20210001"
+    assert isinstance(records[1], InvalidRecord)
+    assert "baris 2" in str(records[1])
+    assert isinstance(records[2], InvalidRecord)
+    assert len(records) == 3
+
+
+def test_json_array_non_objects_and_truncation(tmp_path):
+    path = tmp_path / "students.json"
+    path.write_text('[%s, 5, {"nim":' % json.dumps(student("20210001")), encoding="utf-8")
+
+    records = list(iter_json_array(str(path)))
+
+    assert records[0]["nim"] == "20210001"
+    assert [isinstance(record, InvalidRecord) for record in records] == [False, True, True]
+
+
+def test_bad_rows_are_reported_and_valid_rows_kept(make_chain, tmp_path):
+    path = tmp_path / "students.ndjson"
+    lines = [json.dumps(student("20210001")), "{bad json", "7", json.dumps(student("123")),
+             json.dumps(student("20210002"))]
+    path.write_text("\n".join(lines), encoding="utf-8")
+    report = tmp_path / "errors.csv"
+    blockchain = make_chain()
+
+    result = ingest_file(blockchain, str(path), chunk_size=10, error_report=str(report))
+
+    assert result["added"] == 2
+    assert [(error["row"], error["nim"]) for error in result["errors"]] == [(2, ""), (3, ""), (4, "123")]
+    assert report.read_text(encoding="utf-8").count("\n") == 4
+    assert len(make_chain().pending_transactions) == 2
+
+
+def test_buffered_rows_survive_input_failure(make_chain):
+    def rows():
+        yield student("20210001")
+        yield student("20210002")
+        raise OSError("disk hilang")
+
+    blockchain = make_chain()
+    try:
+        blockchain.add_bulk_transactions(rows(), chunk_size=100, errors=[])
+    except OSError:
+        pass
+
+    assert len(make_chain().pending_transactions) == 2
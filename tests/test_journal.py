@@ -0,0 +1,49 @@
+import json
+import os
+
+from conftest import mine_students, student
+
+
+def _state(blockchain):
+    return ([block.hash for block in blockchain.chain],
+            sorted(tx.transaction_id for tx in blockchain.pending_transactions))
+
+
+def test_reopened_chain_replays_blocks_and_pending_pool(make_chain):
+    blockchain = make_chain()
+    mine_students(blockchain, 3)
+    blockchain.add_degree_transaction(student("20219998"))
+    blockchain.add_bulk_transactions([student("20219999")])
+
+    reopened = make_chain()
+
+    assert _state(reopened) == _state(blockchain)
+    assert len(reopened.pending_transactions) == 2
+    assert reopened.get_student_degrees("20210002")[0]["block_index"] == 3
+
+
+def test_mining_compacts_journal_to_remaining_pending(make_chain):
+    blockchain = make_chain()
+    blockchain.add_degree_transaction(student("20210001"))
+    blockchain.mine_pending_transactions(quiet=True)
+    blockchain.add_degree_transaction(student("20210002"))
+
+    with open(blockchain.journal_file, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+
+    assert [record["tx"]["student_nim"] for record in records if record["op"] == "tx"] == ["20210002"]
+    assert _state(make_chain()) == _state(blockchain)
+
+
+def test_torn_last_record_is_dropped_on_replay(make_chain):
+    blockchain = make_chain()
+    blockchain.add_degree_transaction(student("20210001"))
+    size = os.path.getsize(blockchain.journal_file)
+    with open(blockchain.journal_file, "a", encoding="utf-8") as f:
+        # Crash di tengah penulisan record
+        f.write('{"op": "tx", "tx": {"student_nim": "2021')
+
+    reopened = make_chain()
+
+    assert _state(reopened) == _state(blockchain)
+    assert os.path.getsize(blockchain.journal_file) == size
@@ -0,0 +1,79 @@
+import os
+import pickle
+from datetime import datetime
+
+from app.core import UniversityBlockchain
+from app.mining import mine_block
+from app.models import BLOCK_VERSION_LEGACY, BLOCK_VERSION_MERKLE, Block, Transaction
+
+
+def _transaction(i: int) -> Transaction:
+    return Transaction(
+        transaction_type="degree_issuance", student_nim=f"2021{i:04d}", student_name=f"Mahasiswa {i}",
+        degree="Sarjana Komputer", major="Teknik Informatika", gpa="3.50", graduation_date="2024-06-15",
+        document_hash=f"{i:064x}", issuer="University Registrar", timestamp=datetime.now()
+    )
+
+
+def _legacy_chain(blocks: int, difficulty: int):
+    """Chain format v1 tanpa difficulty tercatat, seperti pickle versi lama"""
+    chain = [Block(index=0, transactions=[_transaction(0)], timestamp=datetime.now(),
+                   previous_hash="0" * 64, version=BLOCK_VERSION_LEGACY)]
+    for i in range(1, blocks):
+        block = Block(index=i, transactions=[_transaction(i)], timestamp=datetime.now(),
+                      previous_hash=chain[-1].hash, version=BLOCK_VERSION_LEGACY)
+        result = mine_block(block, difficulty)
+        block.nonce, block.hash = result.nonce, result.hash
+        chain.append(block)
+    return chain
+
+
+def _write_pickle(data_dir, chain, pending=()):
+    os.makedirs(data_dir)
+    with open(os.path.join(data_dir, "blockchain_data.pkl"), "wb") as f:
+        pickle.dump({"chain": chain, "pending_transactions": list(pending)}, f)
+
+
+def test_pickle_is_migrated_to_journal_once(tmp_path):
+    data_dir = str(tmp_path / "data")
+    chain = _legacy_chain(3, difficulty=1)
+    pending = [_transaction(10), _transaction(11)]
+    _write_pickle(data_dir, chain, pending)
+
+    blockchain = UniversityBlockchain(difficulty=1, data_dir=data_dir)
+
+    assert [block.hash for block in blockchain.chain] == [block.hash for block in chain]
+    assert [tx.transaction_id for tx in blockchain.pending_transactions] == [tx.transaction_id for tx in pending]
+    assert not os.path.exists(os.path.join(data_dir, "blockchain_data.pkl"))
+    assert os.path.exists(os.path.join(data_dir, "blockchain_data.pkl.migrated"))
+    assert os.path.exists(blockchain.journal_file)
+
+    # Dibuka ulang dari journal, bukan dari pickle
+    reopened = UniversityBlockchain(difficulty=1, data_dir=data_dir)
+    assert [block.hash for block in reopened.chain] == [block.hash for block in chain]
+    assert len(reopened.pending_transactions) == 2
+    assert reopened.get_student_degrees("20210002")[0]["block_index"] == 2
+
+
+def test_pickle_migration_records_difficulty(tmp_path):
+    data_dir = str(tmp_path / "data")
+    _write_pickle(data_dir, _legacy_chain(6, difficulty=2))
+
+    blockchain = UniversityBlockchain(difficulty=3, data_dir=data_dir)
+
+    assert all(block.difficulty is not None for block in blockchain.chain)
+    assert blockchain.validate(full=True)["valid"]
+    # Tetap valid setelah dibuka ulang dengan konfigurasi difficulty lain
+    assert UniversityBlockchain(difficulty=4, data_dir=data_dir).validate(full=True)["valid"]
+
+
+def test_upgrade_chain_format_stamps_mining_difficulty(tmp_path):
+    data_dir = str(tmp_path / "data")
+    _write_pickle(data_dir, _legacy_chain(4, difficulty=2))
+    UniversityBlockchain(difficulty=2, data_dir=data_dir).upgrade_chain_format()
+
+    blockchain = UniversityBlockchain(difficulty=3, data_dir=data_dir)
+
+    assert all(block.version == BLOCK_VERSION_MERKLE for block in blockchain.chain)
+    assert all(block.difficulty is not None for block in blockchain.chain)
+    assert blockchain.validate(full=True)["valid"]
@@ -0,0 +1,52 @@
+import hashlib
+from datetime import datetime
+
+import pytest
+
+from app.mining import meets_difficulty, mine_block
+from app.models import BLOCK_VERSION_DIFFICULTY, BLOCK_VERSION_LEGACY, BLOCK_VERSION_MERKLE, Block, Transaction
+
+
+def _block(version: int, transactions: int = 5) -> Block:
+    txs = [Transaction(
+        transaction_type="degree_issuance", student_nim=f"2021{i:04d}", student_name=f"Mahasiswa {i}",
+        degree="Sarjana Komputer", major="Teknik Informatika", gpa="3.50", graduation_date="2024-06-15",
+        document_hash=f"{i:064x}", issuer="University Registrar", timestamp=datetime.now()
+    ) for i in range(transactions)]
+    return Block(index=7, transactions=txs, timestamp=datetime.now(), previous_hash="ab" * 32,
+                 version=version, difficulty=2)
+
+
+@pytest.mark.parametrize("version", [BLOCK_VERSION_LEGACY, BLOCK_VERSION_MERKLE, BLOCK_VERSION_DIFFICULTY])
+def test_midstate_hash_matches_calculate_hash(version):
+    block = _block(version)
+
+    result = mine_block(block, 2)
+
+    block.nonce = result.nonce
+    assert result.hash == block.calculate_hash()
+    assert meets_difficulty(bytes.fromhex(result.hash), 2)
+    # Nonce pertama yang memenuhi: tidak ada nonce lebih kecil yang lolos
+    assert result.attempts == result.nonce + 1
+    for nonce in range(result.nonce):
+        block.nonce = nonce
+        assert not meets_difficulty(bytes.fromhex(block.calculate_hash()), 2)
+
+
+def test_nonce_partition_and_stop():
+    block = _block(BLOCK_VERSION_DIFFICULTY)
+
+    result = mine_block(block, 2, start_nonce=1, step=3)
+    assert result.nonce % 3 == 1
+    block.nonce = result.nonce
+    assert result.hash == block.calculate_hash()
+
+    assert mine_block(block, 64, progress_every=10, should_stop=lambda: True) is None
+
+
+def test_meets_difficulty_counts_hex_digits():
+    digest = hashlib.sha256(b"x").digest()
+    assert meets_difficulty(bytes([0x00, 0x0f]) + digest[2:], 3)
+    assert not meets_difficulty(bytes([0x00, 0x10]) + digest[2:], 3)
+    assert meets_difficulty(digest, 0)
+
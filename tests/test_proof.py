@@ -0,0 +1,82 @@
+from datetime import datetime
+
+from app.core import verify_inclusion_proof
+from app.mining import meets_difficulty, mine_block
+from app.models import Block
+from app.validation import REASON_DUPLICATE_TRANSACTION, validate_chain
+from conftest import mine_students, student
+
+
+def _proof(blockchain, nim="20210001"):
+    degree = blockchain.get_student_degrees(nim)[0]["degree_data"]
+    return blockchain.get_inclusion_proof(degree["document_hash"], nim)
+
+
+def _forge(proof, difficulty, mine=True):
+    """Header buatan sendiri untuk blok yang hanya berisi transaksi di proof"""
+    header = proof["block"]
+    block = Block(index=header["index"], transactions=[], timestamp=datetime.now(),
+                  previous_hash=header["previous_hash"], version=header["version"],
+                  merkle_root=proof["transaction_hash"], difficulty=difficulty)
+    if mine:
+        result = mine_block(block, difficulty)
+        block.nonce, block.hash = result.nonce, result.hash
+    else:
+        while meets_difficulty(bytes.fromhex(block.hash), difficulty):
+            block.nonce += 1
+            block.hash = block.calculate_hash()
+    forged = dict(header, timestamp=block.timestamp.isoformat(), merkle_root=block.merkle_root,
+                  nonce=block.nonce, difficulty=difficulty, hash=block.hash)
+    return {**proof, "proof": [], "block": forged}
+
+
+def test_valid_proof_is_accepted(make_chain):
+    blockchain = make_chain(difficulty=2)
+    mine_students(blockchain, 3)
+    proof = _proof(blockchain)
+
+    assert blockchain.check_inclusion_proof(proof)["valid"]
+    assert verify_inclusion_proof(proof, blockchain.chain[proof["block"]["index"]].hash)["valid"]
+
+
+def test_header_without_proof_of_work_is_rejected(make_chain):
+    blockchain = make_chain(difficulty=2)
+    mine_students(blockchain, 2)
+    forged = _forge(_proof(blockchain), 2, mine=False)
+
+    assert not verify_inclusion_proof(forged)["valid"]
+
+
+def test_proof_for_block_not_on_chain_is_rejected(make_chain):
+    blockchain = make_chain(difficulty=2)
+    mine_students(blockchain, 2)
+    forged = _forge(_proof(blockchain), 2)
+
+    # Header palsu dengan proof-of-work lolos pemeriksaan mandiri, tetapi tidak ada di chain
+    assert verify_inclusion_proof(forged)["valid"]
+    assert not blockchain.check_inclusion_proof(forged)["valid"]
+    assert not verify_inclusion_proof(forged, blockchain.chain[1].hash)["valid"]
+
+    forged["block"]["index"] = len(blockchain.chain)
+    assert not blockchain.check_inclusion_proof(forged)["valid"]
+
+
+def test_block_with_duplicated_last_transaction_is_invalid(make_chain):
+    blockchain = make_chain()
+    mine_students(blockchain, 1)
+    for i in range(1, 4):
+        blockchain.add_degree_transaction(student(f"2021{i:04d}", name=f"Mahasiswa {i}"))
+    blockchain.mine_pending_transactions(quiet=True)
+    chain = list(blockchain.chain)
+    block = chain[-1]
+    assert len(block.transactions) == 3
+
+    # Menggandakan transaksi terakhir tidak mengubah Merkle root maupun hash blok
+    block.transactions.append(block.transactions[-1])
+    assert block.calculate_merkle_root() == block.merkle_root
+    assert block.calculate_hash() == block.hash
+
+    report = validate_chain(chain, 1)
+    assert not report["valid"]
+    assert report["invalid_block"] == block.index
+    assert report["reason"] == REASON_DUPLICATE_TRANSACTION
@@ -0,0 +1,81 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.report import PERCENTILES, cohort_report, load_projection
+from conftest import student
+
+MAJORS = ["Teknik Informatika", "Sistem Informasi", "Teknik Elektro", "Statistika"]
+
+
+@pytest.fixture
+def blockchain(make_chain):
+    rng = random.Random(7)
+    blockchain = make_chain()
+    rows = []
+    for i in range(60):
+        # Statistika hanya satu lulusan: persentil grup berisi satu nilai
+        major = MAJORS[3] if i == 0 else rng.choice(MAJORS[:3])
+        gpa = f"{rng.uniform(2.0, 4.0):.2f}"
+        year = rng.choice(["2022", "2023", "2024"])
+        blockchain.add_degree_transaction(student(f"2021{i:04d}", major=major, gpa=gpa,
+                                                  graduation_date=f"{year}-06-15"))
+        rows.append((major, float(gpa), int(year)))
+        if i % 9 == 8:
+            blockchain.mine_pending_transactions(quiet=True)
+    blockchain.mine_pending_transactions(quiet=True)
+    blockchain.rows = rows
+    return blockchain
+
+
+def _check_groups(report, rows, by):
+    groups = {row[by]: row for row in report["groups"]}
+    expected = {}
+    for major, gpa, year in rows:
+        expected.setdefault(major if by == "major" else str(year), []).append(gpa)
+    assert set(groups) == set(expected)
+    for key, values in expected.items():
+        row = groups[key]
+        assert row["count"] == len(values)
+        assert row["gpa_mean"] == pytest.approx(np.mean(values), abs=1e-3)
+        assert row["gpa_min"] == pytest.approx(min(values), abs=1e-3)
+        assert row["gpa_max"] == pytest.approx(max(values), abs=1e-3)
+        for q in PERCENTILES:
+            assert row[f"gpa_p{q}"] == pytest.approx(np.percentile(values, q), abs=1e-3)
+
+
+@pytest.mark.parametrize("by", ["major", "year"])
+def test_group_percentiles_match_numpy(blockchain, by):
+    report = cohort_report(load_projection(blockchain), by=by)
+
+    assert report["records"] == 60
+    _check_groups(report, blockchain.rows, by)
+    assert sum(row["count"] for row in report["gpa_histogram"]) == 60
+
+
+def test_filters(blockchain):
+    report = cohort_report(load_projection(blockchain), by="year", major="Teknik Elektro",
+                           year_from=2023, year_to=2024)
+
+    rows = [row for row in blockchain.rows if row[0] == "Teknik Elektro" and 2023 <= row[2] <= 2024]
+    assert report["records"] == len(rows)
+    _check_groups(report, rows, "year")
+    assert cohort_report(load_projection(blockchain), major="Tidak Ada")["groups"] == []
+
+
+def test_projection_is_extended_and_rebuilt(blockchain, make_chain):
+    projection = load_projection(blockchain)
+    assert len(projection) == 60
+
+    blockchain.add_degree_transaction(student("20219999", major="Statistika", gpa="4.00"))
+    blockchain.mine_pending_transactions(quiet=True)
+    assert projection.sync(blockchain.chain) == 1
+    assert len(load_projection(blockchain)) == 61
+
+    # Chain yang berbeda (mis. setelah chain diganti): proyeksi tidak cocok dan dibangun ulang
+    other = make_chain("other")
+    other.add_degree_transaction(student("20210001"))
+    other.mine_pending_transactions(quiet=True)
+    projection.sync(other.chain)
+    assert len(projection) == 1
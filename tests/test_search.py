@@ -0,0 +1,93 @@
+import itertools
+
+import pytest
+
+from app.search import tokenize
+from conftest import student
+
+NAMES = ["Anna Wijaya", "Budi Santoso", "Annisa Putri", "Citra Wijayanti", "Dewi Anna Lestari"]
+MAJORS = ["Teknik Informatika", "Sistem Informasi", "Teknik Elektro"]
+DATES = ["2023-02-20", "2023-08-15", "2024-06-15", "2024-12-31", "2025-01-10"]
+
+
+@pytest.fixture
+def blockchain(make_chain):
+    blockchain = make_chain()
+    for i, (name, major, date) in enumerate(itertools.islice(
+            zip(itertools.cycle(NAMES), itertools.cycle(MAJORS), itertools.cycle(DATES)), 30)):
+        blockchain.add_degree_transaction(student(f"2021{i:04d}", name=name, major=major, graduation_date=date))
+        if i % 7 == 6:
+            blockchain.mine_pending_transactions(quiet=True)
+    blockchain.mine_pending_transactions(quiet=True)
+    return blockchain
+
+
+def _expected(blockchain, name=None, major=None, date_from=None, date_to=None):
+    """Pencarian brute force atas seluruh chain sebagai pembanding"""
+    def matches(text, query):
+        words = tokenize(text)
+        return all(any(word.startswith(token) for word in words) for token in tokenize(query or ""))
+
+    found = []
+    for block in blockchain.chain:
+        for position, tx in enumerate(block.transactions):
+            if tx.transaction_type != "degree_issuance":
+                continue
+            if not (matches(tx.student_name, name) and matches(tx.major, major)):
+                continue
+            if date_from and tx.graduation_date < date_from:
+                continue
+            if date_to and tx.graduation_date[:len(date_to)] > date_to:
+                continue
+            found.append((block.index, position))
+    return found
+
+
+@pytest.mark.parametrize("query", [
+    {"name": "anna"},
+    {"name": "ann"},
+    {"name": "wijaya"},
+    {"name": "ANNA wij"},
+    {"major": "teknik"},
+    {"name": "a", "major": "informatika"},
+    {"date_from": "2024"},
+    {"date_to": "2023-08"},
+    {"date_from": "2023-08-15", "date_to": "2024"},
+    {"name": "anna", "date_from": "2024-06-15", "date_to": "2024-12-31"},
+    {"name": "tidakada"},
+])
+def test_search_matches_brute_force(blockchain, query):
+    expected = _expected(blockchain, **query)
+    result = blockchain.search_degrees(name=query.get("name"), major=query.get("major"),
+                                       graduated_from=query.get("date_from"),
+                                       graduated_to=query.get("date_to"), limit=100)
+
+    assert result["total"] == len(expected)
+    assert [(r["block_index"], r["degree_data"]["student_nim"]) for r in result["results"]] == \
+        [(i, blockchain.chain[i].transactions[p].student_nim) for i, p in expected]
+
+
+def test_pagination_and_invalid_date(blockchain):
+    everything = blockchain.search_degrees(major="teknik", limit=100)["results"]
+    page = blockchain.search_degrees(major="teknik", offset=5, limit=4)
+
+    assert page["total"] == len(everything)
+    assert page["results"] == everything[5:9]
+    with pytest.raises(ValueError):
+        blockchain.search_degrees(graduated_from="15-06-2024")
+
+
+def test_index_persists_and_follows_new_blocks(blockchain, make_chain):
+    blockchain.search_degrees(name="anna")
+    blockchain.add_degree_transaction(student("20219999", name="Zaskia Anna"))
+    blockchain.mine_pending_transactions(quiet=True)
+    assert blockchain.search_degrees(name="zaskia")["total"] == 1
+
+    reopened = make_chain()
+    assert reopened.search_degrees(name="anna")["total"] == len(_expected(reopened, name="anna"))
+
+    # Revoked ijazah tetap ditemukan, dengan tanda dicabut
+    degree = reopened.search_degrees(name="zaskia")["results"][0]["degree_data"]
+    reopened.revoke_degree(degree["document_hash"], "20219999", "Salah cetak")
+    reopened.mine_pending_transactions(quiet=True)
+    assert reopened.search_degrees(name="zaskia")["results"][0]["revoked"]
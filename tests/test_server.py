@@ -0,0 +1,104 @@
+import json
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from app.server import VerificationCache
+from conftest import mine_students
+
+
+def _request(server, path: str, body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(server.url + path, data=data, method="POST" if data else "GET")
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+@pytest.fixture
+def issued(make_chain):
+    blockchain = make_chain()
+    mine_students(blockchain, 3)
+    degree = blockchain.get_student_degrees("20210001")[0]["degree_data"]
+    return blockchain, degree
+
+
+def test_verify_endpoint(issued, serve):
+    blockchain, degree = issued
+    server = serve(blockchain)
+
+    status, result = _request(server, f"/verify?nim=20210001&hash={degree['document_hash']}")
+    assert status == 200
+    assert result["verified"]
+    assert result["block_hash"] == blockchain.chain[result["block_index"]].hash
+
+    status, result = _request(server, f"/verify?nim=20219999&hash={degree['document_hash']}")
+    assert status == 200 and not result["verified"]
+
+    status, result = _request(server, "/verify?nim=20210001")
+    assert status == 400 and "error" in result
+
+
+def test_batch_and_qr_endpoints(issued, serve):
+    blockchain, degree = issued
+    server = serve(blockchain)
+
+    status, result = _request(server, "/verify/batch", [
+        {"nim": "20210001", "hash": degree["document_hash"]},
+        {"nim": "20210002", "hash": degree["document_hash"]},
+        {"nim": "20210001"},
+    ])
+    assert status == 200
+    assert result["count"] == 3
+    assert [row["verified"] for row in result["results"]] == [True, False, False]
+
+    payload = {"student_nim": "20210001", "document_hash": degree["document_hash"],
+               "transaction_id": degree["transaction_id"]}
+    assert _request(server, "/verify/qr", payload)[1]["verified"]
+    status, result = _request(server, "/verify/qr", {**payload, "transaction_id": "palsu"})
+    assert status == 200 and not result["verified"]
+
+
+def test_unknown_route_and_method(issued, serve):
+    server = serve(issued[0])
+
+    assert _request(server, "/tidak-ada")[0] == 404
+    assert _request(server, "/verify/batch")[0] == 405
+
+
+def test_cache_is_cleared_when_another_process_mines(issued, serve, make_chain):
+    blockchain, degree = issued
+    server = serve(blockchain)
+    path = f"/verify?nim=20210001&hash={degree['document_hash']}"
+    _request(server, path)
+    _request(server, path)
+    stats = _request(server, "/stats")[1]
+    assert stats["cache"]["hits"] == 1 and stats["cache"]["size"] == 1
+
+    # Proses lain menambang blok baru di direktori data yang sama
+    writer = make_chain()
+    mine_students(writer, 1, first=10)
+    new_degree = writer.get_student_degrees("20210010")[0]["degree_data"]
+    deadline = time.time() + 10
+    while _request(server, "/health")[1]["blocks"] < len(writer.chain) and time.time() < deadline:
+        time.sleep(0.05)
+
+    assert _request(server, "/stats")[1]["cache"]["size"] == 0
+    status, result = _request(server, f"/verify?nim=20210010&hash={new_degree['document_hash']}")
+    assert result["verified"]
+
+
+def test_verification_cache_evicts_least_recently_used():
+    cache = VerificationCache(max_size=2)
+    cache.put(("a", "1"), {"verified": True})
+    cache.put(("b", "2"), {"verified": True})
+    cache.get(("a", "1"))
+    cache.put(("c", "3"), {"verified": True})
+
+    assert cache.get(("b", "2")) is None
+    assert cache.get(("a", "1")) is not None
+    assert len(cache) == 2
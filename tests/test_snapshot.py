@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+from app.core import UniversityBlockchain
+from app.storage import CorruptStateError
+from conftest import mine_students, student
+
+
+def _open(tmp_path, **kwargs):
+    return UniversityBlockchain(difficulty=1, data_dir=str(tmp_path / "data"), snapshot_interval=2, **kwargs)
+
+
+def _corrupt(path: str):
+    """Balik satu byte di akhir file (payload snapshot)"""
+    with open(path, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+
+
+def test_index_is_restored_from_latest_valid_snapshot(tmp_path, capsys):
+    blockchain = _open(tmp_path)
+    mine_students(blockchain, 5)
+    snapshots = blockchain.snapshots.list()
+    assert [s.height for s in snapshots] == [6, 4]
+    _corrupt(snapshots[0].path)
+    os.remove(os.path.join(blockchain.data_dir, "blockchain_index.jsonl"))
+    capsys.readouterr()
+
+    reopened = _open(tmp_path)
+    degrees = reopened.get_student_degrees("20210004")
+
+    out = capsys.readouterr().out
+    assert "Checksum snapshot" in out
+    assert "dari snapshot blok #3" in out
+    assert degrees[0]["block_index"] == 5
+    assert reopened.get_student_degrees("20210000")[0]["block_index"] == 1
+
+
+def test_snapshot_with_bad_checksum_is_never_used(tmp_path):
+    blockchain = _open(tmp_path)
+    mine_students(blockchain, 2)
+    snapshot = blockchain.snapshots.list()[0]
+    _corrupt(snapshot.path)
+
+    assert blockchain.snapshots.latest(blockchain.chain) is None
+    with pytest.raises(CorruptStateError):
+        snapshot.verify()
+
+
+def test_corrupt_journal_is_not_reset_and_recovers_from_snapshot(tmp_path):
+    blockchain = _open(tmp_path)
+    mine_students(blockchain, 1)
+    blockchain.add_degree_transaction(student("20219998"))
+    blockchain.take_snapshot()
+    blockchain.add_degree_transaction(student("20219999"))
+    tip = blockchain.get_latest_block().hash
+    journal = blockchain.journal_file
+    with open(journal, encoding="utf-8") as f:
+        lines = f.readlines()
+    # Record transaksi pertama rusak di tengah journal
+    first_tx = next(i for i, line in enumerate(lines) if '"op": "tx"' in line)
+    lines[first_tx] = "{rusak\n"
+    with open(journal, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+
+    with pytest.raises(CorruptStateError):
+        _open(tmp_path)
+
+    result = UniversityBlockchain.recover(blockchain.data_dir)
+    assert result == {"snapshot_height": 2, "skipped_records": 1, "pending": 2}
+
+    recovered = _open(tmp_path)
+    assert recovered.get_latest_block().hash == tip
+    assert sorted(tx.student_nim for tx in recovered.pending_transactions) == ["20219998", "20219999"]
@@ -0,0 +1,88 @@
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timedelta
+
+from app.models import Block, Transaction
+from app.sqlstore import SQLReadModel
+from conftest import mine_students
+
+
+def _transaction(nim: str) -> Transaction:
+    return Transaction(
+        transaction_type="degree_issuance", student_nim=nim, student_name=f"Mahasiswa {nim}",
+        degree="Sarjana Komputer", major="Teknik Informatika", gpa="3.50", graduation_date="2024-06-15",
+        document_hash=nim.rjust(64, "0"), issuer="University Registrar", timestamp=datetime(2024, 7, 1)
+    )
+
+
+def _extend(chain, nims, per_block=2):
+    """Tambahkan blok (tanpa proof-of-work; read model tidak memvalidasi) berisi `nims`"""
+    chain = list(chain)
+    for i in range(0, len(nims), per_block):
+        block = Block(index=len(chain), transactions=[_transaction(n) for n in nims[i:i + per_block]],
+                      timestamp=datetime(2024, 7, 1) + timedelta(minutes=len(chain)),
+                      previous_hash=chain[-1].hash if chain else "0" * 64)
+        chain.append(block)
+    return chain
+
+
+def _rows(path):
+    with closing(sqlite3.connect(path)) as conn:
+        blocks = conn.execute("SELECT block_index, hash FROM blocks ORDER BY block_index").fetchall()
+        txs = conn.execute("SELECT block_index, position, student_nim FROM transactions "
+                           "ORDER BY block_index, position").fetchall()
+    return blocks, txs
+
+
+def _expected(chain):
+    return ([(b.index, b.hash) for b in chain],
+            [(b.index, p, tx.student_nim) for b in chain for p, tx in enumerate(b.transactions)])
+
+
+def test_resync_after_fork_replaces_diverged_blocks(tmp_path):
+    path = str(tmp_path / "chain.sqlite")
+    model = SQLReadModel(path)
+    common = _extend([], [f"2021{i:04d}" for i in range(6)])
+    chain_a = _extend(common, ["20211001", "20211002", "20211003", "20211004"])
+    chain_b = _extend(common, ["20212001", "20212002", "20212003", "20212004", "20212005", "20212006"])
+
+    assert model.sync(chain_a)["added_blocks"] == len(chain_a)
+    assert _rows(path) == _expected(chain_a)
+
+    result = model.sync(chain_b)
+    assert result["removed_blocks"] == len(chain_a) - len(common)
+    assert result["added_blocks"] == len(chain_b) - len(common)
+    assert _rows(path) == _expected(chain_b)
+
+    # Kembali ke chain yang lebih pendek: blok ekstra dihapus
+    result = model.sync(chain_a)
+    assert result["removed_blocks"] == len(chain_b) - len(common)
+    assert _rows(path) == _expected(chain_a)
+    assert model.sync(chain_a)["added_blocks"] == 0
+
+
+def test_schema_version_change_rebuilds(tmp_path):
+    path = str(tmp_path / "chain.sqlite")
+    model = SQLReadModel(path)
+    chain = _extend([], ["20210001", "20210002", "20210003"])
+    model.sync(chain)
+    with closing(sqlite3.connect(path)) as conn, conn:
+        conn.execute("UPDATE meta SET value = '1' WHERE key = 'schema_version'")
+
+    assert model.sync(chain)["added_blocks"] == len(chain)
+    assert _rows(path) == _expected(chain)
+
+
+def test_mining_keeps_enabled_read_model_in_sync(make_chain):
+    blockchain = make_chain()
+    assert not blockchain.sql.enabled
+    mine_students(blockchain, 2)
+    blockchain.sync_sql()
+    assert blockchain.sql.enabled
+
+    mine_students(blockchain, 2, first=2)
+    blockchain.revoke_degree(blockchain.get_student_degrees("20210001")[0]["degree_data"]["document_hash"],
+                             "20210001", "Salah cetak")
+    blockchain.mine_pending_transactions(quiet=True)
+
+    assert _rows(blockchain.sql.path) == _expected(blockchain.chain)
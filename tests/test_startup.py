@@ -0,0 +1,15 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFERRED = ["sqlite3", "pickle", "app.sqlstore", "app.snapshot", "app.validation", "app.mining"]
+
+
+def test_importing_cli_does_not_load_deferred_modules():
+    code = ("import json, sys; import blockchain.cli; "
+            f"print(json.dumps([m for m in {DEFERRED!r} if m in sys.modules]))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert json.loads(out.stdout) == []
@@ -0,0 +1,94 @@
+import pytest
+
+from app.sync import PeerClient, PeerSync, SyncError
+from conftest import mine_students, student
+
+
+def _quiet(line):
+    pass
+
+
+def test_fresh_node_syncs_validates_and_verifies(make_chain, serve):
+    source = make_chain("source")
+    mine_students(source, 6)
+    revoked = source.get_student_degrees("20210000")[0]["degree_data"]
+    source.revoke_degree(revoked["document_hash"], "20210000", "Salah cetak")
+    source.mine_pending_transactions(quiet=True)
+    server = serve(source)
+
+    node = make_chain("node")
+    added = PeerSync(node, server.url, workers=2, range_size=2, out=_quiet).sync()
+
+    assert added == len(source.chain)
+    assert node.get_latest_block().hash == source.get_latest_block().hash
+    assert node.validate(full=True)["valid"]
+
+    degree = source.get_student_degrees("20210003")[0]["degree_data"]
+    result = node.verify_degree(degree["document_hash"], "20210003")
+    assert result["verified"]
+    assert result["block_hash"] == source.chain[result["block_index"]].hash
+
+    result = node.verify_degree(revoked["document_hash"], "20210000")
+    assert not result["verified"]
+    assert result["revoked"]
+
+
+def test_sync_resumes_from_local_tip(make_chain, serve):
+    source = make_chain("source")
+    mine_students(source, 3)
+    server = serve(source)
+    node = make_chain("node")
+    sync = PeerSync(node, server.url, range_size=2, out=_quiet)
+    sync.sync()
+
+    assert sync.sync() == 0
+
+    mine_students(source, 2, first=3)
+    assert sync.sync() == 2
+    assert node.get_latest_block().hash == source.get_latest_block().hash
+    assert node.validate(full=True)["valid"]
+
+
+def test_diverged_chain_is_not_replaced(make_chain, serve):
+    source = make_chain("source")
+    mine_students(source, 2)
+    server = serve(source)
+    node = make_chain("node")
+    node.add_degree_transaction(student("20219999"))
+    node.mine_pending_transactions(quiet=True)
+    tip = node.get_latest_block().hash
+
+    with pytest.raises(SyncError):
+        PeerSync(node, server.url, out=_quiet).sync()
+    assert node.get_latest_block().hash == tip
+
+
+@pytest.mark.parametrize("shift", [5, -3])
+def test_blocks_outside_requested_range_are_rejected(make_chain, serve, monkeypatch, shift):
+    source = make_chain("source")
+    mine_students(source, 6)
+    server = serve(source)
+    node = make_chain("node")
+    original = PeerClient.blocks
+
+    def wrong_range(self, start, stop):
+        # Peer nakal: mengirim rentang lain dari yang diminta
+        begin = min(max(start + shift, 0), len(source.chain) - 1)
+        return original(self, begin, min(begin + stop - start, len(source.chain)))
+
+    monkeypatch.setattr(PeerClient, "blocks", wrong_range)
+    with pytest.raises(SyncError):
+        PeerSync(node, server.url, range_size=2, out=_quiet).sync()
+    assert len(node.chain) == 1 or node.validate(full=True)["valid"]
+
+
+def test_short_range_is_rejected(make_chain, serve, monkeypatch):
+    source = make_chain("source")
+    mine_students(source, 4)
+    server = serve(source)
+    node = make_chain("node")
+    original = PeerClient.blocks
+    monkeypatch.setattr(PeerClient, "blocks", lambda self, start, stop: original(self, start, stop)[:-1])
+
+    with pytest.raises(SyncError):
+        PeerSync(node, server.url, range_size=2, out=_quiet).sync()